@@ -2,23 +2,31 @@ import streamlit as st
 import pandas as pd
 import time
 import datetime
-import json
+import logging
 import os
 import re
-from urllib.parse import urlparse
+from collections import Counter
 import plotly.express as px
 import plotly.graph_objects as go
 
 # Import custom modules
 from scrapers.youtube_scraper import YouTubeScraper
-from scrapers.text_processor import TextProcessor
+from scrapers.text_processor import EXTRACTOR_VERSION, TextProcessor
 from scrapers.web_scraper import WebScraper
+from utils.extraction_cache import get_extraction_cache
+from utils.log import configure_logging, format_counters
+from utils.repository import get_repository
+from utils.video_store import LOAD_STATS
 from assets.terminal_style import (
     apply_terminal_style, terminal_container, console_print, 
     typing_animation, glow_text, header, tooltip, 
     warning, success, blinking_cursor
 )
 
+# Log to stderr; set SCRAPER_LOG_LEVEL=DEBUG for per-video details
+configure_logging()
+logger = logging.getLogger(__name__)
+
 # Configuration
 st.set_page_config(
     page_title="Platform Scraper",
@@ -37,113 +45,81 @@ def ensure_data_directory():
 
 # Database functions
 def load_videos():
-    """Load videos from JSON file."""
-    ensure_data_directory()
+    """Load videos from the video repository."""
     try:
-        if os.path.exists('data/videos.json'):
-            with open('data/videos.json', 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return []
+        return get_repository().load_videos()
     except Exception as e:
         st.error(f"Error loading videos: {str(e)}")
         return []
 
 def save_videos(videos):
-    """Save videos to JSON file."""
-    ensure_data_directory()
+    """Save videos to the video repository."""
     try:
-        with open('data/videos.json', 'w', encoding='utf-8') as f:
-            json.dump(videos, f, ensure_ascii=False, indent=2)
+        get_repository().save_videos(videos)
     except Exception as e:
         st.error(f"Error saving videos: {str(e)}")
 
+def upsert_video(video):
+    """Add or update a single video in the video repository."""
+    try:
+        get_repository().upsert_video(video)
+    except Exception as e:
+        st.error(f"Error saving video: {str(e)}")
+
 # Data processing functions
 def get_platform_statistics():
     """Get statistics about the most mentioned platforms."""
-    videos = load_videos()
-    
-    # Count platform mentions
-    platform_counts = {}
-    for video in videos:
-        for platform in video.get('platforms', []):
-            if platform in platform_counts:
-                platform_counts[platform] += 1
-            else:
-                platform_counts[platform] = 1
+    # Count platform mentions (counted once per change to the videos)
+    try:
+        platform_counts = get_repository().get_platform_counts()
+    except Exception as e:
+        st.error(f"Error loading videos: {str(e)}")
+        platform_counts = []
     
     # Convert to DataFrame for easier visualization
     platform_data = pd.DataFrame([
         {"platform": platform, "count": count}
-        for platform, count in sorted(platform_counts.items(), key=lambda x: x[1], reverse=True)
+        for platform, count in platform_counts
     ])
     
     return platform_data
 
 def get_messaging_group_statistics():
     """Get statistics about messaging groups."""
-    videos = load_videos()
-    
-    # Collect all messaging groups
-    groups = []
-    for video in videos:
-        for group in video.get('messaging_groups', []):
-            groups.append(group)
-    
-    return groups
+    try:
+        return get_repository().get_messaging_groups()
+    except Exception as e:
+        st.error(f"Error loading videos: {str(e)}")
+        return []
 
 def get_website_statistics():
     """Get statistics about mentioned websites."""
-    videos = load_videos()
-    
-    # Extract domain from URLs and count frequencies
-    domain_counts = {}
-    website_details = {}
-    
-    for video in videos:
-        for url in video.get('links', []):
-            try:
-                # Parse URL to get domain
-                parsed = urlparse(url)
-                domain = parsed.netloc
-                
-                # Skip empty domains
-                if not domain:
-                    continue
-                
-                # Count domain frequency
-                if domain in domain_counts:
-                    domain_counts[domain] += 1
-                    if url not in website_details[domain]['urls']:
-                        website_details[domain]['urls'].append(url)
-                    if video['id'] not in website_details[domain]['videos']:
-                        website_details[domain]['videos'].append(video['id'])
-                        website_details[domain]['video_titles'].append(video.get('title', 'Unknown'))
-                else:
-                    domain_counts[domain] = 1
-                    website_details[domain] = {
-                        'domain': domain,
-                        'urls': [url],
-                        'videos': [video['id']],
-                        'video_titles': [video.get('title', 'Unknown')]
-                    }
-            except:
-                # Skip invalid URLs
-                continue
+    # Domain counts and details (derived once per change to the videos)
+    try:
+        repository = get_repository()
+        domain_counts = repository.get_domain_counts()
+        website_details = repository.get_domain_details()
+    except Exception as e:
+        st.error(f"Error loading videos: {str(e)}")
+        domain_counts, website_details = [], {}
     
     # Convert to DataFrame for easier visualization
     website_data = pd.DataFrame([
         {"domain": domain, "count": count, "details": website_details[domain]}
-        for domain, count in sorted(domain_counts.items(), key=lambda x: x[1], reverse=True)
+        for domain, count in domain_counts
     ])
     
     return website_data
 
 def get_videos_by_platform(platform_name):
     """Get videos that mention a specific platform."""
-    videos = load_videos()
-    return [v for v in videos if platform_name in v.get('platforms', [])]
+    try:
+        return get_repository().get_videos_by_platform(platform_name)
+    except Exception as e:
+        st.error(f"Error loading videos: {str(e)}")
+        return []
 
-def start_scan(keywords, days_back, max_videos):
+def start_scan(keywords, days_back, max_videos, max_concurrent=4, watch_channels=False):
     """Start scanning for videos with the given keywords."""
     
     # Create progress bar
@@ -152,7 +128,11 @@ def start_scan(keywords, days_back, max_videos):
     
     # Initialize scrapers
     youtube_scraper = YouTubeScraper()
-    text_processor = TextProcessor()
+    text_processor = TextProcessor(cache=get_extraction_cache(EXTRACTOR_VERSION))
+    
+    # Snapshot the response cache counters so we can report this scan's savings
+    cache_before = youtube_scraper.cache.stats() if youtube_scraper.cache else None
+    extraction_before = text_processor.cache.stats()
     
     # Load existing videos
     existing_videos = load_videos()
@@ -164,59 +144,74 @@ def start_scan(keywords, days_back, max_videos):
     
     # Track seen titles for grouping similar videos
     seen_titles = {}
+    skipped = Counter()
     
-    # Scan for each keyword
-    for i, keyword in enumerate(keywords_list):
-        status_text.text(f"[*] Searching for videos related to '{keyword}'...")
-        progress = (i / len(keywords_list)) * 0.5
-        progress_bar.progress(progress)
-        
-        # Search for videos
-        videos = youtube_scraper.search_videos(keyword, days_back, max_videos // len(keywords_list))
-        
-        # Process each video
-        for j, video in enumerate(videos):
+    def normalize_title(video):
+        """Lowercase a title and strip its punctuation for the similarity check."""
+        return re.sub(r'[^\w\s]', '', video['title'].lower()).strip()
+    
+    def similar_seen_title(normalized_title):
+        """Return a stored title (> 80% similar) that makes this one redundant, if any."""
+        for seen_title, seen_id in seen_titles.items():
+            if seen_title == normalized_title or (
+                len(seen_title) > 10 and (
+                    seen_title in normalized_title or 
+                    normalized_title in seen_title or
+                    (len(set(normalized_title.split()) & set(seen_title.split())) / 
+                    max(len(set(normalized_title.split())), len(set(seen_title.split())))) > 0.8
+                )
+            ):
+                return seen_title
+        return None
+    
+    def select_candidates(videos):
+        """Yield the videos that need their details fetched."""
+        candidate_ids = set()
+        for video in videos:
             video_id = video['id']
-            video_title = video['title'].lower()
             
             # Skip if we already have this video
-            if video_id in existing_ids:
+            if video_id in existing_ids or video_id in candidate_ids:
                 continue
-                
-            # Check for similar titles - if we have a similar title, skip this video
-            # We use a simplified approach: normalize the title and check if we've seen a similar one
-            normalized_title = re.sub(r'[^\w\s]', '', video_title).strip()
             
-            # Skip if we've seen a very similar title (> 80% similarity)
-            skip_video = False
-            for seen_title, seen_id in seen_titles.items():
-                if seen_title == normalized_title or (
-                    len(seen_title) > 10 and (
-                        seen_title in normalized_title or 
-                        normalized_title in seen_title or
-                        (len(set(normalized_title.split()) & set(seen_title.split())) / 
-                        max(len(set(normalized_title.split())), len(set(seen_title.split())))) > 0.8
-                    )
-                ):
-                    skip_video = True
-                    print(f"[!] Skipping similar video: {video_title} (similar to {seen_title})")
-                    break
-                    
-            if skip_video:
+            # Check for similar titles - if we have stored a similar title, skip this video
+            # We use a simplified approach: normalize the title and check if we've seen a similar one
+            similar_title = similar_seen_title(normalize_title(video))
+            if similar_title is not None:
+                logger.debug("Skipping similar video: %s (similar to %s)", video['title'].lower(), similar_title)
+                skipped['similar_skipped'] += 1
                 continue
-                
+            
+            candidate_ids.add(video_id)
+            yield video
+    
+    def process_stream(videos, progress, span, expected):
+        """Fetch details for the selected videos and process each one as its page arrives."""
+        details_stream = youtube_scraper.fetch_video_details(select_candidates(videos), max_workers=max_concurrent)
+        for j, (video, video_details) in enumerate(details_stream):
             # Update progress
-            sub_progress = progress + (j / len(videos)) * (0.5 / len(keywords_list))
+            sub_progress = progress + (min(j + 1, expected) / max(expected, 1)) * span
             progress_bar.progress(sub_progress)
             status_text.text(f"[*] Processing video: {video['title']}")
             
-            # Get video details
-            video_details = youtube_scraper.get_video_details(video_id)
             if 'error' in video_details:
                 continue
+            
+            # Titles are only remembered once their video's details arrive, so a
+            # failed fetch doesn't hide later videos; a similar video fetched
+            # concurrently may have been stored first, though
+            normalized_title = normalize_title(video)
+            similar_title = similar_seen_title(normalized_title)
+            if similar_title is not None:
+                logger.debug("Skipping similar video: %s (similar to %s)", video['title'].lower(), similar_title)
+                skipped['similar_skipped'] += 1
+                continue
+            seen_titles[normalized_title] = video['id']
                 
             # Combine basic info with details
             full_video = {**video, 'description': video_details.get('description', '')}
+            if not full_video.get('channel_id') and video_details.get('channel_id'):
+                full_video['channel_id'] = video_details['channel_id']
             
             # Process text to extract platforms, links, and messaging groups
             platforms, links, groups = text_processor.process_video(full_video)
@@ -227,24 +222,62 @@ def start_scan(keywords, days_back, max_videos):
             full_video['messaging_groups'] = groups
             full_video['scan_date'] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            # Add to new videos list
+            # Store it right away; only this video is written
+            upsert_video(full_video)
             new_videos.append(full_video)
-            existing_ids.add(video_id)
-            
-            # Remember this title
-            seen_titles[normalized_title] = video_id
-            
-    # Save all videos
-    all_videos = existing_videos + new_videos
-    save_videos(all_videos)
+            existing_ids.add(video['id'])
+    
+    # Scan for each keyword
+    for i, keyword in enumerate(keywords_list):
+        status_text.text(f"[*] Searching for videos related to '{keyword}'...")
+        progress = (i / len(keywords_list)) * 0.5
+        progress_bar.progress(progress)
+        
+        # Search for videos; results stream in page by page
+        videos_per_keyword = max_videos // len(keywords_list)
+        videos = youtube_scraper.iter_search_videos(keyword, days_back, videos_per_keyword)
+        process_stream(videos, progress, 0.5 / len(keywords_list), videos_per_keyword)
+    
+    # Poll the upload feeds of channels we already know about
+    if watch_channels:
+        channel_ids = [v.get('channel_id') for v in existing_videos + new_videos]
+        status_text.text("[*] Checking uploads of known channels...")
+        progress_bar.progress(0.5)
+        
+        videos = youtube_scraper.iter_channel_feeds(channel_ids, existing_ids, days_back, max_workers=max_concurrent)
+        process_stream(videos, 0.5, 0.5, max_videos)
     
     # Complete progress
     progress_bar.progress(1.0)
     status_text.text(f"[+] Scan complete! Found {len(new_videos)} new videos.")
     time.sleep(1)
     
+    # One log line for the whole scan instead of one per video
+    logger.info("Scan summary: new_videos=%d %s", len(new_videos),
+                format_counters(youtube_scraper.counters + skipped + text_processor.counters))
+    
+    # Report how many requests the response cache answered locally
+    cache_summary = ""
+    if cache_before:
+        cache_after = youtube_scraper.cache.stats()
+        served = sum(cache_after[k] - cache_before[k] for k in ('hits', 'revalidated'))
+        fetched = cache_after['misses'] - cache_before['misses']
+        saved_kb = (cache_after['bytes_saved'] - cache_before['bytes_saved']) / 1024
+        cache_summary = f" HTTP cache: {served} served locally, {fetched} downloaded, {saved_kb:.0f} KB saved."
+    
+    # Report how many videos didn't need their text processed again
+    extraction_after = text_processor.cache.stats()
+    reused = sum(extraction_after[k] - extraction_before[k] for k in ('memory_hits', 'disk_hits'))
+    if reused:
+        cache_summary += f" Extraction cache: {reused} videos reused."
+    
+    # Don't let keywords that couldn't be searched go unnoticed
+    failed_summary = ""
+    if youtube_scraper.failed_searches:
+        failed_summary = f" Search failed for: {', '.join(youtube_scraper.failed_searches)}."
+    
     # Return success message
-    return f"Scan completed successfully. Found {len(new_videos)} new videos."
+    return f"Scan completed successfully. Found {len(new_videos)} new videos.{cache_summary}{failed_summary}"
 
 def main():
     # Header
@@ -277,6 +310,14 @@ def main():
             help="Maximum number of videos to scan per keyword"
         )
         
+        max_concurrent = st.slider(
+            "Concurrent requests:", 
+            min_value=1, 
+            max_value=16,
+            value=4,
+            help="Maximum number of video pages fetched at the same time"
+        )
+        
         # Scan options
         terminal_container("SCAN OPTIONS", "")
         
@@ -292,6 +333,12 @@ def main():
         with col2:
             instagram = st.checkbox("Instagram", value=False)
         
+        watch_channels = st.checkbox(
+            "Watch known channels",
+            value=False,
+            help="Also check the upload feeds of channels already found in previous scans"
+        )
+        
         # Execute scan button
         st.markdown("")
         if st.button("▶ EXECUTE SCAN", use_container_width=True):
@@ -308,7 +355,7 @@ def main():
                     time.sleep(0.5)
                 
                 # Start the scan
-                result = start_scan(keywords, days_back, max_videos)
+                result = start_scan(keywords, days_back, max_videos, max_concurrent, watch_channels)
                 console_content.markdown(f"""
                 <div class="console-log">
                 root@scanner:~# ./security_scanner.sh --target "{keywords}" --days {days_back} --max {max_videos}
@@ -389,6 +436,7 @@ def main():
             [+] {len(videos)} videos in database
             [+] {len(set(p for v in videos for p in v.get('platforms', [])))} unique platforms detected
             [+] {len(messaging_groups)} messaging groups found
+            [+] Store parses: {LOAD_STATS['parses']} ({LOAD_STATS['parses_avoided']} avoided by the load cache)
             [+] Scan engine ready
             """)
         else:
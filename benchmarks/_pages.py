@@ -0,0 +1,108 @@
+"""Synthetic YouTube pages for the benchmarks when no saved pages are given."""
+import json
+import random
+
+FILLER_SCRIPT = '<script nonce="x">(function(){var a=%s;window.__f=a;})();</script>\n'
+
+
+def _filler(size, seed=0):
+    """Roughly size bytes of script/markup noise, similar to a real page's player code."""
+    rng = random.Random(seed)
+    chunks = []
+    total = 0
+    while total < size:
+        blob = json.dumps({"k%d" % rng.randint(0, 10**6): ["x" * rng.randint(10, 200) for _ in range(20)]})
+        chunk = FILLER_SCRIPT % blob
+        chunks.append(chunk)
+        total += len(chunk)
+    return ''.join(chunks)
+
+
+def video_renderer(index, published="há 1 dia"):
+    return {
+        "videoRenderer": {
+            "videoId": "v%010d" % index,
+            "title": {"runs": [{"text": "Plataforma de investimento %d - pagamento via PIX" % index}]},
+            "ownerText": {"runs": [{
+                "text": "Canal %d" % (index % 7),
+                "navigationEndpoint": {"browseEndpoint": {"browseId": "UC%022d" % (index % 7)}}
+            }]},
+            "publishedTimeText": {"simpleText": published},
+            "viewCountText": {"simpleText": "%d visualizações" % (index * 13)},
+            "thumbnail": {"thumbnails": [{"url": "https://i.ytimg.com/vi/v%010d/hq720.jpg" % index}]}
+        }
+    }
+
+
+def make_search_page(videos=20, filler_bytes=600_000, seed=0):
+    """A results page with ytInitialData holding the given number of videos."""
+    data = {
+        "contents": {"twoColumnSearchResultsRenderer": {"primaryContents": {"sectionListRenderer": {"contents": [
+            {"itemSectionRenderer": {"contents": [video_renderer(i) for i in range(videos)]}},
+            {"continuationItemRenderer": {"continuationEndpoint": {"continuationCommand": {"token": "EpcDEgZ0b2tlbg"}}}}
+        ]}}}}
+    }
+    return (
+        '<!DOCTYPE html><html><head><title>YouTube</title></head><body>\n'
+        + _filler(filler_bytes // 2, seed)
+        + '<script nonce="x">var ytInitialData = %s;</script>\n' % json.dumps(data)
+        + _filler(filler_bytes // 2, seed + 1)
+        + '</body></html>'
+    )
+
+
+def make_watch_page(description_words=400, comments=40, filler_bytes=1_500_000, seed=0):
+    """A watch page with ytInitialPlayerResponse, ytInitialData, og tags and comments."""
+    rng = random.Random(seed)
+    words = ["plataforma", "investimento", "PIX", "lucro", "HashMining", "grupo", "WhatsApp", "renda", "extra", "cadastro"]
+    description = ' '.join(rng.choice(words) for _ in range(description_words))
+    description += "\nhttps://hashmining.club/register?ref=abc123\nhttps://chat.whatsapp.com/AbCdEf123"
+    
+    player_response = {
+        "videoDetails": {
+            "videoId": "v0000000001",
+            "title": "Plataforma de investimento com PIX",
+            "shortDescription": description,
+            "channelId": "UC0000000000000000000001",
+            "author": "Canal 1",
+            "viewCount": "1234"
+        },
+        "microformat": {"playerMicroformatRenderer": {
+            "publishDate": "2025-03-28T06:00:00-07:00",
+            "uploadDate": "2025-03-28T06:00:00-07:00",
+            "externalChannelId": "UC0000000000000000000001"
+        }}
+    }
+    initial_data = {
+        "contents": {"twoColumnWatchNextResults": {"results": {"results": {"contents": [
+            {"videoPrimaryInfoRenderer": {"videoActions": {"menuRenderer": {"topLevelButtons": [
+                {"segmentedLikeDislikeButtonViewModel": {"likeCountEntity": {"likeCountIfIndifferentNumber": "321"}}}
+            ]}}}},
+            {"itemSectionRenderer": {"contents": [
+                {"commentThreadRenderer": {"comment": {"commentRenderer": {
+                    "authorText": {"simpleText": "@user%d" % i},
+                    "contentText": {"runs": [{"text": "Comentário %d: \"funciona\" mesmo?\nSim!" % i}]}
+                }}}} for i in range(comments)
+            ]}}
+        ]}}}}
+    }
+    
+    return (
+        '<!DOCTYPE html><html><head>'
+        '<meta property="og:title" content="Plataforma de investimento com PIX">'
+        '<meta property="og:description" content="%s">'
+        '<title>Plataforma - YouTube</title></head><body>\n' % description[:150].replace('"', '&quot;')
+        + _filler(filler_bytes // 2, seed)
+        + '<script nonce="x">var ytInitialPlayerResponse = %s;var meta = document.createElement(\'meta\');</script>\n' % json.dumps(player_response)
+        + _filler(filler_bytes // 2, seed + 1)
+        + '<script nonce="x">var ytInitialData = %s;</script>\n' % json.dumps(initial_data)
+        + '</body></html>'
+    )
+
+
+def load_pages(paths):
+    pages = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append(f.read())
+    return pages
@@ -0,0 +1,95 @@
+"""
+Accent folding: what the folded view finds that the lowercased text didn't.
+
+Since EXTRACTOR_VERSION 2 keywords, group names and tokens are matched in a
+casefolded, accent-stripped view of each text. The keyword, extraction and
+proximity benchmarks compare against the previous implementations only on
+texts folding can't change; this checks the new behavior on the others:
+unaccented spellings find accented keywords (and the per-keyword scan on
+the lowercased text doesn't), accented group names come back as written,
+and stopwords match whether or not they carry their accents. It then times
+building the view against plain lowercasing.
+
+Usage (from the repository root):
+    
+    python -m benchmarks.bench_accent_folding [videos.json ...]
+"""
+import sys
+import time
+
+from benchmarks.bench_keyword_engine import (
+    DEFAULT_CORPORA, legacy_extract_platforms, load_corpus, synthetic_corpus
+)
+from scrapers.text_processor import TextProcessor
+from utils.normalized_text import NormalizedText
+from utils.text_extraction import extract_platform_names
+
+# (text, platform that is only found next to the folded keyword)
+KEYWORD_CASES = (
+    ("Aprenda opcoes binarias com a Quotex hoje", "Quotex"),
+    ("Opções binarias: conheça a Quotex", "Quotex"),
+    ("Sistema multinivel da Hotmart, sem piramide", "Hotmart"),
+)
+
+# (text, group name as written in the text)
+GROUP_CASES = (
+    ("Entre no grupo do Ação Diária: https://chat.whatsapp.com/AbC12xyZ", "Ação Diária"),
+    ("Siga o canal da Sinais Ótimos: https://t.me/sinaisotimos", "Sinais Ótimos"),
+    ("Participe do GRUPO DE Lucro Rápido: https://chat.whatsapp.com/Q1w2e3", "Lucro Rápido"),
+)
+
+# Texts whose only candidate next to a keyword is a stopword, with and without accents
+STOPWORD_CASES = ("Plataforma não paga", "Plataforma nao paga", "Você investe na plataforma")
+
+
+def check(processor):
+    """Run the cases, returning a list of failure messages."""
+    failures = []
+    for text, platform in KEYWORD_CASES:
+        found = processor.extract_platforms(text)
+        if platform not in found:
+            failures.append(f"{platform!r} not found next to the keyword in {text!r}: {found}")
+        if platform in legacy_extract_platforms(processor, text):
+            failures.append(f"{platform!r} is found without folding too, so {text!r} checks nothing")
+    
+    for text, name in GROUP_CASES:
+        groups = processor.extract(text, include_platforms=False).groups
+        if [group['name'] for group in groups] != [name]:
+            failures.append(f"group in {text!r} named {[group['name'] for group in groups]}, expected {name!r}")
+    
+    for text in STOPWORD_CASES:
+        names = extract_platform_names(text, "regex")
+        if any(name.lower() in ("não", "nao", "você", "voce") for name in names):
+            failures.append(f"stopword taken for a platform name in {text!r}: {names}")
+    return failures
+
+
+def main(argv):
+    processor = TextProcessor()
+    
+    failures = check(processor)
+    for failure in failures:
+        print(f"[!] {failure}")
+    
+    texts = load_corpus(argv or DEFAULT_CORPORA) + synthetic_corpus(keyword_share=0.5, seed=5)
+    timings = []
+    for name, func in (("str.lower", str.lower), ("NormalizedText", NormalizedText)):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        timings.append((name, time.perf_counter() - start))
+    
+    print(f"{len(texts)} texts, {sum(len(t) for t in texts) / 1024:.0f} KiB")
+    print(f"{'view':<16}{'total':>12}{'per text':>12}")
+    for name, elapsed in timings:
+        print(f"{name:<16}{elapsed * 1000:>9.1f} ms{elapsed / len(texts) * 1e6:>9.0f} us")
+    
+    if failures:
+        return 1
+    cases = len(KEYWORD_CASES) + len(GROUP_CASES) + len(STOPWORD_CASES)
+    print(f"[+] Folded keywords, group names and stopwords behave as expected in all {cases} cases")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
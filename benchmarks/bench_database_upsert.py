@@ -0,0 +1,103 @@
+"""
+Database.save_videos on a 100k-video store: id index vs list scans.
+
+save_videos used to build the existing ids as a list (a linear `in` per
+video) and, for every known video, scan the whole video list for the entry
+to replace. It now keeps an id -> position index in sync with the list. This
+upserts a batch (half known, half new) into a synthetic store both ways,
+without the file write that both share, and checks that the resulting video
+lists are identical. The time of that file write is printed for scale.
+
+Usage (from the repository root):
+    
+    python -m benchmarks.bench_database_upsert [--videos 100000] [--batch 1000]
+"""
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+from utils.database import Database
+
+
+class InMemoryDatabase(Database):
+    """Database whose save is a no-op, to time the upsert alone"""
+    
+    def __init__(self, videos):
+        self.db_file = None
+        self.data = {'videos': videos, 'last_update': None}
+        self._positions = self._build_index()
+    
+    def _save_data(self):
+        pass
+
+
+def legacy_save_videos(db, videos):
+    """The previous implementation, without the file write."""
+    existing_ids = [v.get('id') for v in db.data['videos']]
+    new_videos = []
+    for video in videos:
+        if video.get('id') not in existing_ids:
+            video['added_at'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            new_videos.append(video)
+        else:
+            for i, existing_video in enumerate(db.data['videos']):
+                if existing_video.get('id') == video.get('id'):
+                    video['added_at'] = existing_video.get('added_at')
+                    db.data['videos'][i] = video
+    db.data['videos'].extend(new_videos)
+    return len(new_videos)
+
+
+def store(count):
+    return [{'id': f"v{i}", 'title': f"Video {i}", 'platforms': ["Xtrade"], 'added_at': "2024-01-01 00:00:00"}
+            for i in range(count)]
+
+
+def batch(count, size):
+    """size videos, every other one already stored"""
+    return [{'id': f"v{i * count // size}" if i % 2 else f"new{i}", 'title': f"Updated {i}", 'platforms': []}
+            for i in range(size)]
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--videos", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args(argv)
+    
+    legacy_db = InMemoryDatabase(store(args.videos))
+    start = time.perf_counter()
+    legacy_new = legacy_save_videos(legacy_db, batch(args.videos, args.batch))
+    legacy_time = time.perf_counter() - start
+    
+    indexed_db = InMemoryDatabase(store(args.videos))
+    start = time.perf_counter()
+    indexed_new = indexed_db.save_videos(batch(args.videos, args.batch))
+    indexed_time = time.perf_counter() - start
+    
+    with tempfile.TemporaryDirectory() as directory:
+        indexed_db.db_file = os.path.join(directory, "video_data.json")
+        start = time.perf_counter()
+        Database._save_data(indexed_db)
+        write_time = time.perf_counter() - start
+    
+    print(f"{args.videos} stored videos, batch of {args.batch} ({indexed_new} new)")
+    print(f"{'list scans':<14}{legacy_time * 1000:>10.1f} ms")
+    print(f"{'id index':<14}{indexed_time * 1000:>10.1f} ms")
+    print(f"{'file write':<14}{write_time * 1000:>10.1f} ms")
+    
+    def strip(videos):
+        return [{k: v for k, v in video.items() if k != 'added_at'} for video in videos]
+    
+    if legacy_new != indexed_new or strip(legacy_db.data['videos']) != strip(indexed_db.data['videos']):
+        print("[!] The upserts produced different video lists")
+        return 1
+    print(f"[+] Same video list; upsert {legacy_time / max(indexed_time, 1e-9):.0f}x faster")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,158 @@
+"""
+One extraction pass vs the three separate link/group extractors.
+
+The project used to run TextProcessor.process_video, the utils.text_extraction
+link/group functions and YouTubeScraper.extract_* independently, each with
+its own regex passes over the same text. This runs copies of those three
+implementations and TextProcessor.extract (once, read through the adapters
+for each schema) over the same corpus, checks that the outputs agree and
+times both. Group names are read through the accent-folded view since
+EXTRACTOR_VERSION 2, so outputs are only compared on ASCII texts (see
+benchmarks.bench_accent_folding for accented names). It then times the
+utils.text_extraction link/group functions, which callers still use one
+schema at a time, against the code they replaced.
+
+Usage (from the repository root):
+    
+    python -m benchmarks.bench_extraction_engine [videos.json ...]
+"""
+import random
+import re
+import sys
+import time
+from urllib.parse import urlparse
+
+from benchmarks.bench_keyword_engine import DEFAULT_CORPORA, load_corpus, synthetic_corpus, unchanged_by_folding
+from scrapers.text_processor import TextProcessor
+from utils import text_extraction
+
+LINK_SNIPPETS = (
+    "Entre no grupo do Alpha Sinais https://chat.whatsapp.com/AbC12xyZ ",
+    "canal de Sinais VIP https://t.me/sinaisvip ", "https://t.me/joinchat/AAAAxyz ",
+    "https://telegram.me/plataforma ", "https://www.plataforma.com.br/cadastro?ref=123 ",
+    "https://youtube.com/watch?v=abcdefghijk ", "https://bit.ly/3abc ", "https://instagram.com/perfil ",
+    "https://go.site.io/r?u=https://chat.whatsapp.com/Q1w2e3 "
+)
+
+
+def legacy_text_processor(processor, text, include_platforms=True):
+    """TextProcessor.process_video links and groups, before the shared engine."""
+    urls = re.findall(r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+[/\w\.-]*(?:\?[/\w\.-=&]*)?', text)
+    links = [u for u in urls if not any(d in urlparse(u).netloc for d in
+                                        ("youtube.com", "youtu.be", "google.com", "facebook.com", "instagram.com"))]
+    
+    groups = []
+    kinds = (
+        ("WhatsApp", "WhatsApp Group", r'https?://(?:chat\.)?whatsapp\.com/(?:invite/)?(?:[-\w]*)',
+         r'grupo\s+(?:do|de|da)?\s+([A-Za-z0-9\s]{3,30})'),
+        ("Telegram", "Telegram Channel", r'https?://(?:t\.me|telegram\.me|telegram\.dog)/(?:joinchat/)?(?:[-\w]*)',
+         r'(?:canal|grupo|channel)\s+(?:do|de|da)?\s+([A-Za-z0-9\s]{3,30})')
+    )
+    for platform, default_name, link_pattern, name_pattern in kinds:
+        for i, link in enumerate(re.findall(link_pattern, text)):
+            link_pos = text.find(link)
+            window = text[max(0, link_pos - 100):min(len(text), link_pos + len(link) + 100)]
+            name_match = re.search(name_pattern, window, re.IGNORECASE)
+            name = name_match.group(1).strip() if name_match else f"{default_name} {i+1}"
+            groups.append({"platform": platform, "name": name, "link": link})
+    
+    return processor._find_platforms(text) if include_platforms else [], links, groups
+
+
+def legacy_text_extraction(text):
+    """utils.text_extraction links and groups, before the shared engine."""
+    links = [{'domain': m.group(1), 'url': m.group(0)} for m in re.finditer(
+        r'https?://(?:www\.)?([a-zA-Z0-9][-a-zA-Z0-9]{0,62}(?:\.[a-zA-Z0-9][-a-zA-Z0-9]{0,62})+)', text)]
+    whatsapp = [{'invite_code': m.group(1), 'url': m.group(0)} for m in re.finditer(
+        r'https?://(?:chat\.)?whatsapp\.com/(?:invite/)?([a-zA-Z0-9]+)', text)]
+    telegram = [{'username': m.group(1), 'url': m.group(0)} for m in re.finditer(
+        r'https?://t\.me/([a-zA-Z0-9_]+)', text)]
+    return links, {'whatsapp': whatsapp, 'telegram': telegram}
+
+
+def legacy_youtube(text):
+    """YouTubeScraper.extract_links / extract_whatsapp_links / extract_telegram_links."""
+    urls = re.findall(r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+[/\w\.-]*(?:\?[/\w\.-=&]*)?', text)
+    links = [u for u in urls if "youtube.com" not in urlparse(u).netloc and "youtu.be" not in urlparse(u).netloc]
+    whatsapp = re.findall(r'https?://(?:chat\.)?whatsapp\.com/(?:invite/)?(?:[-\w]*)', text)
+    telegram = re.findall(r'https?://(?:t\.me|telegram\.me|telegram\.dog)/(?:joinchat/)?(?:[-\w]*)', text)
+    return links, whatsapp, telegram
+
+
+def engine(processor, text, include_platforms=True):
+    """One TextProcessor.extract call, read in all three schemas."""
+    result = processor.extract(text, include_platforms)
+    youtube_links = [u for u in result.urls if "youtube.com" not in urlparse(u).netloc and "youtu.be" not in urlparse(u).netloc]
+    return (
+        result.as_tuple(),
+        (result.websites, result.legacy_groups()),
+        (youtube_links, result.whatsapp_links, result.telegram_links)
+    )
+
+
+def adapters(text):
+    """utils.text_extraction links and groups, one function per schema."""
+    groups = {'whatsapp': text_extraction.extract_whatsapp_groups(text),
+              'telegram': text_extraction.extract_telegram_groups(text)}
+    return text_extraction.extract_links(text), groups
+
+
+def with_links(texts, seed=2):
+    """Sprinkle links and group invitations into the texts."""
+    rng = random.Random(seed)
+    return [text + ' ' + ''.join(rng.choice(LINK_SNIPPETS) for _ in range(rng.randint(0, 12))) for text in texts]
+
+
+def main(argv):
+    texts = load_corpus(argv or DEFAULT_CORPORA)
+    texts += with_links(synthetic_corpus(keyword_share=0.05, seed=1))
+    texts += with_links(synthetic_corpus(keyword_share=0.05, seed=3, ascii_only=True), seed=4)
+    compared = [i for i, text in enumerate(texts) if unchanged_by_folding(text)]
+    processor = TextProcessor()
+    
+    print(f"{len(texts)} texts, {sum(len(t) for t in texts) / 1024:.0f} KiB, {len(compared)} unchanged by folding")
+    print(f"{'extractor':<22}{'platforms':>11}{'total':>12}{'per text':>12}")
+    
+    status = 0
+    for include_platforms in (False, True):
+        start = time.perf_counter()
+        legacy = [
+            (legacy_text_processor(processor, t, include_platforms), legacy_text_extraction(t), legacy_youtube(t))
+            for t in texts
+        ]
+        legacy_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        current = [engine(processor, t, include_platforms) for t in texts]
+        current_time = time.perf_counter() - start
+        
+        label = "yes" if include_platforms else "no"
+        for name, elapsed in (("three extractors", legacy_time), ("one extract() pass", current_time)):
+            print(f"{name:<22}{label:>11}{elapsed * 1000:>9.1f} ms{elapsed / len(texts) * 1e6:>9.0f} us")
+        
+        mismatches = [i for i in compared if current[i] != legacy[i]]
+        if mismatches:
+            print(f"[!] {len(mismatches)} texts differ, first is text {mismatches[0]}")
+            status = 1
+    
+    start = time.perf_counter()
+    legacy = [legacy_text_extraction(t) for t in texts]
+    legacy_time = time.perf_counter() - start
+    start = time.perf_counter()
+    current = [adapters(t) for t in texts]
+    current_time = time.perf_counter() - start
+    
+    for name, elapsed in (("old text_extraction", legacy_time), ("text_extraction now", current_time)):
+        print(f"{name:<22}{'no':>11}{elapsed * 1000:>9.1f} ms{elapsed / len(texts) * 1e6:>9.0f} us")
+    if current != legacy:
+        print("[!] utils.text_extraction adapters differ from the functions they replaced")
+        status = 1
+    
+    if status == 0:
+        print(f"[+] Output identical on all {len(compared)} texts folding doesn't change, "
+              f"and adapter output on all {len(texts)}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
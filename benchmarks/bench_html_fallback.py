@@ -0,0 +1,60 @@
+"""
+Runtime of the search page HTML fallback on pathological input.
+
+The previous implementation ran rf'title="(.*?)".*?href="/watch\\?v={id}'
+over the whole page once per video ID; on long lines with many title
+attributes and no matching link the two nested lazy spans make it grow
+roughly cubically with the page size. The single-scan version should stay
+linear.
+
+Usage (from the repository root):
+    
+    python -m benchmarks.bench_html_fallback
+"""
+import re
+import time
+
+from scrapers.youtube_scraper import YouTubeScraper
+
+
+def legacy_extract(html_content, max_videos=10):
+    video_ids = re.findall(r'watch\?v=([A-Za-z0-9_-]{11})', html_content)
+    unique_ids = []
+    for video_id in video_ids:
+        if video_id not in unique_ids:
+            unique_ids.append(video_id)
+    
+    results = []
+    for video_id in unique_ids[:max_videos]:
+        title_match = re.search(rf'title="(.*?)".*?href="/watch\?v={video_id}', html_content)
+        results.append(title_match.group(1) if title_match else f"Video {video_id}")
+    return results
+
+
+def pathological_page(units):
+    """One long line of title attributes and video IDs that are never linked."""
+    parts = []
+    for i in range(units):
+        parts.append(f'<a title="Video {i}" data-x="1">')
+        parts.append(f'"url":"/watch?v=p{i:010d}"')
+    return ''.join(parts)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    scraper = YouTubeScraper.__new__(YouTubeScraper)
+    print(f"{'units':>8}{'chars':>10}{'single scan':>14}{'legacy':>12}")
+    for units in (10, 20, 40, 80, 10_000, 100_000):
+        page = pathological_page(units)
+        new = timed(scraper._extract_videos_from_html, page, 10)
+        legacy = f"{timed(legacy_extract, page, 10) * 1000:>9.2f} ms" if units <= 80 else f"{'skipped':>12}"
+        print(f"{units:>8}{len(page):>10}{new * 1000:>11.2f} ms{legacy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Platform keyword engine: single-pass matcher vs the per-keyword scans.
+
+Checks that TextProcessor.extract_platforms returns exactly what the
+previous implementation returned on a golden corpus (the stored videos plus
+synthetic long descriptions with keywords and capitalized words around the
+window edges), then times both, taking the best of three runs each.
+
+Since the keywords are matched in accent-folded text (EXTRACTOR_VERSION 2)
+the comparison only covers texts folding can't change: ASCII texts that
+mention no accented keyword in its folded spelling. That includes an ASCII
+synthetic corpus; benchmarks.bench_accent_folding checks the folded matching
+itself.
+
+Usage (from the repository root):
+    
+    python -m benchmarks.bench_keyword_engine [videos.json ...]
+
+Without arguments data/videos.json and video_data.json are used if present.
+"""
+import json
+import os
+import random
+import re
+import sys
+import time
+
+from scrapers.text_processor import TextProcessor
+from utils.normalized_text import fold
+
+DEFAULT_CORPORA = (os.path.join("data", "videos.json"), "video_data.json")
+
+KEYWORD_WORDS = (
+    "o", "de", "para", "com", "ganhar", "Dinheiro", "lucro", "plataforma", "trade", "trader", "day",
+    "Trading", "BetNova", "CryptoPay", "pix", "saque", "bônus", "Pirâmide", "renda", "extra",
+    "XTradeMaxPlataformaInvestimento", "ÉpicaBet", "Ação", "roi", "btc", "bitcoin", "Os", "Das",
+    "https://site.com/x", "multinível", "depósito", "opções", "binárias", "TRADE", "İstanbul",
+    "FxTrade", "plataformaplataforma", "Abc1", "AbcdefghijklmnopQ", "x_Trade", "tradetrade"
+)
+
+PROSE_WORDS = (
+    "o", "que", "você", "precisa", "saber", "sobre", "isso", "hoje", "agora", "para", "com", "uma",
+    "mais", "muito", "Brasil", "São", "Paulo", "Janeiro", "vídeo", "canal", "inscreva", "curta",
+    "compartilhe", "link", "abaixo", "descrição"
+)
+
+
+def legacy_extract_platforms(processor, text):
+    """The previous extract_platforms, without the log line."""
+    if not text:
+        return []
+    
+    text_lower = text.lower()
+    platform_candidates = {}
+    
+    platform_phrases = re.findall(r'(?:a\s+)?plataforma\s+(?:de\s+investimento\s+)?([A-Za-z0-9]+[A-Za-z0-9\s]*)', text, re.IGNORECASE)
+    for phrase in platform_phrases:
+        name = phrase.strip()
+        if name and len(name) > 2:
+            platform_candidates[name] = platform_candidates.get(name, 0) + 5
+    
+    for pattern in processor.name_patterns:
+        for match in re.findall(pattern, text):
+            if match and len(match) > 2:
+                platform_candidates[match] = platform_candidates.get(match, 0) + 3
+    
+    for keyword in processor.platform_keywords:
+        if keyword in text_lower:
+            positions = [m.start() for m in re.finditer(re.escape(keyword), text_lower)]
+            for pos in positions:
+                start = max(0, pos - 50)
+                end = min(len(text), pos + 50 + len(keyword))
+                window = text[start:end]
+                for word in re.findall(r'\b[A-Z][a-zA-Z0-9]{2,15}\b', window):
+                    if word and word.lower() not in ['o', 'os', 'a', 'as', 'de', 'da', 'do', 'das', 'dos']:
+                        platform_candidates[word] = platform_candidates.get(word, 0) + 2
+    
+    sorted_candidates = sorted(platform_candidates.items(), key=lambda x: x[1], reverse=True)
+    platforms = [name for name, score in sorted_candidates if score >= 2]
+    
+    unique_platforms = []
+    for platform in platforms:
+        if len(platform) <= 2 or platform.lower() in ['sim', 'não', 'pix', 'app', 'site', 'link']:
+            continue
+        if not any(platform.lower() in e.lower() or e.lower() in platform.lower() for e in unique_platforms):
+            unique_platforms.append(platform)
+    
+    return unique_platforms
+
+
+def load_corpus(paths):
+    """Title + description texts of every stored video, in either storage schema."""
+    texts = []
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        videos = data.get('videos', []) if isinstance(data, dict) else data
+        for video in videos:
+            texts.append(f"{video.get('title', '')}\n\n{video.get('description', '')}")
+    return texts
+
+
+def synthetic_corpus(count=100, keyword_share=1.0, seed=0, ascii_only=False):
+    """Long descriptions with keywords and capitalized words at every distance from each other."""
+    keyword_words, prose_words = (
+        [word for word in words if word.isascii() or not ascii_only] for words in (KEYWORD_WORDS, PROSE_WORDS)
+    )
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        words = [
+            rng.choice(keyword_words) if rng.random() < keyword_share else rng.choice(prose_words)
+            for _ in range(rng.randint(50, 2000))
+        ]
+        separators = [rng.choice((" ", " ", " ", "\n", ", ", ". ", "")) for _ in words]
+        texts.append(''.join(w + s for w, s in zip(words, separators)))
+    return texts
+
+
+def unchanged_by_folding(text, folded_only=()):
+    """Whether matching on text is the same with and without accent folding."""
+    return text.isascii() and not any(word in text.lower() for word in folded_only)
+
+
+def run(funcs, texts, repeats=3):
+    """
+    Results of each func on every text, and its best CPU time over a few runs
+    
+    The runs alternate between the funcs, so a slow stretch of the machine
+    doesn't land on one of them only.
+    """
+    results = [None] * len(funcs)
+    timings = [float('inf')] * len(funcs)
+    for _ in range(repeats):
+        for i, func in enumerate(funcs):
+            start = time.process_time()
+            results[i] = [func(text) for text in texts]
+            timings[i] = min(timings[i], time.process_time() - start)
+    return results, timings
+
+
+def main(argv):
+    stored = load_corpus(argv or DEFAULT_CORPORA)
+    texts = stored + synthetic_corpus(keyword_share=1.0) + synthetic_corpus(keyword_share=0.05, seed=1)
+    texts += synthetic_corpus(keyword_share=1.0, seed=2, ascii_only=True)
+    processor = TextProcessor()
+    folded_only = [fold(keyword) for keyword in processor.platform_keywords if fold(keyword) != keyword.lower()]
+    compared = [i for i, text in enumerate(texts) if unchanged_by_folding(text, folded_only)]
+    
+    (current, legacy), (current_time, legacy_time) = run(
+        (processor.extract_platforms, lambda text: legacy_extract_platforms(processor, text)), texts
+    )
+    
+    mismatches = [i for i in compared if current[i] != legacy[i]]
+    chars = sum(len(t) for t in texts)
+    print(f"{len(texts)} texts ({len(stored)} stored), {chars / 1024:.0f} KiB, {len(compared)} unchanged by folding")
+    print(f"{'engine':<16}{'total':>12}{'per text':>12}")
+    print(f"{'single pass':<16}{current_time * 1000:>9.1f} ms{current_time / len(texts) * 1e6:>9.0f} us")
+    print(f"{'per keyword':<16}{legacy_time * 1000:>9.1f} ms{legacy_time / len(texts) * 1e6:>9.0f} us")
+    
+    if mismatches:
+        i = mismatches[0]
+        print(f"[!] {len(mismatches)} mismatches, first on text {i}: {current[i]} != {legacy[i]}")
+        return 1
+    print(f"[+] Output identical on all {len(compared)} texts folding doesn't change")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
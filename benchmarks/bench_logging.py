@@ -0,0 +1,88 @@
+"""
+Per-video print() vs leveled logging on a 10k-video batch.
+
+The scan pipeline used to print three lines per video: the details fetch,
+the details parse and the extraction counts. Those are now DEBUG records and
+per-scan counters. This runs TextProcessor.process_video over a batch with
+the old print() lines restored around it and with logging configured as the
+app does (INFO), and compares the throughput.
+
+The printed lines go to os.devnull through a line-buffered file, like a
+terminal, unless --stdout is given; a real console is slower still.
+
+Usage (from the repository root):
+    
+    python -m benchmarks.bench_logging [--videos 10000] [--stdout] [videos.json ...]
+"""
+import argparse
+import contextlib
+import itertools
+import os
+import sys
+import time
+
+from benchmarks.bench_extraction_engine import with_links
+from benchmarks.bench_keyword_engine import DEFAULT_CORPORA, load_corpus
+from scrapers.text_processor import TextProcessor
+from utils.log import configure_logging, format_counters
+
+
+def batch(count, paths):
+    """count videos cycling through the stored ones, with links sprinkled in"""
+    texts = with_links(load_corpus(paths) or ["Plataforma XTrade paga bem, entre no grupo"])
+    return [{"id": f"v{i}", "title": f"Video {i}", "description": text}
+            for i, text in zip(range(count), itertools.cycle(texts))]
+
+
+def printing(processor, videos, out):
+    """process_video with the per-video lines the scan used to print."""
+    for video in videos:
+        print(f"[*] Fetching details for YouTube video ID: {video['id']}", file=out)
+        print(f"[+] Successfully extracted details for video: {video['title']}", file=out)
+        platforms, links, groups = processor.process_video(video)
+        print(f"[+] Extracted {len(platforms)} potential platform names, {len(links)} URLs "
+              f"and {len(groups)} messaging groups/channels", file=out)
+
+
+def logging_only(processor, videos):
+    """process_video as it runs now, with one summary line at the end."""
+    for video in videos:
+        processor.process_video(video)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--videos", type=int, default=10000)
+    parser.add_argument("--stdout", action="store_true", help="print the old lines to the real stdout")
+    parser.add_argument("corpora", nargs="*")
+    args = parser.parse_args(argv)
+    
+    configure_logging("INFO")
+    videos = batch(args.videos, args.corpora or DEFAULT_CORPORA)
+    processor = TextProcessor()
+    
+    # Warm up the compiled patterns so neither run pays for them
+    logging_only(processor, videos[:50])
+    
+    with contextlib.ExitStack() as stack:
+        out = sys.stdout if args.stdout else stack.enter_context(open(os.devnull, "w", buffering=1))
+        start = time.perf_counter()
+        printing(processor, videos, out)
+        print_time = time.perf_counter() - start
+    
+    processor.counters.clear()
+    start = time.perf_counter()
+    logging_only(processor, videos)
+    summary = format_counters(processor.counters)
+    logging_time = time.perf_counter() - start
+    
+    print(f"{len(videos)} videos")
+    print(f"{'output':<22}{'total':>12}{'videos/s':>12}")
+    for name, elapsed in (("print per video", print_time), ("logging + counters", logging_time)):
+        print(f"{name:<22}{elapsed * 1000:>9.1f} ms{len(videos) / elapsed:>12.0f}")
+    print(f"[+] {print_time / logging_time:.2f}x throughput; summary line: {summary}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,78 @@
+"""
+Platform candidate dedup: substring index vs the pairwise scan.
+
+extract_platforms drops every candidate that contains or is contained in an
+already accepted name. The previous loop compared each candidate with every
+accepted name, lowercasing both each time. This checks that drop_variations
+keeps exactly the same names on random candidate lists of growing size and
+times both.
+
+Usage (from the repository root):
+    
+    python -m benchmarks.bench_platform_dedup
+"""
+import random
+import string
+import sys
+import time
+
+from scrapers.keyword_matcher import drop_variations
+
+SIZES = (100, 1000, 5000)
+
+
+def legacy_dedup(platforms):
+    """The previous dedup loop."""
+    unique_platforms = []
+    for platform in platforms:
+        if not any(platform.lower() in e.lower() or e.lower() in platform.lower() for e in unique_platforms):
+            unique_platforms.append(platform)
+    return unique_platforms
+
+
+def candidates(count, seed=0):
+    """Capitalized names, phrases and names built from each other, like extract_platforms produces."""
+    rng = random.Random(seed)
+    names = []
+    for _ in range(count):
+        roll = rng.random()
+        if names and roll < 0.2:
+            # A variation of an earlier name
+            base = rng.choice(names)
+            names.append(rng.choice((base.upper(), base[1:], base + "Bet", "Top" + base.lower())))
+        elif roll < 0.3:
+            words = [rng.choice(string.ascii_uppercase) + ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 8)))
+                     for _ in range(rng.randint(2, 6))]
+            names.append(' '.join(words))
+        else:
+            names.append(rng.choice(string.ascii_uppercase) + ''.join(rng.choices(string.ascii_letters + string.digits, k=rng.randint(3, 15))))
+    return names
+
+
+def main():
+    print(f"{'candidates':>10}{'kept':>8}{'pairwise':>14}{'indexed':>14}")
+    
+    status = 0
+    for size in SIZES:
+        names = candidates(size)
+        
+        start = time.perf_counter()
+        legacy = legacy_dedup(names)
+        legacy_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        current = drop_variations(names)
+        current_time = time.perf_counter() - start
+        
+        print(f"{size:>10}{len(current):>8}{legacy_time * 1000:>11.1f} ms{current_time * 1000:>11.1f} ms")
+        if current != legacy:
+            print(f"[!] Kept names differ for {size} candidates")
+            status = 1
+    
+    if status == 0:
+        print("[+] Kept names identical for every size")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+extract_platform_names keyword proximity: prefix counts vs window slices.
+
+The proximity check used to slice the 11 tokens around every candidate and
+test each of the 20 platform keywords against the slice. It now reads two
+entries of a running count of keyword tokens. This checks that both return
+the same set of names on every stored video and on long synthetic
+descriptions, then times both.
+
+The window-slicing copy keeps the tokenizer of the time (lowercased, not
+accent-folded), so names are only compared on the texts folding can't
+change: ASCII texts without a word that is only a stopword or keyword once
+folded ("nao", "multinivel"). benchmarks.bench_accent_folding covers the rest.
+
+Usage (from the repository root):
+    
+    python -m benchmarks.bench_platform_proximity [videos.json ...]
+"""
+import sys
+import time
+
+from benchmarks.bench_keyword_engine import DEFAULT_CORPORA, load_corpus, synthetic_corpus
+from utils.patterns import QUOTED_NAME_PATTERN
+from utils.text_extraction import (
+    FOLDED_STOPWORDS, PLATFORM_KEYWORD_SET, PLATFORM_KEYWORDS, PORTUGUESE_STOPWORDS, TOKEN_PATTERN,
+    extract_platform_names
+)
+
+# Words that are only stopwords or keywords in their folded spelling
+FOLDED_ONLY = (FOLDED_STOPWORDS - PORTUGUESE_STOPWORDS) | (PLATFORM_KEYWORD_SET - set(PLATFORM_KEYWORDS))
+
+
+def legacy_extract_platform_names(text):
+    """The previous window-slicing implementation, on the regex tokenizer."""
+    platforms = []
+    tokens, stop_words = TOKEN_PATTERN.findall(text.lower()), PORTUGUESE_STOPWORDS
+    for i, token in enumerate(tokens):
+        if token in stop_words or len(token) < 3:
+            continue
+        context = tokens[max(0, i - 5):min(len(tokens), i + 6)]
+        if any(keyword in context for keyword in PLATFORM_KEYWORDS):
+            platform_name = token.title()
+            if platform_name not in platforms:
+                platforms.append(platform_name)
+    for match in QUOTED_NAME_PATTERN.finditer(text):
+        potential_name = match.group(1).strip()
+        if len(potential_name.split()) <= 3:
+            platforms.append(potential_name)
+    return list(set(platforms))
+
+
+def unchanged_by_folding(text):
+    """Whether the folding tokenizer sees the same tokens, stopwords and keywords in text."""
+    return text.isascii() and FOLDED_ONLY.isdisjoint(TOKEN_PATTERN.findall(text.lower()))
+
+
+def run(func, texts):
+    start = time.perf_counter()
+    results = [set(func(text)) for text in texts]
+    return results, time.perf_counter() - start
+
+
+def main(argv):
+    stored = load_corpus(argv or DEFAULT_CORPORA)
+    # Mostly keyword words, so candidates sit next to keywords at every distance
+    texts = stored + synthetic_corpus(keyword_share=0.5, seed=3)
+    texts += synthetic_corpus(keyword_share=0.5, seed=4, ascii_only=True)
+    compared = [i for i, text in enumerate(texts) if unchanged_by_folding(text)]
+    
+    current, current_time = run(lambda text: extract_platform_names(text, "regex"), texts)
+    legacy, legacy_time = run(legacy_extract_platform_names, texts)
+    
+    print(f"{len(texts)} texts ({len(stored)} stored), {len(compared)} unchanged by folding")
+    print(f"{'proximity':<16}{'total':>12}{'per text':>12}")
+    print(f"{'prefix counts':<16}{current_time * 1000:>9.1f} ms{current_time / len(texts) * 1e6:>9.0f} us")
+    print(f"{'window slices':<16}{legacy_time * 1000:>9.1f} ms{legacy_time / len(texts) * 1e6:>9.0f} us")
+    
+    mismatches = [i for i in compared if current[i] != legacy[i]]
+    if mismatches:
+        i = mismatches[0]
+        print(f"[!] {len(mismatches)} texts differ, first is text {i}: {sorted(current[i] ^ legacy[i])}")
+        return 1
+    print(f"[+] Same platform names on all {len(compared)} texts folding doesn't change")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,72 @@
+"""
+Batch extraction: TextProcessor.process_videos across worker counts.
+
+Runs process_videos over the stored videos plus synthetic descriptions with
+1 worker (in process, the same work as calling process_video in a loop) and
+with process pools of growing size, checks that every run returns the same
+results in the same order and prints the speedup over one worker.
+
+Usage (from the repository root):
+    
+    python -m benchmarks.bench_process_videos [--workers 1,2,4,8] [--copies 4] [videos.json ...]
+
+Without --workers the counts double up to the CPU count.
+"""
+import argparse
+import os
+import sys
+import time
+
+from benchmarks.bench_extraction_engine import with_links
+from benchmarks.bench_keyword_engine import DEFAULT_CORPORA, load_corpus, synthetic_corpus
+from scrapers.text_processor import TextProcessor
+
+
+def worker_counts():
+    counts = [1]
+    while counts[-1] * 2 <= (os.cpu_count() or 1):
+        counts.append(counts[-1] * 2)
+    return counts
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=lambda s: [int(n) for n in s.split(",")], default=worker_counts())
+    parser.add_argument("--copies", type=int, default=4, help="times the corpus is repeated")
+    parser.add_argument("--chunksize", type=int, default=32)
+    parser.add_argument("corpora", nargs="*")
+    args = parser.parse_args(argv)
+    
+    texts = load_corpus(args.corpora or DEFAULT_CORPORA)
+    texts += with_links(synthetic_corpus(keyword_share=0.05, seed=1))
+    videos = [{"title": "", "description": text} for text in texts] * args.copies
+    
+    processor = TextProcessor()
+    
+    print(f"{len(videos)} videos, {sum(len(t) for t in texts) * args.copies / 1024:.0f} KiB, "
+          f"{os.cpu_count()} CPUs, chunksize {args.chunksize}")
+    print(f"{'workers':>8}{'total':>12}{'per video':>12}{'speedup':>10}")
+    
+    status = 0
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        results = list(processor.process_videos(videos, workers=workers, chunksize=args.chunksize))
+        elapsed = time.perf_counter() - start
+        
+        if baseline is None:
+            baseline = (results, elapsed)
+        elif results != baseline[0]:
+            print(f"[!] Results with {workers} workers differ from the first run")
+            status = 1
+        
+        print(f"{workers:>8}{elapsed * 1000:>9.1f} ms{elapsed / len(videos) * 1e6:>9.0f} us"
+              f"{baseline[1] / elapsed:>9.2f}x")
+    
+    if status == 0:
+        print("[+] Results identical and in input order for every worker count")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,130 @@
+"""
+Store loads per app render: a parse per call vs the process-wide load cache.
+
+One render of app.main() loads the videos directly, again for the platform,
+messaging group and website statistics, and once more for every platform
+expander: N+4 full parses of the store. Loads are now cached for the process,
+keyed on the path, mtime and size of the store's files. This replays the
+loads of one render against a synthetic store on each backend, with and
+without the cache, then checks that a write (through the store, or by another
+process) is picked up by the next load, that an upsert through the repository
+doesn't cost the next render a parse, and that a store with indexed queries
+answers counts and platform lists without one.
+
+Usage (from the repository root):
+    
+    python -m benchmarks.bench_render_loads [--videos 5000] [--expanders 20] [videos.json]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_video_store import history
+from utils.repository import VideoRepository
+from utils.video_store import JSON_FILE, LOAD_STATS, JsonlVideoStore, JsonVideoStore, SqliteVideoStore
+
+
+def render(repository, expanders):
+    """The loads of one app.main() render"""
+    repository.load_videos()
+    repository.get_platform_counts()
+    repository.get_messaging_groups()
+    repository.get_domain_counts()  # get_website_statistics
+    repository.get_domain_details()
+    for platform, _ in repository.get_platform_counts()[:expanders]:
+        repository.get_videos_by_platform(platform)
+
+
+def uncached_render(store, expanders):
+    """The same loads, each parsing the store as before"""
+    videos = store._parse()
+    store._parse()
+    store._parse()
+    store._parse()
+    platforms = list(dict.fromkeys(p for v in videos for p in v.get('platforms', [])))[:expanders]
+    for platform in platforms:
+        [v for v in store._parse() if platform in v.get('platforms', [])]
+    return 4 + len(platforms)
+
+
+EXTERNAL_WRITE = """
+import sys
+from utils.video_store import {cls}
+store = {cls}(sys.argv[1], **{kwargs})
+store.upsert_video({{'id': 'external', 'title': 'Written by another process'}})
+"""
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--videos", type=int, default=5000)
+    parser.add_argument("--expanders", type=int, default=20)
+    parser.add_argument("corpus", nargs="?", default=JSON_FILE)
+    args = parser.parse_args(argv)
+    
+    videos = history(args.videos, args.corpus)
+    print(f"{len(videos)} videos, {args.expanders} platform expanders")
+    print(f"{'backend':<10}{'uncached':>12}{'parses':>8}{'cached':>12}{'parses':>8}{'avoided':>9}")
+    failures = 0
+    with tempfile.TemporaryDirectory() as directory:
+        for cls, kwargs in ((JsonVideoStore, {}), (SqliteVideoStore, {'import_from': None}),
+                            (JsonlVideoStore, {'import_from': None})):
+            path = os.path.join(directory, cls.__name__)
+            store = cls(path, **kwargs)
+            store.save_videos(videos)
+            
+            start = time.perf_counter()
+            uncached_parses = uncached_render(store, args.expanders)
+            uncached_time = time.perf_counter() - start
+            
+            repository = VideoRepository(store)
+            LOAD_STATS.clear()
+            start = time.perf_counter()
+            render(repository, args.expanders)
+            cached_time = time.perf_counter() - start
+            print(f"{cls.__name__[:-10].lower():<10}{uncached_time * 1000:>9.1f} ms{uncached_parses:>8}"
+                  f"{cached_time * 1000:>9.1f} ms{LOAD_STATS['parses']:>8}{LOAD_STATS['parses_avoided']:>9}")
+            if LOAD_STATS['parses'] != 1 or not LOAD_STATS['parses_avoided']:
+                print(f"[!] {cls.__name__}: expected one parse and the other loads counted as avoided")
+                failures += 1
+            
+            # Writes through the store, and by another process, reach the next load
+            repository.upsert_video({'id': 'local', 'title': 'Written here'})
+            if repository.get_video('local') is None:
+                print(f"[!] {cls.__name__}: write through the store not seen")
+                failures += 1
+            LOAD_STATS.clear()
+            render(repository, args.expanders)
+            if LOAD_STATS['parses'] or not LOAD_STATS['parses_avoided']:
+                print(f"[!] {cls.__name__}: the render after an upsert parsed the store again "
+                      f"or didn't count its loads as avoided")
+                failures += 1
+            
+            # Without the list loaded, stores with indexed queries answer them directly
+            fresh = VideoRepository(store)
+            LOAD_STATS.clear()
+            fresh.get_platform_counts()
+            fresh.get_videos_by_platform(videos[0]['platforms'][0] if videos[0].get('platforms') else '')
+            if cls is SqliteVideoStore and LOAD_STATS['parses']:
+                print(f"[!] {cls.__name__}: platform queries parsed the store {LOAD_STATS['parses']} times")
+                failures += 1
+            if fresh.get_platform_counts() != repository.get_platform_counts():
+                print(f"[!] {cls.__name__}: the store's platform counts differ from the list's")
+                failures += 1
+            subprocess.run([sys.executable, "-c", EXTERNAL_WRITE.format(cls=cls.__name__, kwargs=kwargs), path],
+                           check=True)
+            if repository.get_video('external') is None:
+                print(f"[!] {cls.__name__}: write by another process not seen")
+                failures += 1
+    
+    if failures:
+        return 1
+    print("[+] One parse per render, none after an upsert or for indexed queries; outside writes invalidate the cache")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
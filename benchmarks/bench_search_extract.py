@@ -0,0 +1,66 @@
+"""
+Compare ytInitialData extraction on search result pages.
+
+Usage (from the repository root):
+    
+    python -m benchmarks.bench_search_extract [saved_search_page.html ...]
+
+Without arguments synthetic results pages of increasing size are used.
+"""
+import json
+import re
+import sys
+import timeit
+
+from benchmarks._pages import load_pages, make_search_page
+from scrapers.youtube_parser import find_json_blob, INITIAL_DATA_MARKERS
+
+LEGACY_PATTERN = r'var ytInitialData = (.+?);</script>'
+
+
+def legacy_extract(html):
+    """The previous search_videos path: throwaway DOM parse plus lazy regex."""
+    try:
+        from bs4 import BeautifulSoup
+        BeautifulSoup(html, 'html.parser')
+    except ImportError:
+        pass
+    matches = re.search(LEGACY_PATTERN, html)
+    return json.loads(matches.group(1)) if matches else None
+
+
+def regex_extract(html):
+    """The previous regex alone, without the unused BeautifulSoup object."""
+    matches = re.search(LEGACY_PATTERN, html)
+    return json.loads(matches.group(1)) if matches else None
+
+
+def raw_decode_extract(html):
+    return find_json_blob(html, INITIAL_DATA_MARKERS)
+
+
+def main(argv):
+    if argv:
+        pages = [(path, page) for path, page in zip(argv, load_pages(argv))]
+    else:
+        pages = [(f"synthetic {size // 1000} KB", make_search_page(filler_bytes=size))
+                 for size in (200_000, 600_000, 2_000_000)]
+    
+    extractors = [("raw_decode", raw_decode_extract), ("regex", regex_extract), ("bs4 + regex", legacy_extract)]
+    
+    print(f"{'page':<24}" + ''.join(f"{name:>16}" for name, _ in extractors))
+    for name, page in pages:
+        expected = raw_decode_extract(page)
+        row = f"{name:<24}"
+        for _, func in extractors:
+            if func(page) != expected:
+                row += f"{'MISMATCH':>16}"
+                continue
+            number = 3 if func is legacy_extract else 20
+            best = min(timeit.repeat(lambda: func(page), number=number, repeat=3)) / number
+            row += f"{best * 1000:>13.2f} ms"
+        print(row)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
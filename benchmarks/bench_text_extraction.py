@@ -0,0 +1,111 @@
+"""
+utils.text_extraction: import time and extract_platform_names per call.
+
+The module used to import NLTK and try to download punkt and the stopwords
+corpus at import, then tokenize with word_tokenize and rebuild the stopword
+set from the corpus file on every call. This times the old import sequence
+against importing the module now (each in a fresh interpreter), and the old
+extract_platform_names against the regex backend on the stored videos.
+
+The old per-call path needs the NLTK data installed; without it the old code
+only reached its except branch, so that row is skipped.
+
+Usage (from the repository root):
+    
+    python -m benchmarks.bench_text_extraction [--imports 5] [videos.json ...]
+"""
+import argparse
+import subprocess
+import sys
+import time
+
+from benchmarks.bench_keyword_engine import DEFAULT_CORPORA, load_corpus
+from utils.patterns import QUOTED_NAME_PATTERN
+from utils.text_extraction import PLATFORM_KEYWORDS, extract_platform_names
+
+LEGACY_IMPORT = """
+import scrapers.text_processor, utils.patterns
+import nltk
+from nltk.tokenize import word_tokenize
+from nltk.corpus import stopwords
+try:
+    nltk.data.find('tokenizers/punkt')
+except LookupError:
+    nltk.download('punkt', quiet=True)
+try:
+    nltk.data.find('corpora/stopwords')
+except LookupError:
+    nltk.download('stopwords', quiet=True)
+"""
+
+CURRENT_IMPORT = "import utils.text_extraction"
+
+
+def import_time(code, runs):
+    """Best wall time of running code in a fresh interpreter, minus an empty interpreter"""
+    def best(source):
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", source], check=True, capture_output=True)
+            times.append(time.perf_counter() - start)
+        return min(times)
+    return best(code) - best("pass")
+
+
+def legacy_extract_platform_names(text):
+    """The previous NLTK implementation, without the error log."""
+    from nltk.tokenize import word_tokenize
+    from nltk.corpus import stopwords
+    
+    platforms = []
+    tokens = word_tokenize(text.lower())
+    stop_words = set(stopwords.words('portuguese'))
+    for i, token in enumerate(tokens):
+        if token in stop_words or len(token) < 3:
+            continue
+        context = tokens[max(0, i - 5):min(len(tokens), i + 6)]
+        if any(keyword in context for keyword in PLATFORM_KEYWORDS):
+            platform_name = token.title()
+            if platform_name not in platforms:
+                platforms.append(platform_name)
+    for match in QUOTED_NAME_PATTERN.finditer(text):
+        potential_name = match.group(1).strip()
+        if len(potential_name.split()) <= 3:
+            platforms.append(potential_name)
+    return list(set(platforms))
+
+
+def per_call(func, texts):
+    start = time.perf_counter()
+    for text in texts:
+        func(text)
+    return (time.perf_counter() - start) / len(texts)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--imports", type=int, default=5, help="interpreter runs per import timing")
+    parser.add_argument("corpora", nargs="*")
+    args = parser.parse_args(argv)
+    
+    texts = load_corpus(args.corpora or DEFAULT_CORPORA)
+    legacy_import = import_time(LEGACY_IMPORT, args.imports)
+    current_import = import_time(CURRENT_IMPORT, args.imports)
+    
+    print(f"{'path':<28}{'import':>12}{'per call':>12}")
+    try:
+        legacy_extract_platform_names("probe")
+        legacy_call = f"{per_call(legacy_extract_platform_names, texts) * 1e6:>9.0f} us"
+    except LookupError:
+        legacy_call = f"{'(no data)':>12}"
+    current_call = per_call(lambda text: extract_platform_names(text, "regex"), texts)
+    
+    print(f"{'NLTK, downloads at import':<28}{legacy_import * 1000:>9.1f} ms{legacy_call}")
+    print(f"{'regex, bundled stopwords':<28}{current_import * 1000:>9.1f} ms{current_call * 1e6:>9.0f} us")
+    print(f"[+] {len(texts)} texts; import {legacy_import / max(current_import, 1e-9):.1f}x faster")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,64 @@
+"""
+Storing a scan's new videos: rewriting the history vs appending to it.
+
+A scan used to save existing_videos + new_videos, rewriting the whole store
+to add a handful of videos. It now upserts each video as it is produced. This
+stores a synthetic history, then adds a few new videos the old way (one full
+save) and the new way (one upsert per video, each fsynced on the JSONL log)
+on every backend, and checks that all of them end up with the same videos.
+
+Usage (from the repository root):
+    
+    python -m benchmarks.bench_video_ingest [--videos 20000] [--new 3] [videos.json]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_video_store import history
+from utils.video_store import JSON_FILE, JsonlVideoStore, JsonVideoStore, SqliteVideoStore
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--videos", type=int, default=20000)
+    parser.add_argument("--new", type=int, default=3, help="new videos found by the scan")
+    parser.add_argument("corpus", nargs="?", default=JSON_FILE)
+    args = parser.parse_args(argv)
+    
+    videos = history(args.videos + args.new, args.corpus)
+    existing, new = videos[:args.videos], videos[args.videos:]
+    
+    print(f"{len(existing)} stored videos, {len(new)} new")
+    print(f"{'backend':<10}{'save all':>12}{'upserts':>12}")
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, factory in (
+                ("json", lambda path: JsonVideoStore(path)),
+                ("sqlite", lambda path: SqliteVideoStore(path, import_from=None)),
+                ("jsonl", lambda path: JsonlVideoStore(path, import_from=None))):
+            timings = []
+            for mode in ("save", "upsert"):
+                store = factory(os.path.join(directory, f"{name}-{mode}"))
+                store.save_videos(existing)
+                start = time.perf_counter()
+                if mode == "save":
+                    store.save_videos(existing + new)
+                else:
+                    for video in new:
+                        store.upsert_video(video)
+                timings.append(time.perf_counter() - start)
+                results.append(store.load_videos())
+            print(f"{name:<10}{timings[0] * 1000:>9.1f} ms{timings[1] * 1000:>9.1f} ms")
+    
+    if any(result != results[0] for result in results):
+        print("[!] Backends ended up with different videos")
+        return 1
+    print("[+] Same videos on every backend and path")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
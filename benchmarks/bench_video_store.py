@@ -0,0 +1,121 @@
+"""
+Video storage: the indented JSON file vs the SQLite store and the JSONL log.
+
+Every page render used to parse all of data/videos.json (once per statistics
+table and once per platform expander), and every scan rewrote it. This builds
+a synthetic history from the stored videos, then times the first save, a
+save after a scan (1% of the videos new, 1% changed), single-video upserts,
+a full load, a per-platform query and the platform counts on every backend,
+and checks that they all give back exactly the videos they were given.
+
+Loads and queries are timed with the process load cache dropped, as after a
+write by another process; otherwise the JSON file answers queries from the
+cached list. SQLite is the default backend for the paths a scan and a fresh
+render take: it must beat the JSON file on upserts, the platform query and
+the counts. The JSON file stays faster to load and save whole.
+
+Usage (from the repository root):
+    
+    python -m benchmarks.bench_video_store [--videos 20000] [videos.json]
+"""
+import argparse
+import itertools
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from utils.video_store import JSON_FILE, JsonlVideoStore, JsonVideoStore, SqliteVideoStore, _load_json_videos
+
+
+def history(count, path):
+    """count videos cycling through the stored ones, with fresh ids"""
+    stored = _load_json_videos(path) if os.path.exists(path) else []
+    stored = stored or [{"title": "Plataforma XTrade", "description": "", "platforms": ["Xtrade"],
+                         "links": ["https://xtrade.example"], "messaging_groups": []}]
+    return [dict(video, id=f"v{i}") for i, video in zip(range(count), itertools.cycle(stored))]
+
+
+def after_scan(videos, share=0.01):
+    """The list a scan saves: a share of the videos changed and as many new ones at the end"""
+    step = max(1, int(1 / share))
+    changed = [dict(video, view_count=f"{i}") if i % step == 0 else video for i, video in enumerate(videos)]
+    new = [dict(video, id=f"new{i}") for i, video in enumerate(videos[::step])]
+    return changed + new
+
+
+def timed(func, runs=3):
+    """Best wall time of func() and its last result"""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def uncached(store, func):
+    """func with the process load cache dropped first, as after a write by another process"""
+    def run():
+        store._invalidate()
+        return func()
+    return run
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--videos", type=int, default=20000)
+    parser.add_argument("--upserts", type=int, default=20)
+    parser.add_argument("corpus", nargs="?", default=JSON_FILE)
+    args = parser.parse_args(argv)
+    
+    videos = history(args.videos, args.corpus)
+    scanned = after_scan(videos)
+    upserts = [dict(video, id=f"upsert{i}") for i, video in zip(range(args.upserts), videos)]
+    platform = (Counter(p for v in videos for p in v.get('platforms', [])).most_common(1) or [("", 0)])[0][0]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        stores = (
+            ("json", JsonVideoStore(os.path.join(directory, "videos.json"))),
+            ("sqlite", SqliteVideoStore(os.path.join(directory, "videos.sqlite"), import_from=None)),
+            ("jsonl", JsonlVideoStore(os.path.join(directory, "videos.jsonl"), import_from=None)),
+        )
+        
+        print(f"{len(videos)} videos, platform query for {platform!r}, times without the load cache")
+        print(f"{'backend':<10}{'save':>12}{'rescan':>12}{'upsert':>12}{'load':>12}{'platform':>12}{'counts':>12}")
+        counts, loaded = {}, {}
+        timings = {'upsert': [], 'platform': [], 'counts': []}
+        for name, store in stores:
+            save_time, _ = timed(lambda: store.save_videos(videos), runs=1)
+            rescan_time, _ = timed(lambda: store.save_videos(scanned), runs=1)
+            start = time.perf_counter()
+            for video in upserts:
+                store.upsert_video(video)
+            upsert_time = (time.perf_counter() - start) / len(upserts)
+            load_time, loaded[name] = timed(uncached(store, store.load_videos))
+            query_time, _ = timed(uncached(store, lambda: store.get_videos_by_platform(platform)))
+            counts_time, counts[name] = timed(uncached(store, store.get_platform_counts))
+            if name in ("json", "sqlite"):
+                for column, elapsed in zip(timings, (upsert_time, query_time, counts_time)):
+                    timings[column].append(elapsed)
+            print(f"{name:<10}{save_time * 1000:>9.1f} ms{rescan_time * 1000:>9.1f} ms{upsert_time * 1000:>9.1f} ms"
+                  f"{load_time * 1000:>9.1f} ms{query_time * 1000:>9.1f} ms{counts_time * 1000:>9.1f} ms")
+        
+        if any(videos != scanned + upserts for videos in loaded.values()):
+            print("[!] A store returned different videos than it was given")
+            return 1
+        if len({tuple(c) for c in counts.values()}) != 1:
+            print("[!] The stores counted platforms differently")
+            return 1
+        slower = [column for column, (json_time, sqlite_time) in timings.items() if sqlite_time >= json_time]
+        if slower:
+            print(f"[!] SQLite, the default backend, is no faster than the JSON file at: {', '.join(slower)}")
+            return 1
+    print("[+] Same videos and platform counts from every backend; "
+          "SQLite beats the JSON file on upserts, platform queries and counts")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,71 @@
+"""
+Compare watch page parsing: embedded-JSON parser vs trafilatura + BeautifulSoup.
+
+Usage (from the repository root):
+    
+    python -m benchmarks.bench_watch_parser [saved_watch_page.html ...]
+
+Without arguments a synthetic ~1.5 MB watch page is used.
+"""
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks._pages import load_pages, make_watch_page
+from scrapers.youtube_parser import parse_watch_page
+
+
+def legacy_parse(html):
+    """The previous get_video_details parsing path."""
+    import trafilatura
+    from bs4 import BeautifulSoup
+    
+    text_content = trafilatura.extract(html, include_comments=True, include_tables=False)
+    soup = BeautifulSoup(html, 'html.parser')
+    title_element = soup.select_one('meta[property="og:title"]')
+    description_element = soup.select_one('meta[property="og:description"]')
+    description = description_element['content'] if description_element else ""
+    if len(description) < 100 and text_content:
+        description = text_content
+    return title_element['content'] if title_element else None, description
+
+
+def measure(func, pages, repeat):
+    timings = []
+    for _ in range(repeat):
+        for page in pages:
+            start = time.perf_counter()
+            func(page)
+            timings.append(time.perf_counter() - start)
+    
+    tracemalloc.start()
+    for page in pages:
+        func(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return statistics.median(timings), peak
+
+
+def main(argv):
+    pages = load_pages(argv) if argv else [make_watch_page()]
+    size = sum(len(p) for p in pages) / len(pages)
+    print(f"{len(pages)} page(s), average size {size / 1024:.0f} KiB")
+    print(f"{'parser':<26}{'median/page':>14}{'peak memory':>14}")
+    
+    candidates = [("ytInitialPlayerResponse", parse_watch_page, 20)]
+    try:
+        import trafilatura  # noqa: F401
+        import bs4  # noqa: F401
+        candidates.append(("trafilatura + bs4", legacy_parse, 3))
+    except ImportError:
+        print("(trafilatura/beautifulsoup4 not installed, skipping the legacy parser)")
+    
+    for name, func, repeat in candidates:
+        median, peak = measure(func, pages, repeat)
+        print(f"{name:<26}{median * 1000:>11.2f} ms{peak / 1024 / 1024:>11.2f} MiB")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
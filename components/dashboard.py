@@ -3,7 +3,7 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from utils.data_storage import get_video_stats, get_top_platforms, get_top_domains
+from utils.repository import get_repository
 
 def render_dashboard():
     """Render the main dashboard with statistics and visualizations."""
@@ -23,7 +23,8 @@ def render_dashboard():
         st.image("https://images.unsplash.com/photo-1551288049-bebda4e38f71", use_column_width=True)
     
     # Get statistics
-    stats = get_video_stats()
+    repository = get_repository()
+    stats = repository.get_video_stats()
     
     # Display key metrics in Matrix-style cards
     st.markdown("""
@@ -77,7 +78,7 @@ def render_dashboard():
     
     with col1:
         # Top platforms bar chart
-        top_platforms = get_top_platforms()
+        top_platforms = repository.get_platform_counts()[:10]
         if top_platforms:
             df_platforms = pd.DataFrame(top_platforms, columns=['Platform', 'Count'])
             
@@ -106,7 +107,7 @@ def render_dashboard():
     
     with col2:
         # Top domains bar chart
-        top_domains = get_top_domains()
+        top_domains = repository.get_domain_counts()[:10]
         if top_domains:
             df_domains = pd.DataFrame(top_domains, columns=['Domain', 'Count'])
             
@@ -141,7 +142,7 @@ def render_dashboard():
     """, unsafe_allow_html=True)
     
     # Get videos and sort by scan date
-    videos = st.session_state.videos
+    videos = repository.load_videos()
     if videos:
         # Create a dataframe with recent videos (last 10)
         recent_videos = sorted(
@@ -155,10 +156,10 @@ def render_dashboard():
                 {
                     'Date': v.get('scan_date', ''),
                     'Title': v.get('title', '')[:40] + '...',
-                    'Platform': v.get('platform', ''),
+                    'Channel': v.get('channel_name', ''),
                     'Platforms': len(v.get('platforms', [])),
                     'Links': len(v.get('links', [])),
-                    'Groups': len(v.get('groups', {}).get('whatsapp', [])) + len(v.get('groups', {}).get('telegram', []))
+                    'Groups': len(v.get('messaging_groups', []))
                 }
                 for v in recent_videos
             ])
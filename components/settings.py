@@ -149,6 +149,6 @@ def render_settings():
             
             if confirmation == "RESET":
                 st.session_state.videos = []
-                from utils.data_storage import save_videos
-                save_videos([])
+                from utils.repository import get_repository
+                get_repository().clear()
                 st.success("Database has been reset successfully!")
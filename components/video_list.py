@@ -1,6 +1,9 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+
+from utils.repository import get_repository
 
 def render_video_list():
     """Render the video list page with filtering and detailed information."""
@@ -10,8 +13,8 @@ def render_video_list():
     </div>
     """, unsafe_allow_html=True)
     
-    # Get videos from session state
-    videos = st.session_state.videos
+    # Get videos from the repository
+    videos = get_repository().load_videos()
     
     if not videos:
         st.info("No videos found in the database. Run a scan to collect data.")
@@ -55,11 +58,11 @@ def render_video_list():
     if date_filter != "All Time":
         now = datetime.now()
         if date_filter == "Last 24 Hours":
-            cutoff = (now - datetime.timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S')
+            cutoff = (now - timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S')
         elif date_filter == "Last 7 Days":
-            cutoff = (now - datetime.timedelta(days=7)).strftime('%Y-%m-%d %H:%M:%S')
+            cutoff = (now - timedelta(days=7)).strftime('%Y-%m-%d %H:%M:%S')
         elif date_filter == "Last 30 Days":
-            cutoff = (now - datetime.timedelta(days=30)).strftime('%Y-%m-%d %H:%M:%S')
+            cutoff = (now - timedelta(days=30)).strftime('%Y-%m-%d %H:%M:%S')
         
         filtered_videos = [v for v in filtered_videos if 'scan_date' in v and v['scan_date'] >= cutoff]
     
@@ -75,10 +78,7 @@ def render_video_list():
         filtered_videos = [v for v in filtered_videos if 'links' in v and len(v['links']) > 0]
     
     if has_groups:
-        filtered_videos = [v for v in filtered_videos if 
-                          ('groups' in v and 
-                          (('whatsapp' in v['groups'] and len(v['groups']['whatsapp']) > 0) or
-                           ('telegram' in v['groups'] and len(v['groups']['telegram']) > 0)))]
+        filtered_videos = [v for v in filtered_videos if len(v.get('messaging_groups', [])) > 0]
     
     # Display filter summary
     st.markdown(f"""
@@ -103,11 +103,11 @@ def render_video_list():
                 st.markdown(f"""
                 <div class="video-info">
                     <h3 class="video-title">{video.get('title', 'Untitled')}</h3>
-                    <p><span class="label">Channel:</span> {video.get('channel', 'Unknown')}</p>
+                    <p><span class="label">Channel:</span> {video.get('channel_name', 'Unknown')}</p>
                     <p><span class="label">Published:</span> {video.get('publish_date', 'Unknown date')}</p>
-                    <p><span class="label">Views:</span> {video.get('view_count', 0):,}</p>
-                    <p><span class="label">Likes:</span> {video.get('like_count', 0):,}</p>
-                    <p><span class="label">Video URL:</span> <a href="{video.get('url', '#')}" target="_blank">{video.get('url', 'N/A')}</a></p>
+                    <p><span class="label">Views:</span> {video.get('view_count', 0)}</p>
+                    <p><span class="label">Likes:</span> {video.get('likes', 0)}</p>
+                    <p><span class="label">Video URL:</span> <a href="https://www.youtube.com/watch?v={video['id']}" target="_blank">https://www.youtube.com/watch?v={video['id']}</a></p>
                 </div>
                 """, unsafe_allow_html=True)
                 
@@ -149,7 +149,7 @@ def render_video_list():
                 if links:
                     for link in links:
                         st.markdown(f"""
-                        <li><a href="{link.get('url', '#')}" target="_blank">{link.get('domain', 'Unknown domain')}</a></li>
+                        <li><a href="{link}" target="_blank">{urlparse(link).netloc or 'Unknown domain'}</a></li>
                         """, unsafe_allow_html=True)
                 else:
                     st.markdown("<li>None found</li>", unsafe_allow_html=True)
@@ -157,29 +157,20 @@ def render_video_list():
                 st.markdown("</ul>", unsafe_allow_html=True)
                 
                 # Display groups
-                groups = video.get('groups', {})
-                whatsapp_groups = groups.get('whatsapp', [])
-                telegram_groups = groups.get('telegram', [])
+                groups = video.get('messaging_groups', [])
                 
                 st.markdown(f"""
                 <div class="video-metadata">
-                    <h4 class="metadata-title">Messaging Groups ({len(whatsapp_groups) + len(telegram_groups)})</h4>
+                    <h4 class="metadata-title">Messaging Groups ({len(groups)})</h4>
                     <ul class="metadata-list">
                 """, unsafe_allow_html=True)
                 
-                if whatsapp_groups:
-                    for group in whatsapp_groups:
-                        st.markdown(f"""
-                        <li>WhatsApp: <a href="{group.get('url', '#')}" target="_blank">Join Group</a></li>
-                        """, unsafe_allow_html=True)
-                
-                if telegram_groups:
-                    for group in telegram_groups:
-                        st.markdown(f"""
-                        <li>Telegram: <a href="{group.get('url', '#')}" target="_blank">@{group.get('username', 'Unknown')}</a></li>
-                        """, unsafe_allow_html=True)
+                for group in groups:
+                    st.markdown(f"""
+                    <li>{group.get('platform', 'Unknown')}: <a href="{group.get('link', '#')}" target="_blank">{group.get('name', 'Join Group')}</a></li>
+                    """, unsafe_allow_html=True)
                 
-                if not whatsapp_groups and not telegram_groups:
+                if not groups:
                     st.markdown("<li>None found</li>", unsafe_allow_html=True)
                 
                 st.markdown("</ul>", unsafe_allow_html=True)
@@ -0,0 +1,239 @@
+import re
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, compress
+from typing import Dict, Iterable, List
+
+# Capitalized words scored around platform keywords, searched inside a window
+# or checked one word at a time
+WINDOW_WORD_PATTERN = re.compile(r'\b[A-Z][a-zA-Z0-9]{2,15}\b')
+CAPITALIZED_WORD_PATTERN = re.compile(r'[A-Z][a-zA-Z0-9]{2,15}')
+
+# Word runs starting with an uppercase letter
+UPPER_RUN_PATTERN = re.compile(r'(\b[A-Z]\w*)')
+
+# Word characters from a window start, and a window edge that cuts a word
+WORD_RUN_PATTERN = re.compile(r'\w+')
+WORD_PAIR_PATTERN = re.compile(r'\w\w')
+
+# Below this many names drop_variations compares each name with the kept
+# ones directly; building the substring index only pays off for long lists
+DIRECT_COMPARE_LIMIT = 500
+
+
+def _trie_pattern(node: Dict[str, dict]) -> str:
+    """Build a regex for a keyword trie that always matches the longest keyword"""
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    
+    pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        # A keyword ends here; trying the longer ones first keeps the match greedy
+        pattern = '(?:' + pattern + ')?'
+    return pattern
+
+
+class KeywordMatcher:
+    """
+    Find every occurrence of a set of literal keywords in one pass
+    
+    The keywords are compiled into one trie-shaped regex that reports the
+    longest keyword starting at a position; the regex engine skips ahead to
+    the next possible first character on its own. Every keyword starting at
+    the same position is a prefix of that match, so the shorter ones come
+    from a precomputed prefix table instead of another scan. The search
+    resumes one character later, so overlapping keywords are found too.
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Initialize the matcher
+        
+        Args:
+            keywords: Literal keywords to look for
+        """
+        self.keywords = list(dict.fromkeys(k for k in keywords if k))
+        
+        trie = {}
+        for keyword in self.keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        
+        self.pattern = re.compile(_trie_pattern(trie)) if self.keywords else None
+        
+        # Keywords that are a prefix of each keyword, itself included
+        self.prefixes = {
+            keyword: [other for other in self.keywords if keyword.startswith(other)]
+            for keyword in self.keywords
+        }
+    
+    def find_all(self, text: str) -> Dict[str, List[int]]:
+        """
+        Find the start offsets of every keyword
+        
+        Occurrences of the same keyword don't overlap, exactly like running
+        re.finditer(re.escape(keyword), text) for each keyword separately.
+        
+        Args:
+            text: Text to search
+        
+        Returns:
+            Dictionary mapping each keyword found to its start offsets
+        """
+        positions = {}
+        if self.pattern is None:
+            return positions
+        
+        next_allowed = {}
+        search = self.pattern.search
+        match = search(text)
+        while match:
+            pos = match.start()
+            for keyword in self.prefixes[match.group()]:
+                if pos >= next_allowed.get(keyword, 0):
+                    positions.setdefault(keyword, []).append(pos)
+                    next_allowed[keyword] = pos + len(keyword)
+            match = search(text, pos + 1)
+        
+        return positions
+
+
+class WordIndex:
+    """
+    Capitalized words of a text with their offsets, for fast window lookups
+    
+    The first windows are searched directly. Once they add up to more text
+    than the whole input, the text is indexed in one scan and every further
+    window becomes a slice found by bisecting the word offsets. A word cut
+    by a window edge is re-checked on its clipped text, because a word
+    boundary regex applied to the window slice treats the cut as a boundary.
+    """
+    
+    def __init__(self, text: str):
+        """
+        Initialize the index
+        
+        Args:
+            text: Text to index
+        """
+        self.text = text
+        self.scanned = 0
+        self.words = None
+    
+    def _build(self):
+        """Index every word starting with an uppercase letter, and the capitalized ones"""
+        # Offsets come from the split lengths, so no Python-level loop runs per word
+        parts = UPPER_RUN_PATTERN.split(self.text)
+        offsets = list(accumulate(map(len, parts), initial=0))
+        upper_words = parts[1::2]
+        self.upper_starts = offsets[1::2]
+        
+        capitalized = list(map(CAPITALIZED_WORD_PATTERN.fullmatch, upper_words))
+        self.starts = list(compress(self.upper_starts, capitalized))
+        self.ends = list(compress(offsets[2::2], capitalized))
+        self.words = list(compress(upper_words, capitalized))
+    
+    def capitalized_words(self, start: int, end: int) -> List[str]:
+        """
+        Get the capitalized words found in text[start:end], in order
+        
+        Matches re.findall(r'\\b[A-Z][a-zA-Z0-9]{2,15}\\b', text[start:end]).
+        
+        Args:
+            start: Window start offset
+            end: Window end offset
+        
+        Returns:
+            List of capitalized words
+        """
+        if start >= end:
+            return []
+        
+        text = self.text
+        if self.words is None:
+            self.scanned += end - start
+            if self.scanned <= len(text):
+                return WINDOW_WORD_PATTERN.findall(text[start:end])
+            self._build()
+        
+        words = self.words[bisect_left(self.starts, start):bisect_right(self.ends, end)]
+        
+        # A word cut by the window start counts from the cut, so it can only
+        # be capitalized if the cut lands on an uppercase letter
+        head_end = start
+        if 'A' <= text[start] <= 'Z' and start > 0 and WORD_PAIR_PATTERN.match(text, start - 1):
+            head_end = WORD_RUN_PATTERN.match(text, start, end).end()
+            word = text[start:head_end]
+            if CAPITALIZED_WORD_PATTERN.fullmatch(word):
+                words.insert(0, word)
+        
+        # A word cut by the window end must start with an uppercase letter
+        # at most 16 characters earlier
+        i = bisect_left(self.upper_starts, end) - 1
+        if i >= 0:
+            word_start = self.upper_starts[i]
+            if word_start >= max(head_end, end - 16) and WORD_PAIR_PATTERN.match(text, end - 1):
+                word = text[word_start:end]
+                if CAPITALIZED_WORD_PATTERN.fullmatch(word):
+                    words.append(word)
+        
+        return words
+
+
+def drop_variations(names: List[str]) -> List[str]:
+    """
+    Keep names in order, dropping variations of a name already kept
+    
+    A name is a variation if, ignoring case, it contains or is contained in
+    a kept name. Each name is lowercased once. Every substring of a kept
+    name whose length matches some name's length goes into a set, so
+    "contained in a kept name" is one lookup. "Contains a kept name" slides
+    a window of each kept length over the name. Both checks cost
+    O(len(name) * distinct lengths) instead of a scan over every kept name.
+    Short lists, like those of a single text, are compared directly.
+    
+    Args:
+        names: Names in order of preference
+    
+    Returns:
+        The names that were kept
+    """
+    keys = [name.lower() for name in names]
+    if len(names) < DIRECT_COMPARE_LIMIT:
+        kept = []
+        kept_keys = []
+        for name, key in zip(names, keys):
+            if not any(key in kept_key or kept_key in key for kept_key in kept_keys):
+                kept.append(name)
+                kept_keys.append(key)
+        return kept
+    
+    lengths = sorted({len(key) for key in keys})
+    
+    kept = []
+    kept_keys = set()
+    kept_lengths = []
+    kept_substrings = set()
+    
+    for name, key in zip(names, keys):
+        size = len(key)
+        if key in kept_substrings:
+            continue
+        if any(key[i:i + length] in kept_keys
+               for length in kept_lengths if length < size
+               for i in range(size - length + 1)):
+            continue
+        
+        kept.append(name)
+        kept_keys.add(key)
+        if size not in kept_lengths:
+            kept_lengths.append(size)
+        
+        for length in lengths:
+            if length > size:
+                break
+            kept_substrings.update(key[i:i + length] for i in range(size - length + 1))
+    
+    return kept
@@ -1,15 +1,80 @@
-import re
 import json
-from typing import List, Dict, Any, Tuple
+import logging
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from urllib.parse import urlparse
 
+from scrapers.keyword_matcher import KeywordMatcher, WordIndex, drop_variations
+from utils.extraction_cache import ExtractionCache
+from utils.normalized_text import NormalizedText, fold, normalized_view
+from utils.patterns import (
+    NAME_PATTERNS, PLATFORM_PHRASE_PATTERN, TELEGRAM_NAME_PATTERN, WHATSAPP_NAME_PATTERN, scan_links
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a change to the extraction rules changes what extract()
+# returns, so results cached by older versions are discarded
+EXTRACTOR_VERSION = "2"
+
+# Articles and prepositions never scored as platform names next to a keyword
+WINDOW_STOPWORDS = frozenset(['o', 'os', 'a', 'as', 'de', 'da', 'do', 'das', 'dos'])
+
+
+@dataclass
+class ExtractionResult:
+    """
+    Everything TextProcessor.extract finds in a text
+    
+    Holds the fields of every schema used in the project, so each caller
+    reads its own shape from the same single extraction.
+    """
+    # TextProcessor schema: platform names, filtered URLs and named groups
+    platforms: List[str] = field(default_factory=list)
+    links: List[str] = field(default_factory=list)
+    groups: List[Dict[str, Any]] = field(default_factory=list)
+    
+    # Every URL and messaging link, unfiltered
+    urls: List[str] = field(default_factory=list)
+    whatsapp_links: List[str] = field(default_factory=list)
+    telegram_links: List[str] = field(default_factory=list)
+    
+    # utils.text_extraction schema: {'domain', 'url'}, {'invite_code', 'url'} and {'username', 'url'}
+    websites: List[Dict[str, str]] = field(default_factory=list)
+    whatsapp_groups: List[Dict[str, str]] = field(default_factory=list)
+    telegram_groups: List[Dict[str, str]] = field(default_factory=list)
+    
+    @property
+    def domains(self) -> List[str]:
+        """Distinct website domains, in order of appearance"""
+        return list(dict.fromkeys(website['domain'] for website in self.websites))
+    
+    def as_tuple(self) -> Tuple[List[str], List[str], List[Dict[str, Any]]]:
+        """(platforms, links, groups), as returned by TextProcessor.process_video"""
+        return self.platforms, self.links, self.groups
+    
+    def legacy_groups(self) -> Dict[str, List[Dict[str, str]]]:
+        """Messaging groups in the utils.text_extraction schema"""
+        return {'whatsapp': self.whatsapp_groups, 'telegram': self.telegram_groups}
+
+
 class TextProcessor:
     """
     Process text from YouTube videos to extract investment platforms, links, and messaging groups
     """
     
-    def __init__(self):
-        """Initialize the text processor with common investment platform keywords"""
+    def __init__(self, cache: Optional[ExtractionCache] = None):
+        """
+        Initialize the text processor with common investment platform keywords
+        
+        Args:
+            cache: Extraction cache consulted by process_video and process_videos
+                (results are not cached when omitted)
+        """
         # Common platform name keywords in Portuguese
         self.platform_keywords = [
             'plataforma', 'investimento', 'trading', 'broker', 'forex', 'opções binárias',
@@ -19,15 +84,25 @@ class TextProcessor:
             'saque', 'bônus', 'multinível', 'pirâmide'
         ]
         
-        # Common platform name prefixes/suffixes
-        self.name_patterns = [
-            r'\b[A-Z][a-z]*(?:Bet|Trade|Invest|Forex|Crypto|Pay|Cash|Earn|Money|FX|BTC)\b',
-            r'\b(?:Bet|Trade|Invest|Forex|Crypto|Pay|Cash|Earn|Money|FX|BTC)[A-Z][a-z]*\b',
-            r'\b[A-Z][a-z]*(?:Trader|Broker|Market|Exchange|Capital|Partners|Group|Bank)\b',
-            r'\b[A-Z][a-zA-Z0-9]*(?:\.io|\.com|\.net|\.app)\b'
-        ]
+        # Common platform name prefixes/suffixes (precompiled in utils.patterns)
+        self.name_patterns = list(NAME_PATTERNS)
+        
+        self._keyword_matcher = None
+        self._matcher_keywords = None
+        self.cache = cache
         
-        print("[+] Text processor initialized")
+        # Totals for everything processed by process_video / process_videos,
+        # reported once by the caller instead of one log line per video
+        self.counters = Counter()
+        
+        logger.debug("Text processor initialized")
+    
+    def _get_keyword_matcher(self) -> KeywordMatcher:
+        """Return the matcher for the folded keywords, rebuilding it if platform_keywords changed"""
+        if self._keyword_matcher is None or self._matcher_keywords != self.platform_keywords:
+            self._matcher_keywords = list(self.platform_keywords)
+            self._keyword_matcher = KeywordMatcher(fold(keyword) for keyword in self.platform_keywords)
+        return self._keyword_matcher
     
     def extract_platforms(self, text: str) -> List[str]:
         """
@@ -39,17 +114,23 @@ class TextProcessor:
         Returns:
             List of detected platform names
         """
+        platforms = self._find_platforms(text)
+        logger.debug("Extracted %d potential platform names", len(platforms))
+        return platforms
+    
+    def _find_platforms(self, text: str, view: Optional[NormalizedText] = None) -> List[str]:
+        """Score platform name candidates in text and return the distinct ones, best first"""
         if not text:
             return []
         
-        # Lowercase for case-insensitive searching
-        text_lower = text.lower()
+        # Keywords are searched in the folded text, so case and accents don't matter
+        view = view or normalized_view(text)
         
         # Dictionary to store platform candidates with their scores
         platform_candidates = {}
         
         # Look for phrases like "a plataforma XYZ" or "plataforma de investimento XYZ"
-        platform_phrases = re.findall(r'(?:a\s+)?plataforma\s+(?:de\s+investimento\s+)?([A-Za-z0-9]+[A-Za-z0-9\s]*)', text, re.IGNORECASE)
+        platform_phrases = PLATFORM_PHRASE_PATTERN.findall(text)
         for phrase in platform_phrases:
             name = phrase.strip()
             if name and len(name) > 2:
@@ -58,53 +139,89 @@ class TextProcessor:
         
         # Look for words that match the name patterns (like FxTrade, CryptoBTC, etc.)
         for pattern in self.name_patterns:
-            matches = re.findall(pattern, text)
+            matches = pattern.findall(text)
             for match in matches:
                 if match and len(match) > 2:
                     platform_candidates[match] = platform_candidates.get(match, 0) + 3
         
-        # Look for capitalized words near keywords
-        for keyword in self.platform_keywords:
-            if keyword in text_lower:
-                # Find the position of the keyword
-                positions = [m.start() for m in re.finditer(re.escape(keyword), text_lower)]
+        # Look for capitalized words near keywords. All keyword occurrences
+        # come from one scan and each window is an offset lookup.
+        matcher = self._get_keyword_matcher()
+        keyword_positions = matcher.find_all(view.text)
+        word_index = WordIndex(text)
+        
+        # The matcher's keywords are the folded platform_keywords, in order
+        for keyword in matcher.keywords:
+            length = len(keyword)
+            for pos in keyword_positions.get(keyword, ()):
+                # Get a window of the original text around the keyword
+                keyword_start, keyword_end = view.span(pos, pos + length)
+                start = max(0, keyword_start - 50)
+                end = min(len(text), keyword_end + 50)
                 
-                for pos in positions:
-                    # Get a window of text around the keyword
-                    start = max(0, pos - 50)
-                    end = min(len(text), pos + 50 + len(keyword))
-                    window = text[start:end]
-                    
-                    # Look for capitalized words in this window
-                    cap_words = re.findall(r'\b[A-Z][a-zA-Z0-9]{2,15}\b', window)
-                    for word in cap_words:
-                        if word and word.lower() not in ['o', 'os', 'a', 'as', 'de', 'da', 'do', 'das', 'dos']:
-                            platform_candidates[word] = platform_candidates.get(word, 0) + 2
+                # Look for capitalized words in this window
+                for word in word_index.capitalized_words(start, end):
+                    if word.lower() not in WINDOW_STOPWORDS:
+                        platform_candidates[word] = platform_candidates.get(word, 0) + 2
         
         # Sort candidates by score and filter out low-scoring ones
         sorted_candidates = sorted(platform_candidates.items(), key=lambda x: x[1], reverse=True)
         platforms = [name for name, score in sorted_candidates if score >= 2]
         
-        # Remove duplicates while preserving order
-        unique_platforms = []
-        for platform in platforms:
-            # Skip very short names or common words
-            if len(platform) <= 2 or platform.lower() in ['sim', 'não', 'pix', 'app', 'site', 'link']:
-                continue
-                
-            # Check if it's a variation of an already added platform
-            duplicate = False
-            for existing in unique_platforms:
-                if platform.lower() in existing.lower() or existing.lower() in platform.lower():
-                    duplicate = True
-                    break
-            
-            if not duplicate:
-                unique_platforms.append(platform)
+        # Skip very short names or common words
+        platforms = [
+            platform for platform in platforms
+            if len(platform) > 2 and platform.lower() not in ['sim', 'não', 'pix', 'app', 'site', 'link']
+        ]
+        
+        # Remove variations of an already added platform while preserving order
+        unique_platforms = drop_variations(platforms)
         
-        print(f"[+] Extracted {len(unique_platforms)} potential platform names")
         return unique_platforms
     
+    def extract(self, text: str, include_platforms: bool = True, include_groups: bool = True) -> ExtractionResult:
+        """
+        Extract platforms, links, domains and messaging groups together
+        
+        The links of every kind come out of one utils.patterns.scan_links
+        pass, shared by all the schemas in the result. Links are matched in
+        the original text, since URLs are case-sensitive; platform keywords
+        are matched in its normalized view, built once here, and group names
+        in that view or, without platforms, in the folded text around each link.
+        
+        Args:
+            text: The text to analyze
+            include_platforms: Also score platform names, the costliest part
+            include_groups: Also name the messaging groups (result.groups);
+                the links themselves are always extracted
+        
+        Returns:
+            ExtractionResult with everything found
+        """
+        result = ExtractionResult()
+        if not text:
+            return result
+        
+        found_links = scan_links(text)
+        view = None
+        
+        if include_platforms:
+            view = normalized_view(text)
+            result.platforms = self._find_platforms(text, view)
+        
+        result.urls = [match.group('url') for match in found_links['url']]
+        result.links = self._filter_links(result.urls)
+        result.whatsapp_links = [match.group('whatsapp') for match in found_links['whatsapp']]
+        result.telegram_links = [match.group('telegram') for match in found_links['telegram']]
+        if include_groups:
+            result.groups = self._name_groups(text, result.whatsapp_links, result.telegram_links, view)
+        
+        result.websites = website_entries(found_links)
+        result.whatsapp_groups = whatsapp_group_entries(found_links)
+        result.telegram_groups = telegram_group_entries(found_links)
+        
+        return result
+    
     def extract_links(self, text: str) -> List[str]:
         """
         Extract web links from text
@@ -118,11 +235,14 @@ class TextProcessor:
         if not text:
             return []
         
-        # URL pattern matching
-        url_pattern = r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+[/\w\.-]*(?:\?[/\w\.-=&]*)?'
-        urls = re.findall(url_pattern, text)
+        urls = [match.group('url') for match in scan_links(text, ('url',))['url']]
+        filtered_urls = self._filter_links(urls)
         
-        # Filter out YouTube and common URLs
+        logger.debug("Extracted %d URLs", len(filtered_urls))
+        return filtered_urls
+    
+    def _filter_links(self, urls: List[str]) -> List[str]:
+        """Filter out YouTube and common URLs"""
         filtered_urls = []
         for url in urls:
             domain = urlparse(url).netloc
@@ -133,7 +253,6 @@ class TextProcessor:
                 "instagram.com" not in domain):
                 filtered_urls.append(url)
         
-        print(f"[+] Extracted {len(filtered_urls)} URLs")
         return filtered_urls
     
     def extract_messaging_groups(self, text: str) -> List[Dict[str, Any]]:
@@ -149,25 +268,27 @@ class TextProcessor:
         if not text:
             return []
         
-        groups = []
+        found_links = scan_links(text, ('whatsapp', 'telegram'))
+        whatsapp_links = [match.group('whatsapp') for match in found_links['whatsapp']]
+        telegram_links = [match.group('telegram') for match in found_links['telegram']]
+        groups = self._name_groups(text, whatsapp_links, telegram_links)
         
-        # Extract WhatsApp groups
-        whatsapp_pattern = r'https?://(?:chat\.)?whatsapp\.com/(?:invite/)?(?:[-\w]*)'
-        whatsapp_links = re.findall(whatsapp_pattern, text)
+        logger.debug("Extracted %d messaging groups/channels", len(groups))
+        return groups
+    
+    def _name_groups(self, text: str, whatsapp_links: List[str], telegram_links: List[str],
+                     view: Optional[NormalizedText] = None) -> List[Dict[str, Any]]:
+        """Build group entries for messaging links, named after nearby text when possible"""
+        groups = []
         
+        # WhatsApp groups
         for i, link in enumerate(whatsapp_links):
             # Try to find a name near the link
             link_pos = text.find(link)
             if link_pos >= 0:
-                start = max(0, link_pos - 100)
-                end = min(len(text), link_pos + len(link) + 100)
-                window = text[start:end]
-                
                 # Look for potential group names
-                name_match = re.search(r'grupo\s+(?:do|de|da)?\s+([A-Za-z0-9\s]{3,30})', window, re.IGNORECASE)
-                name = f"WhatsApp Group {i+1}"
-                if name_match:
-                    name = name_match.group(1).strip()
+                name = self._find_group_name(WHATSAPP_NAME_PATTERN, text, link_pos, len(link), view)
+                name = name or f"WhatsApp Group {i+1}"
                 
                 groups.append({
                     "platform": "WhatsApp",
@@ -175,23 +296,14 @@ class TextProcessor:
                     "link": link
                 })
         
-        # Extract Telegram groups/channels
-        telegram_pattern = r'https?://(?:t\.me|telegram\.me|telegram\.dog)/(?:joinchat/)?(?:[-\w]*)'
-        telegram_links = re.findall(telegram_pattern, text)
-        
+        # Telegram groups/channels
         for i, link in enumerate(telegram_links):
             # Try to find a name near the link
             link_pos = text.find(link)
             if link_pos >= 0:
-                start = max(0, link_pos - 100)
-                end = min(len(text), link_pos + len(link) + 100)
-                window = text[start:end]
-                
                 # Look for potential group/channel names
-                name_match = re.search(r'(?:canal|grupo|channel)\s+(?:do|de|da)?\s+([A-Za-z0-9\s]{3,30})', window, re.IGNORECASE)
-                name = f"Telegram Channel {i+1}"
-                if name_match:
-                    name = name_match.group(1).strip()
+                name = self._find_group_name(TELEGRAM_NAME_PATTERN, text, link_pos, len(link), view)
+                name = name or f"Telegram Channel {i+1}"
                 
                 groups.append({
                     "platform": "Telegram",
@@ -199,9 +311,29 @@ class TextProcessor:
                     "link": link
                 })
         
-        print(f"[+] Extracted {len(groups)} messaging groups/channels")
         return groups
     
+    @staticmethod
+    def _find_group_name(pattern, text: str, link_pos: int, link_length: int,
+                         view: Optional[NormalizedText] = None) -> Optional[str]:
+        """Search the 100 characters around a link for a group name"""
+        start = max(0, link_pos - 100)
+        end = min(len(text), link_pos + link_length + 100)
+        
+        # Names are searched in the folded text and read back from the original,
+        # so accented names ("grupo do João") are found and keep their accents.
+        # Without a view of the whole text, only the window is folded.
+        if view is None:
+            view = NormalizedText(text[start:end])
+            start, end = 0, len(view.text)
+        else:
+            start, end = view.view_offset(start), view.view_offset(end)
+        
+        name_match = pattern.search(view.text, start, end)
+        if name_match:
+            return view.original_text(*name_match.span(1)).strip()
+        return None
+    
     def process_video(self, video: Dict[str, Any]) -> Tuple[List[str], List[str], List[Dict[str, Any]]]:
         """
         Process a video to extract platforms, links, and messaging groups
@@ -212,14 +344,167 @@ class TextProcessor:
         Returns:
             Tuple of (platforms, links, groups)
         """
-        # Combine title and description
-        title = video.get('title', '')
-        description = video.get('description', '')
-        combined_text = f"{title}\n\n{description}"
+        key, result = self._lookup(video)
+        cached = result is not None
+        if not cached:
+            result = self.extract(video_text(video))
+            if key is not None:
+                self.cache.store(key, asdict(result))
         
-        # Extract data
-        platforms = self.extract_platforms(combined_text)
-        links = self.extract_links(combined_text)
-        groups = self.extract_messaging_groups(combined_text)
+        self._count(result, cached)
+        logger.debug("Extracted %d potential platform names, %d URLs and %d messaging groups/channels",
+                     len(result.platforms), len(result.links), len(result.groups))
         
-        return platforms, links, groups
\ No newline at end of file
+        return result.as_tuple()
+    
+    def _count(self, result: ExtractionResult, cached: bool):
+        """Add a processed video to the counters"""
+        self.counters['videos'] += 1
+        self.counters['cached'] += cached
+        self.counters['platforms'] += len(result.platforms)
+        self.counters['links'] += len(result.links)
+        self.counters['groups'] += len(result.groups)
+    
+    def _lookup(self, video: Dict[str, Any]) -> Tuple[Optional[str], Optional[ExtractionResult]]:
+        """Return a video's cache key and cached result (None when not cached)"""
+        if self.cache is None:
+            return None, None
+        
+        key = self.cache.key(video.get('title', ''), video.get('description', ''))
+        cached = self.cache.get(key)
+        return key, ExtractionResult(**cached) if cached is not None else None
+    
+    def process_videos(self, videos: Iterable[Dict[str, Any]], workers: Optional[int] = None,
+                       chunksize: int = 32) -> Iterator[Tuple[List[str], List[str], List[Dict[str, Any]]]]:
+        """
+        Process many videos, spreading the extraction over a process pool
+        
+        Each worker builds its own TextProcessor with this one's keywords and
+        patterns once, when it starts, and reuses it for every chunk. Videos
+        are pulled from the iterable a chunk at a time and at most two chunks
+        per worker are in flight, so large datasets stream through without
+        being loaded at once. Results are yielded in input order. Videos
+        found in the extraction cache are answered here and never sent to a
+        worker.
+        
+        Args:
+            videos: Iterable of video dictionaries containing title and description
+            workers: Number of worker processes (defaults to the CPU count);
+                1 processes the videos in this process
+            chunksize: Number of videos sent to a worker at a time
+        
+        Returns:
+            Iterator of (platforms, links, groups) tuples, one per video
+        """
+        workers = max(1, int(workers or os.cpu_count() or 1))
+        chunksize = max(1, int(chunksize))
+        videos = iter(videos)
+        executor = None
+        if workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.platform_keywords, self.name_patterns)
+            )
+        pending = deque()
+        
+        def submit_next():
+            chunk = [self._lookup(video) + (video,) for video in islice(videos, chunksize)]
+            if not chunk:
+                return
+            
+            texts = [video_text(video) for _, result, video in chunk if result is None]
+            if not texts:
+                extracted = None
+            elif executor:
+                extracted = executor.submit(_process_chunk, texts)
+            else:
+                extracted = [self.extract(text) for text in texts]
+            pending.append((chunk, extracted))
+        
+        try:
+            for _ in range(2 * workers):
+                submit_next()
+            
+            while pending:
+                chunk, extracted = pending.popleft()
+                if executor and extracted is not None:
+                    extracted = extracted.result()
+                extracted = iter(extracted or ())
+                # Keep the workers busy before handing results back
+                submit_next()
+                
+                results = []
+                new_entries = []
+                for key, result, _ in chunk:
+                    cached = result is not None
+                    if not cached:
+                        result = next(extracted)
+                        if key is not None:
+                            new_entries.append((key, asdict(result)))
+                    self._count(result, cached)
+                    results.append(result.as_tuple())
+                
+                if new_entries:
+                    self.cache.store_many(new_entries)
+                yield from results
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+
+def website_entries(found_links: Dict[str, List[Any]]) -> List[Dict[str, str]]:
+    """{'domain', 'url'} entries for the websites found by utils.patterns.scan_links"""
+    return [
+        {'domain': match.group('website_domain'), 'url': match.group('website')}
+        for match in found_links['website']
+    ]
+
+
+def whatsapp_group_entries(found_links: Dict[str, List[Any]]) -> List[Dict[str, str]]:
+    """{'invite_code', 'url'} entries for the WhatsApp groups found by utils.patterns.scan_links"""
+    return [
+        {'invite_code': match.group('whatsapp_invite'), 'url': match.group('whatsapp_group')}
+        for match in found_links['whatsapp_group']
+    ]
+
+
+def telegram_group_entries(found_links: Dict[str, List[Any]]) -> List[Dict[str, str]]:
+    """{'username', 'url'} entries for the Telegram groups found by utils.patterns.scan_links"""
+    return [
+        {'username': match.group('telegram_username'), 'url': match.group('telegram_group')}
+        for match in found_links['telegram_group']
+    ]
+
+
+def video_text(video: Dict[str, Any]) -> str:
+    """Combine a video's title and description into the text that gets processed"""
+    return f"{video.get('title', '')}\n\n{video.get('description', '')}"
+
+
+_worker_processor = None
+
+
+def _init_worker(platform_keywords: List[str], name_patterns: List[Any]):
+    """Build and warm up the TextProcessor of a process_videos worker"""
+    global _worker_processor
+    _worker_processor = TextProcessor()
+    _worker_processor.platform_keywords = list(platform_keywords)
+    _worker_processor.name_patterns = list(name_patterns)
+    _worker_processor.extract("Warm up a plataforma de investimento XTrade https://t.me/warmup")
+
+
+def _process_chunk(texts: List[str]) -> List[ExtractionResult]:
+    """Process a chunk of texts in a process_videos worker"""
+    return [_worker_processor.extract(text) for text in texts]
+
+
+_shared_processor = None
+
+
+def get_text_processor() -> TextProcessor:
+    """Return a process-wide TextProcessor for callers that don't keep their own"""
+    global _shared_processor
+    if _shared_processor is None:
+        _shared_processor = TextProcessor()
+    return _shared_processor
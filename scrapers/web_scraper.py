@@ -1,17 +1,44 @@
+import logging
 import trafilatura
 import requests
 from typing import Dict, Optional, Tuple
 
+from utils.http_cache import ResponseCache
+from utils.http_session import configure_session
+
+logger = logging.getLogger(__name__)
+
 class WebScraper:
     """
     Simple web scraper for extracting content from websites
     """
     
-    def __init__(self):
-        """Initialize the web scraper"""
+    def __init__(self, cache: Optional[ResponseCache] = None, use_cache: bool = True):
+        """
+        Initialize the web scraper
+        
+        Args:
+            cache: Response cache to use (defaults to the shared on-disk cache)
+            use_cache: Set to False to always hit the network
+        """
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.cache = configure_session(self.session, cache, use_cache)
+    
+    def _fetch(self, url: str) -> Optional[str]:
+        """Download a page through the cached session, returning None on failure"""
+        response = self.session.get(url, timeout=30)
+        if response.status_code != 200:
+            logger.warning("Failed to fetch %s. Status code: %s", url, response.status_code)
+            return None
+        
+        # Pages without a declared charset would otherwise be decoded as Latin-1
+        if 'charset' not in response.headers.get('Content-Type', '').lower():
+            response.encoding = response.apparent_encoding
+        return response.text
     
     def get_website_text_content(self, url: str) -> Tuple[Optional[str], Optional[str]]:
         """
@@ -25,7 +52,7 @@ class WebScraper:
         """
         try:
             # Send a request to the website
-            downloaded = trafilatura.fetch_url(url)
+            downloaded = self._fetch(url)
             
             if not downloaded:
                 return None, None
@@ -39,7 +66,7 @@ class WebScraper:
             
             return title, text
         except Exception as e:
-            print(f"[!] Error extracting content from {url}: {str(e)}")
+            logger.warning("Error extracting content from %s: %s", url, e)
             return None, None
     
     def get_website_metadata(self, url: str) -> Dict:
@@ -54,7 +81,7 @@ class WebScraper:
         """
         try:
             # Send a request to the website
-            downloaded = trafilatura.fetch_url(url)
+            downloaded = self._fetch(url)
             
             if not downloaded:
                 return {}
@@ -76,5 +103,5 @@ class WebScraper:
                 "sitename": metadata.sitename
             }
         except Exception as e:
-            print(f"[!] Error extracting metadata from {url}: {str(e)}")
+            logger.warning("Error extracting metadata from %s: %s", url, e)
             return {}
\ No newline at end of file
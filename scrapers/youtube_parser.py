@@ -0,0 +1,237 @@
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+# Assignments YouTube uses to embed its initial JSON payloads in the page
+INITIAL_DATA_MARKERS = (
+    'var ytInitialData = ',
+    'window["ytInitialData"] = ',
+    'ytInitialData = '
+)
+
+PLAYER_RESPONSE_MARKERS = (
+    'var ytInitialPlayerResponse = ',
+    'window["ytInitialPlayerResponse"] = ',
+    'ytInitialPlayerResponse = '
+)
+
+# Keys holding the like count in the different watch page layouts
+LIKE_COUNT_KEYS = ('likeCount', 'likeCountIfIndifferentNumber')
+
+_decoder = json.JSONDecoder()
+
+
+def find_json_blob(html: str, markers: Iterable[str]) -> Optional[Any]:
+    """
+    Decode the JSON value assigned right after one of the given markers
+    
+    The marker is located with str.find and the value is decoded in place
+    with JSONDecoder.raw_decode, so the page is never copied or scanned by
+    a backtracking regex.
+    
+    Args:
+        html: Page source
+        markers: Assignment prefixes to look for, in order of preference
+    
+    Returns:
+        The decoded JSON value, or None if no marker is followed by valid JSON
+    """
+    for marker in markers:
+        pos = html.find(marker)
+        while pos != -1:
+            start = pos + len(marker)
+            while start < len(html) and html[start] in ' \t\r\n':
+                start += 1
+            
+            try:
+                value, _ = _decoder.raw_decode(html, start)
+                return value
+            except json.JSONDecodeError:
+                pos = html.find(marker, start)
+    
+    return None
+
+
+def find_first_key(data: Any, keys: Tuple[str, ...]) -> Optional[Any]:
+    """
+    Return the first value stored under any of the given keys
+    
+    Walks the decoded JSON depth-first with an explicit stack, so deeply
+    nested payloads can't hit the recursion limit.
+    
+    Args:
+        data: Decoded JSON value
+        keys: Key names to look for
+    
+    Returns:
+        The first matching value, or None
+    """
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key in keys:
+                if key in node:
+                    return node[key]
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    
+    return None
+
+
+def parse_watch_page(html: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract video details from the JSON blobs embedded in a watch page
+    
+    Args:
+        html: Watch page source
+    
+    Returns:
+        Dictionary with title, description, likes, channel and publish
+        information, or None if the page has no ytInitialPlayerResponse
+    """
+    player_response = find_json_blob(html, PLAYER_RESPONSE_MARKERS)
+    if not isinstance(player_response, dict):
+        return None
+    
+    video_details = player_response.get('videoDetails', {})
+    microformat = player_response.get('microformat', {}).get('playerMicroformatRenderer', {})
+    
+    title = video_details.get('title') or microformat.get('title', {}).get('simpleText') or "Unknown Title"
+    description = video_details.get('shortDescription')
+    if description is None:
+        description = microformat.get('description', {}).get('simpleText', '')
+    
+    # The like count only lives in the initial data
+    likes = "Unknown Likes"
+    initial_data = find_json_blob(html, INITIAL_DATA_MARKERS)
+    if initial_data is not None:
+        like_count = find_first_key(initial_data, LIKE_COUNT_KEYS)
+        if like_count is not None:
+            likes = str(like_count)
+    
+    return {
+        "title": title,
+        "description": description,
+        "likes": likes,
+        "channel_id": video_details.get('channelId') or microformat.get('externalChannelId', ''),
+        "channel_name": video_details.get('author') or microformat.get('ownerChannelName', ''),
+        "publish_date": microformat.get('publishDate') or microformat.get('uploadDate', ''),
+        "view_count": video_details.get('viewCount', ''),
+        "initial_data": initial_data
+    }
+
+
+def _text(value: Any) -> str:
+    """Flatten YouTube's text objects ({'simpleText'}, {'runs'}, {'content'}) into a string"""
+    if isinstance(value, str):
+        return value
+    if not isinstance(value, dict):
+        return ''
+    if 'simpleText' in value:
+        return value['simpleText']
+    if 'runs' in value:
+        return ''.join(run.get('text', '') for run in value['runs'])
+    return value.get('content', '')
+
+
+def _comment_from_node(node: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """Build a comment from one of the known comment shapes, if node is one"""
+    if 'commentRenderer' in node:
+        renderer = node['commentRenderer']
+        author = _text(renderer.get('authorText'))
+        text = _text(renderer.get('contentText'))
+    elif 'commentEntityPayload' in node:
+        payload = node['commentEntityPayload']
+        author = payload.get('author', {}).get('displayName', '')
+        text = _text(payload.get('properties', {}).get('content'))
+    elif 'authorDisplayName' in node and 'contentText' in node:
+        author = _text(node['authorDisplayName'])
+        text = _text(node['contentText'])
+    else:
+        return None
+    
+    if not author or not text:
+        return None
+    return {"author": author, "text": text.replace('\n', ' ')}
+
+
+def iter_comments(data: Any, limit: Optional[int] = None) -> Iterator[Dict[str, str]]:
+    """
+    Yield comments found anywhere in decoded watch page or continuation JSON
+    
+    Understands the commentRenderer, commentEntityPayload and older
+    authorDisplayName/contentText shapes. The walk visits every node once,
+    in document order, so runtime is linear in the payload size.
+    
+    Args:
+        data: Decoded JSON value
+        limit: Stop after this many comments
+    
+    Returns:
+        Iterator of dictionaries with author and text
+    """
+    if limit is not None and limit <= 0:
+        return
+    
+    count = 0
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            comment = _comment_from_node(node)
+            if comment:
+                yield comment
+                count += 1
+                if limit is not None and count >= limit:
+                    return
+                continue
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+def continuation_token(items: Iterable[Any]) -> Optional[str]:
+    """Return the continuation token among a list of top-level result items"""
+    for item in items:
+        if isinstance(item, dict) and 'continuationItemRenderer' in item:
+            renderer = item['continuationItemRenderer']
+            endpoint = renderer.get('continuationEndpoint') or renderer.get('button', {}).get('buttonRenderer', {}).get('command', {})
+            token = endpoint.get('continuationCommand', {}).get('token')
+            if token:
+                return token
+    return None
+
+
+def find_comment_continuation(initial_data: Any) -> Optional[str]:
+    """
+    Find the token that loads the first page of comments for a watch page
+    
+    Args:
+        initial_data: Decoded ytInitialData of a watch page
+    
+    Returns:
+        Continuation token, or None if the page has no comment section
+    """
+    stack = [initial_data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            section = node.get('itemSectionRenderer')
+            if isinstance(section, dict) and section.get('sectionIdentifier') == 'comment-item-section':
+                return continuation_token(section.get('contents', []))
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    
+    return None
+
+
+def continuation_items(response: Dict[str, Any]) -> list:
+    """Collect the result items from an internal API continuation response"""
+    items = []
+    for key in ('onResponseReceivedEndpoints', 'onResponseReceivedCommands', 'onResponseReceivedActions'):
+        for command in response.get(key, []):
+            for action in ('reloadContinuationItemsCommand', 'appendContinuationItemsAction'):
+                items.extend(command.get(action, {}).get('continuationItems', []))
+    return items
@@ -1,23 +1,105 @@
-import time
-import json
+import logging
 import re
-import os
 import datetime
-import random
 import requests
-from typing import List, Dict, Any, Optional
+from xml.etree import ElementTree
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
 from bs4 import BeautifulSoup
 import trafilatura
 from urllib.parse import quote, urlparse
 
+from scrapers.youtube_parser import (
+    find_json_blob, parse_watch_page, iter_comments, find_comment_continuation,
+    continuation_token, continuation_items, INITIAL_DATA_MARKERS
+)
+from utils.http_cache import ResponseCache
+from utils.http_session import configure_session
+from utils.patterns import scan_links
+
+logger = logging.getLogger(__name__)
+
+# XML namespaces used by channel Atom feeds
+FEED_NAMESPACES = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'yt': 'http://www.youtube.com/xml/schemas/2015',
+    'media': 'http://search.yahoo.com/mrss/'
+}
+
+# Title attributes and watch links, matched in one pass by the HTML fallback
+HTML_VIDEO_TOKEN_PATTERN = re.compile(r'title="([^"]*)"|watch\?v=([A-Za-z0-9_-]{11})')
+
+# Relative publish times as shown by YouTube ("há 3 dias", "2 weeks ago", "hace 1 mes")
+RELATIVE_TIME_PATTERN = re.compile(
+    r'(\d+)\s*(segundo|second|minuto|minute|hora|hour|dia|día|day|semana|week|mês|mes|month|ano|año|year)',
+    re.IGNORECASE
+)
+
+RELATIVE_TIME_UNITS = {
+    'segundo': datetime.timedelta(seconds=1),
+    'second': datetime.timedelta(seconds=1),
+    'minuto': datetime.timedelta(minutes=1),
+    'minute': datetime.timedelta(minutes=1),
+    'hora': datetime.timedelta(hours=1),
+    'hour': datetime.timedelta(hours=1),
+    'dia': datetime.timedelta(days=1),
+    'día': datetime.timedelta(days=1),
+    'day': datetime.timedelta(days=1),
+    'semana': datetime.timedelta(weeks=1),
+    'week': datetime.timedelta(weeks=1),
+    'mês': datetime.timedelta(days=30),
+    'mes': datetime.timedelta(days=30),
+    'month': datetime.timedelta(days=30),
+    'ano': datetime.timedelta(days=365),
+    'año': datetime.timedelta(days=365),
+    'year': datetime.timedelta(days=365)
+}
+
+
+def parse_relative_time(text: str, now: Optional[datetime.datetime] = None) -> Optional[datetime.datetime]:
+    """
+    Convert a relative publish time into an absolute timestamp
+    
+    The most recent moment the text can refer to is returned, e.g. "2 weeks
+    ago" becomes exactly 14 days before now, so date cutoffs never drop a
+    video that might still be inside the window.
+    
+    Args:
+        text: Relative time text such as "há 3 dias" or "Streamed 2 weeks ago"
+        now: Reference time (defaults to the current time)
+        
+    Returns:
+        Datetime of publication, or None if the text isn't a relative time
+    """
+    if not text:
+        return None
+    
+    match = RELATIVE_TIME_PATTERN.search(text)
+    if not match:
+        return None
+    
+    amount = int(match.group(1))
+    unit = RELATIVE_TIME_UNITS[match.group(2).lower()]
+    return (now or datetime.datetime.now()) - amount * unit
+
 
 class YouTubeScraper:
     """
     Scraper for YouTube videos with investment-related keywords
     """
     
-    def __init__(self):
-        """Initialize the YouTube scraper"""
+    # Web client version sent to the internal API when a page doesn't expose one
+    DEFAULT_CLIENT_VERSION = "2.20250327.01.00"
+    
+    def __init__(self, cache: Optional[ResponseCache] = None, use_cache: bool = True):
+        """
+        Initialize the YouTube scraper
+        
+        Args:
+            cache: Response cache to use (defaults to the shared on-disk cache)
+            use_cache: Set to False to always hit the network
+        """
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -27,7 +109,16 @@ class YouTubeScraper:
             'sec-ch-ua-mobile': '?0',
             'sec-ch-ua-platform': '"Windows"'
         })
-        print("[+] YouTube scraper initialized")
+        # Pre-accept the cookie consent so requests aren't redirected to consent.youtube.com
+        self.session.cookies.set('SOCS', 'CAI', domain='.youtube.com')
+        self.cache = configure_session(self.session, cache, use_cache)
+        
+        # Keywords whose search failed (e.g. still throttled after all retries)
+        self.failed_searches = []
+        
+        # Totals for this scraper's lifetime, reported once per scan
+        self.counters = Counter()
+        logger.debug("YouTube scraper initialized")
     
     def search_videos(self, keyword: str, days_back: int = 7, max_videos: int = 10) -> List[Dict[str, Any]]:
         """
@@ -41,7 +132,37 @@ class YouTubeScraper:
         Returns:
             List of dictionaries containing video information
         """
-        print(f"[*] Searching YouTube for '{keyword}', looking back {days_back} days")
+        videos = list(self.iter_search_videos(keyword, days_back, max_videos))
+        if videos:
+            logger.info("Found %d videos on YouTube", len(videos))
+        return videos
+    
+    def iter_search_videos(self, keyword: str, days_back: int = 7, max_videos: int = 10) -> Iterator[Dict[str, Any]]:
+        """
+        Search for YouTube videos, yielding results as each page arrives
+        
+        The first page comes from the regular results page; further pages are
+        requested through the internal search endpoint using the continuation
+        token at the end of each page, until max_videos have been yielded or
+        YouTube stops returning tokens.
+        
+        Results are sorted by upload date, so the search stops at the first
+        video published more than days_back days ago; neither it nor anything
+        after it is yielded.
+        
+        Args:
+            keyword: The search keyword
+            days_back: How many days to look back
+            max_videos: Maximum number of videos to retrieve
+            
+        Returns:
+            Iterator of dictionaries containing video information
+        """
+        logger.info("Searching YouTube for '%s', looking back %s days", keyword, days_back)
+        self.counters['searches'] += 1
+        
+        if max_videos <= 0:
+            return
         
         # Properly encode the keyword for URL
         encoded_keyword = quote(keyword)
@@ -52,157 +173,383 @@ class YouTubeScraper:
         try:
             # Make the request
             response = self.session.get(search_url, timeout=10)
+        except Exception as e:
+            logger.warning("Error searching YouTube: %s", e)
+            self.failed_searches.append(keyword)
+            return
+        
+        if response.status_code != 200:
+            logger.warning("Failed to get search results for '%s'. Status code: %s", keyword, response.status_code)
+            self.failed_searches.append(keyword)
+            return
+        
+        # YouTube uses JavaScript to load content, so we need to extract the JSON data
+        # that's embedded in the initial page
+        data = find_json_blob(response.text, INITIAL_DATA_MARKERS)
+        
+        if data is None:
+            # Try alternative method using regex over the raw HTML
+            videos = self._extract_videos_from_html(response.text, max_videos)
+            if not videos:
+                logger.warning("Could not extract video data from YouTube's initial data")
+            yield from videos
+            return
+        
+        # Walk the JSON data
+        try:
+            # Navigate through the complex JSON structure to find video results
+            contents = data.get('contents', {}).get('twoColumnSearchResultsRenderer', {}).get('primaryContents', {})
+            section_list = contents.get('sectionListRenderer', {}).get('contents', [])
+            videos, token = self._parse_search_sections(section_list)
+        except (KeyError, AttributeError) as e:
+            logger.warning("Error parsing YouTube data: %s", e)
+            # Try backup method
+            yield from self._extract_videos_from_html(response.text, max_videos)
+            return
+        
+        if not videos:
+            # Fallback to alternative method
+            yield from self._extract_videos_from_html(response.text, max_videos)
+            return
+        
+        api_key, client_version = self._extract_innertube_config(response.text)
+        seen_ids = set()
+        page = 1
+        
+        now = datetime.datetime.now()
+        cutoff = now - datetime.timedelta(days=days_back) if days_back else None
+        
+        while True:
+            for video in videos:
+                if video['id'] in seen_ids:
+                    continue
+                
+                published_at = parse_relative_time(video['publish_date'], now)
+                if published_at:
+                    video['published_at'] = published_at.strftime("%Y-%m-%d %H:%M:%S")
+                    if cutoff and published_at < cutoff:
+                        logger.debug("Reached videos older than %s days, stopping search for '%s'", days_back, keyword)
+                        return
+                
+                seen_ids.add(video['id'])
+                yield video
+                
+                if len(seen_ids) >= max_videos:
+                    return
             
-            if response.status_code != 200:
-                print(f"[!] Failed to get search results. Status code: {response.status_code}")
-                return []
+            if not token:
+                return
             
-            # Parse the response
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Request the next page of results
+            page += 1
+            logger.debug("Fetching search results page %d for '%s'", page, keyword)
+            self.counters['search_pages'] += 1
+            data = self._innertube_post('search', {'continuation': token}, api_key, client_version)
+            if not data:
+                return
             
-            # YouTube uses JavaScript to load content, so we need to extract the JSON data
-            # that's embedded in the initial page
-            pattern = r'var ytInitialData = (.+?);</script>'
-            matches = re.search(pattern, response.text)
+            videos, token = [], None
+            for command in data.get('onResponseReceivedCommands', []):
+                items = command.get('appendContinuationItemsAction', {}).get('continuationItems', [])
+                page_videos, page_token = self._parse_search_sections(items)
+                videos.extend(page_videos)
+                token = page_token or token
             
-            videos = []
+            if not videos:
+                return
+    
+    def _parse_search_sections(self, sections: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Collect the videos and the continuation token from a list of search result sections
+        
+        Args:
+            sections: Section list from ytInitialData or a continuation response
             
-            if not matches:
-                # Try alternative method using trafilatura and regex
-                videos = self._extract_videos_from_html(response.text, max_videos)
-                if videos:
-                    return videos
-                
-                print("[!] Could not extract video data from YouTube's initial data")
+        Returns:
+            Tuple of (videos, continuation token or None)
+        """
+        videos = []
+        token = None
+        
+        for section in sections:
+            if 'itemSectionRenderer' in section:
+                items = section.get('itemSectionRenderer', {}).get('contents', [])
+                for item in items:
+                    if 'videoRenderer' in item:
+                        videos.append(self._parse_video_renderer(item.get('videoRenderer', {})))
+            elif 'continuationItemRenderer' in section:
+                endpoint = section['continuationItemRenderer'].get('continuationEndpoint', {})
+                token = endpoint.get('continuationCommand', {}).get('token') or token
+        
+        return videos, token
+    
+    def _parse_video_renderer(self, video_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a videoRenderer entry into our basic video dictionary"""
+        video_id = video_data.get('videoId', '')
+        
+        # Extract the title
+        title = "Unknown Title"
+        title_runs = video_data.get('title', {}).get('runs', [])
+        if title_runs:
+            title = ''.join([run.get('text', '') for run in title_runs])
+        
+        # Extract channel name and ID
+        channel_name = "Unknown Channel"
+        channel_id = ""
+        owner_text = video_data.get('ownerText', {}).get('runs', [])
+        if owner_text:
+            channel_name = owner_text[0].get('text', 'Unknown Channel')
+            for run in owner_text:
+                browse_id = run.get('navigationEndpoint', {}).get('browseEndpoint', {}).get('browseId', '')
+                if browse_id:
+                    channel_id = browse_id
+                    break
+        
+        # Extract publish time
+        publish_date = "Unknown Date"
+        publish_time = video_data.get('publishedTimeText', {}).get('simpleText', '')
+        if publish_time:
+            publish_date = publish_time
+        
+        # Extract view count
+        view_count = "Unknown Views"
+        view_count_text = video_data.get('viewCountText', {}).get('simpleText', '')
+        if view_count_text:
+            view_count = view_count_text
+        
+        # Extract thumbnail
+        thumbnail = ""
+        thumbnails = video_data.get('thumbnail', {}).get('thumbnails', [])
+        if thumbnails:
+            thumbnail = thumbnails[-1].get('url', '')
+        
+        return {
+            "id": video_id,
+            "title": title,
+            "channel_name": channel_name,
+            "channel_id": channel_id,
+            "publish_date": publish_date,
+            "view_count": view_count,
+            "thumbnail": thumbnail
+        }
+    
+    def _extract_innertube_config(self, html_content: str) -> Tuple[Optional[str], str]:
+        """Read the internal API key and web client version embedded in a page"""
+        api_key = None
+        key_match = re.search(r'"INNERTUBE_API_KEY":"([^"]+)"', html_content)
+        if key_match:
+            api_key = key_match.group(1)
+        
+        client_version = self.DEFAULT_CLIENT_VERSION
+        version_match = re.search(r'"INNERTUBE_CLIENT_VERSION":"([^"]+)"', html_content)
+        if version_match:
+            client_version = version_match.group(1)
+        
+        return api_key, client_version
+    
+    def _innertube_post(self, endpoint: str, payload: Dict[str, Any], api_key: Optional[str] = None,
+                        client_version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Call one of YouTube's internal youtubei/v1 endpoints
+        
+        Args:
+            endpoint: Endpoint name (e.g. 'search', 'browse', 'next')
+            payload: Request body; the client context is added automatically
+            api_key: Optional INNERTUBE_API_KEY read from a page
+            client_version: Web client version read from a page
+            
+        Returns:
+            Decoded JSON response, or None on failure
+        """
+        url = f"https://www.youtube.com/youtubei/v1/{endpoint}"
+        if api_key:
+            url += f"?key={api_key}"
+        
+        body = {
+            'context': {
+                'client': {
+                    'clientName': 'WEB',
+                    'clientVersion': client_version or self.DEFAULT_CLIENT_VERSION,
+                    'hl': 'pt',
+                    'gl': 'BR'
+                }
+            },
+            **payload
+        }
+        
+        try:
+            response = self.session.post(url, json=body, timeout=10)
+            
+            if response.status_code != 200:
+                logger.warning("Internal API request to '%s' failed. Status code: %s", endpoint, response.status_code)
+                return None
+            
+            return response.json()
+        except (ValueError, requests.RequestException) as e:
+            logger.warning("Error calling internal API '%s': %s", endpoint, e)
+            return None
+    
+    def get_channel_feed(self, channel_id: str) -> List[Dict[str, Any]]:
+        """
+        Get a channel's latest uploads from its Atom feed
+        
+        The feed is a few KB instead of a multi-megabyte search page, and the
+        response cache turns repeated polls into conditional requests.
+        
+        Args:
+            channel_id: YouTube channel ID (UC...)
+        
+        Returns:
+            List of dictionaries containing video information
+        """
+        feed_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={quote(channel_id)}"
+        
+        try:
+            response = self.session.get(feed_url, timeout=10)
+            
+            if response.status_code != 200:
+                logger.warning("Failed to get feed for channel %s. Status code: %s", channel_id, response.status_code)
                 return []
             
-            # Parse the JSON data
-            try:
-                data = json.loads(matches.group(1))
-                
-                # Navigate through the complex JSON structure to find video results
-                contents = data.get('contents', {}).get('twoColumnSearchResultsRenderer', {}).get('primaryContents', {})
-                section_list = contents.get('sectionListRenderer', {}).get('contents', [])
-                
-                for section in section_list:
-                    if 'itemSectionRenderer' in section:
-                        items = section.get('itemSectionRenderer', {}).get('contents', [])
-                        for item in items:
-                            if 'videoRenderer' in item:
-                                video_data = item.get('videoRenderer', {})
-                                video_id = video_data.get('videoId', '')
-                                
-                                # Extract the title
-                                title = "Unknown Title"
-                                title_runs = video_data.get('title', {}).get('runs', [])
-                                if title_runs:
-                                    title = ''.join([run.get('text', '') for run in title_runs])
-                                
-                                # Extract channel name
-                                channel_name = "Unknown Channel"
-                                owner_text = video_data.get('ownerText', {}).get('runs', [])
-                                if owner_text:
-                                    channel_name = owner_text[0].get('text', 'Unknown Channel')
-                                
-                                # Extract publish time
-                                publish_date = "Unknown Date"
-                                publish_time = video_data.get('publishedTimeText', {}).get('simpleText', '')
-                                if publish_time:
-                                    publish_date = publish_time
-                                
-                                # Extract view count
-                                view_count = "Unknown Views"
-                                view_count_text = video_data.get('viewCountText', {}).get('simpleText', '')
-                                if view_count_text:
-                                    view_count = view_count_text
-                                
-                                # Extract thumbnail
-                                thumbnail = ""
-                                thumbnails = video_data.get('thumbnail', {}).get('thumbnails', [])
-                                if thumbnails:
-                                    thumbnail = thumbnails[-1].get('url', '')
-                                
-                                videos.append({
-                                    "id": video_id,
-                                    "title": title,
-                                    "channel_name": channel_name,
-                                    "publish_date": publish_date,
-                                    "view_count": view_count,
-                                    "thumbnail": thumbnail
-                                })
-                                
-                                if len(videos) >= max_videos:
-                                    break
-                
-                if videos:
-                    print(f"[+] Found {len(videos)} videos on YouTube")
-                    return videos
-                else:
-                    # Fallback to alternative method
-                    return self._extract_videos_from_html(response.text, max_videos)
-            
-            except (json.JSONDecodeError, KeyError) as e:
-                print(f"[!] Error parsing YouTube data: {str(e)}")
-                # Try backup method
-                return self._extract_videos_from_html(response.text, max_videos)
-                
-        except Exception as e:
-            print(f"[!] Error searching YouTube: {str(e)}")
+            root = ElementTree.fromstring(response.content)
+        except (requests.RequestException, ElementTree.ParseError) as e:
+            logger.warning("Error reading feed for channel %s: %s", channel_id, e)
             return []
+        
+        channel_name = root.findtext('atom:title', 'Unknown Channel', FEED_NAMESPACES)
+        videos = []
+        
+        for entry in root.findall('atom:entry', FEED_NAMESPACES):
+            video_id = entry.findtext('yt:videoId', '', FEED_NAMESPACES)
+            if not video_id:
+                continue
+            
+            published = entry.findtext('atom:published', '', FEED_NAMESPACES)
+            thumbnail = entry.find('media:group/media:thumbnail', FEED_NAMESPACES)
+            statistics = entry.find('media:group/media:community/media:statistics', FEED_NAMESPACES)
+            
+            video = {
+                "id": video_id,
+                "title": entry.findtext('atom:title', 'Unknown Title', FEED_NAMESPACES),
+                "channel_name": entry.findtext('atom:author/atom:name', channel_name, FEED_NAMESPACES),
+                "channel_id": entry.findtext('yt:channelId', channel_id, FEED_NAMESPACES),
+                "publish_date": published or "Unknown Date",
+                "view_count": statistics.get('views', "Unknown Views") if statistics is not None else "Unknown Views",
+                "thumbnail": thumbnail.get('url', '') if thumbnail is not None else ""
+            }
+            
+            try:
+                published_at = datetime.datetime.fromisoformat(published).astimezone().replace(tzinfo=None)
+                video['published_at'] = published_at.strftime("%Y-%m-%d %H:%M:%S")
+            except ValueError:
+                pass
+            
+            videos.append(video)
+        
+        return videos
+    
+    def iter_channel_feeds(self, channel_ids: Iterable[str], seen_ids: Optional[set] = None, days_back: int = 7,
+                           max_workers: int = 4) -> Iterator[Dict[str, Any]]:
+        """
+        Poll several channel feeds concurrently, yielding only unseen videos
+        
+        Args:
+            channel_ids: Channel IDs to poll
+            seen_ids: Video IDs that are already known and should be skipped
+            days_back: Skip videos published more than this many days ago
+            max_workers: Maximum number of feeds fetched at the same time
+        
+        Returns:
+            Iterator of dictionaries containing video information
+        """
+        channel_ids = list(dict.fromkeys(c for c in channel_ids if c))
+        if not channel_ids:
+            return
+        
+        logger.info("Polling %d channel feeds", len(channel_ids))
+        self.counters['channel_feeds'] += len(channel_ids)
+        seen_ids = set(seen_ids or ())
+        cutoff = None
+        if days_back:
+            cutoff = (datetime.datetime.now() - datetime.timedelta(days=days_back)).strftime("%Y-%m-%d %H:%M:%S")
+        
+        with ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="yt-feeds") as executor:
+            for videos in executor.map(self.get_channel_feed, channel_ids):
+                for video in videos:
+                    if video['id'] in seen_ids:
+                        continue
+                    if cutoff and video.get('published_at', cutoff) < cutoff:
+                        continue
+                    seen_ids.add(video['id'])
+                    yield video
     
     def _extract_videos_from_html(self, html_content, max_videos=10):
-        """Backup method to extract videos from HTML using regex patterns"""
-        print("[*] Using backup HTML extraction method")
-        video_results = []
-        
-        # Extract video IDs using regex
-        video_id_pattern = r'watch\?v=([A-Za-z0-9_-]{11})'
-        video_ids = re.findall(video_id_pattern, html_content)
-        
-        # Remove duplicates while preserving order
-        unique_ids = []
-        for video_id in video_ids:
-            if video_id not in unique_ids:
-                unique_ids.append(video_id)
-        
-        # Extract title and other info for each video
-        for video_id in unique_ids[:max_videos]:
-            # Try to find title and other details
-            title_pattern = rf'title="(.*?)".*?href="/watch\?v={video_id}'
-            title_match = re.search(title_pattern, html_content)
-            title = title_match.group(1) if title_match else f"Video {video_id}"
-            
-            # Add basic info (we'll get complete details when we fetch each video)
-            video_results.append({
-                "id": video_id,
-                "title": title,
-                "channel_name": "YouTube Channel",
-                "publish_date": "Recent",
-                "view_count": "Multiple views",
-                "thumbnail": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"
-            })
+        """
+        Backup method to extract videos from HTML using regex patterns
+        
+        Title attributes and watch links are matched together in a single
+        left-to-right scan; each video takes the closest title attribute
+        preceding its first href="/watch?v=..." link.
+        """
+        logger.info("Using backup HTML extraction method")
+        
+        # Video IDs in order of first appearance, mapped to their title
+        titles = {}
+        untitled = 0
+        last_title = None
+        
+        for match in HTML_VIDEO_TOKEN_PATTERN.finditer(html_content):
+            title, video_id = match.group(1), match.group(2)
+            
+            if title is not None:
+                last_title = title
+                continue
             
-            if len(video_results) >= max_videos:
-                break
+            if video_id not in titles:
+                if len(titles) >= max_videos:
+                    # Only titles for the videos we already have matter now
+                    if not untitled:
+                        break
+                    continue
+                titles[video_id] = None
+                untitled += 1
+            
+            is_link = match.start() >= 7 and html_content.startswith('href="/', match.start() - 7)
+            if is_link and titles[video_id] is None and last_title is not None:
+                titles[video_id] = last_title
+                untitled -= 1
+        
+        # Add basic info (we'll get complete details when we fetch each video)
+        video_results = [{
+            "id": video_id,
+            "title": title if title is not None else f"Video {video_id}",
+            "channel_name": "YouTube Channel",
+            "publish_date": "Recent",
+            "view_count": "Multiple views",
+            "thumbnail": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"
+        } for video_id, title in titles.items()]
         
         if video_results:
-            print(f"[+] Found {len(video_results)} videos using backup method")
+            logger.info("Found %d videos using backup method", len(video_results))
         else:
-            print("[!] Could not extract any videos from YouTube")
+            logger.warning("Could not extract any videos from YouTube")
             
         return video_results
     
-    def get_video_details(self, video_id: str) -> Dict[str, Any]:
+    def get_video_details(self, video_id: str, max_comments: int = 10, comment_pages: int = 0) -> Dict[str, Any]:
         """
         Get detailed information about a specific video
         
         Args:
             video_id: The YouTube video ID
+            max_comments: Maximum number of comments to collect
+            comment_pages: How many comment continuation pages to request
+                           when the page itself has fewer than max_comments
             
         Returns:
             Dictionary with video details
         """
-        print(f"[*] Fetching details for YouTube video ID: {video_id}")
+        logger.debug("Fetching details for YouTube video ID: %s", video_id)
         
         video_url = f"https://www.youtube.com/watch?v={video_id}"
         
@@ -211,65 +558,161 @@ class YouTubeScraper:
             response = self.session.get(video_url, timeout=10)
             
             if response.status_code != 200:
-                print(f"[!] Failed to get video details. Status code: {response.status_code}")
+                logger.warning("Failed to get details for video %s. Status code: %s", video_id, response.status_code)
                 return {"id": video_id, "error": f"HTTP Error: {response.status_code}"}
             
-            # First, use trafilatura to extract clean text content from the page
-            downloaded = response.text
-            text_content = trafilatura.extract(downloaded, include_comments=True, include_tables=False)
-            
-            # Use BeautifulSoup to parse the HTML for more structured extraction
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Try to extract the title
-            title = "Unknown Title"
-            title_element = soup.select_one('meta[property="og:title"]')
-            if title_element and 'content' in title_element.attrs:
-                title = title_element['content']
-            
-            # Try to extract description
-            description = ""
-            description_element = soup.select_one('meta[property="og:description"]')
-            if description_element and 'content' in description_element.attrs:
-                description = description_element['content']
-            
-            # If description is too short, use trafilatura's extracted content
-            if len(description) < 100 and text_content:
-                description = text_content
-            
-            # Try to extract like count
-            likes = "Unknown Likes"
-            like_pattern = r'"likeCount":"([0-9,]+)"'
-            like_match = re.search(like_pattern, response.text)
-            if like_match:
-                likes = like_match.group(1)
-            
-            # Extract comments (this is challenging without JavaScript)
-            comments = []
-            comment_pattern = r'"authorDisplayName":"(.*?)","authorProfileImageUrl":".*?","authorEndpoint":.*?"contentText":{"simpleText":"(.*?)"}'
-            comment_matches = re.findall(comment_pattern, response.text)
-            
-            for author, text in comment_matches[:10]:  # Limit to 10 comments
-                if author and text:
-                    comments.append({
-                        "author": author,
-                        "text": text.replace('\\n', ' ').replace('\\', '')
-                    })
-            
-            print(f"[+] Successfully extracted details for video: {title}")
+            # Read the details straight from the embedded player response,
+            # falling back to a full HTML parse for pages without it
+            details = parse_watch_page(response.text)
+            if details is not None:
+                initial_data = details.pop('initial_data', None)
+            else:
+                logger.debug("No player response found, using full HTML parse")
+                details = self._parse_watch_page_html(response.text)
+                initial_data = find_json_blob(response.text, INITIAL_DATA_MARKERS)
+            
+            # Extract comments from the decoded page data (and continuation pages if requested)
+            comments = list(self.iter_video_comments(response.text, initial_data, max_comments, comment_pages))
+            
+            logger.debug("Successfully extracted details for video: %s", details['title'])
             
             return {
                 "id": video_id,
-                "title": title,
-                "description": description,
-                "likes": likes,
+                **details,
                 "comments": comments
             }
             
         except Exception as e:
-            print(f"[!] Error getting video details: {str(e)}")
+            logger.warning("Error getting details for video %s: %s", video_id, e)
             return {"id": video_id, "error": str(e)}
+    
+    def iter_video_comments(self, html_content: str, initial_data: Any, max_comments: int = 10,
+                            comment_pages: int = 0) -> Iterator[Dict[str, str]]:
+        """
+        Stream comments for a watch page
+        
+        Comments embedded in the page's initial data come first; after that up
+        to comment_pages continuation pages are requested through the internal
+        'next' endpoint until max_comments have been yielded.
+        
+        Args:
+            html_content: Watch page source (used for the internal API config)
+            initial_data: Decoded ytInitialData of the page, if any
+            max_comments: Maximum number of comments to yield
+            comment_pages: Maximum number of continuation pages to request
+            
+        Returns:
+            Iterator of dictionaries with author and text
+        """
+        if initial_data is None or max_comments <= 0:
+            return
+        
+        remaining = max_comments
+        for comment in iter_comments(initial_data, remaining):
+            yield comment
+            remaining -= 1
+        
+        token = find_comment_continuation(initial_data) if comment_pages > 0 else None
+        if not token:
+            return
+        
+        api_key, client_version = self._extract_innertube_config(html_content)
+        for _ in range(comment_pages):
+            if not token or remaining <= 0:
+                return
+            
+            data = self._innertube_post('next', {'continuation': token}, api_key, client_version)
+            if not data:
+                return
             
+            for comment in iter_comments(data, remaining):
+                yield comment
+                remaining -= 1
+            
+            token = continuation_token(continuation_items(data))
+    
+    def _parse_watch_page_html(self, html_content: str) -> Dict[str, Any]:
+        """Fallback watch page parser using trafilatura and BeautifulSoup"""
+        # First, use trafilatura to extract clean text content from the page
+        text_content = trafilatura.extract(html_content, include_comments=True, include_tables=False)
+        
+        # Use BeautifulSoup to parse the HTML for more structured extraction
+        soup = BeautifulSoup(html_content, 'html.parser')
+        
+        # Try to extract the title
+        title = "Unknown Title"
+        title_element = soup.select_one('meta[property="og:title"]')
+        if title_element and 'content' in title_element.attrs:
+            title = title_element['content']
+        
+        # Try to extract description
+        description = ""
+        description_element = soup.select_one('meta[property="og:description"]')
+        if description_element and 'content' in description_element.attrs:
+            description = description_element['content']
+        
+        # If description is too short, use trafilatura's extracted content
+        if len(description) < 100 and text_content:
+            description = text_content
+        
+        # Try to extract like count
+        likes = "Unknown Likes"
+        like_pattern = r'"likeCount":"([0-9,]+)"'
+        like_match = re.search(like_pattern, html_content)
+        if like_match:
+            likes = like_match.group(1)
+        
+        return {
+            "title": title,
+            "description": description,
+            "likes": likes
+        }
+            
+    def fetch_video_details(self, videos: Iterable[Dict[str, Any]], max_workers: int = 4) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Fetch details for several videos concurrently
+        
+        Videos are pulled from the iterable as slots free up, so at most
+        max_workers requests are in flight at any time. Results are yielded
+        in completion order, letting the caller process each video as soon
+        as its page arrives.
+        
+        Args:
+            videos: Iterable of video dictionaries (must contain 'id')
+            max_workers: Maximum number of concurrent requests
+            
+        Returns:
+            Iterator of (video, details) tuples
+        """
+        max_workers = max(1, int(max_workers))
+        videos = iter(videos)
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="yt-details")
+        pending = {}
+        
+        def submit_next():
+            video = next(videos, None)
+            if video is not None:
+                pending[executor.submit(self.get_video_details, video['id'])] = video
+        
+        try:
+            for _ in range(max_workers):
+                submit_next()
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                finished = []
+                for future in done:
+                    details = future.result()
+                    self.counters['details_failed' if 'error' in details else 'details_fetched'] += 1
+                    finished.append((pending.pop(future), details))
+                    # Keep the pipeline full before handing results back
+                    submit_next()
+                
+                for video, details in finished:
+                    yield video, details
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
     def extract_links(self, text: str) -> List[str]:
         """
         Extract URLs from text content
@@ -280,9 +723,7 @@ class YouTubeScraper:
         Returns:
             List of extracted URLs
         """
-        # URL pattern matching
-        url_pattern = r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+[/\w\.-]*(?:\?[/\w\.-=&]*)?'
-        urls = re.findall(url_pattern, text)
+        urls = [match.group('url') for match in scan_links(text, ('url',))['url']]
         
         # Filter out YouTube URLs
         filtered_urls = []
@@ -303,8 +744,7 @@ class YouTubeScraper:
         Returns:
             List of dictionaries with platform and link
         """
-        whatsapp_pattern = r'https?://(?:chat\.)?whatsapp\.com/(?:invite/)?(?:[-\w]*)'
-        links = re.findall(whatsapp_pattern, text)
+        links = [match.group('whatsapp') for match in scan_links(text, ('whatsapp',))['whatsapp']]
         
         return [{"platform": "WhatsApp", "name": f"WhatsApp Group {i+1}", "link": link} 
                 for i, link in enumerate(links)]
@@ -319,8 +759,7 @@ class YouTubeScraper:
         Returns:
             List of dictionaries with platform and link
         """
-        telegram_pattern = r'https?://(?:t\.me|telegram\.me|telegram\.dog)/(?:joinchat/)?(?:[-\w]*)'
-        links = re.findall(telegram_pattern, text)
+        links = [match.group('telegram') for match in scan_links(text, ('telegram',))['telegram']]
         
         return [{"platform": "Telegram", "name": f"Telegram Channel {i+1}", "link": link} 
                 for i, link in enumerate(links)]
\ No newline at end of file
@@ -18,6 +18,9 @@ class Database:
         """
         self.db_file = db_file
         self.data = self._load_data()
+        
+        # Positions of each video id in self.data['videos'], kept in sync by save_videos
+        self._positions = self._build_index()
     
     def _load_data(self) -> Dict[str, Any]:
         """Load data from the database file"""
@@ -30,6 +33,13 @@ class Database:
         else:
             return {'videos': [], 'last_update': None}
     
+    def _build_index(self) -> Dict[Any, List[int]]:
+        """Map each video id to its positions in the video list (a list, as stored files may repeat ids)"""
+        positions = {}
+        for i, video in enumerate(self.data['videos']):
+            positions.setdefault(video.get('id'), []).append(i)
+        return positions
+    
     def _save_data(self):
         """Save data to the database file"""
         with open(self.db_file, 'w', encoding='utf-8') as f:
@@ -43,30 +53,28 @@ class Database:
         Args:
             videos: List of video dictionaries
         """
-        # Get existing video IDs
-        existing_ids = [v.get('id') for v in self.data['videos']]
+        videos_list = self.data['videos']
+        added_at = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        new_count = 0
         
-        # Add only new videos
-        new_videos = []
         for video in videos:
-            if video.get('id') not in existing_ids:
-                video['added_at'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                new_videos.append(video)
+            positions = self._positions.get(video.get('id'))
+            if positions is None:
+                # Add new video
+                video['added_at'] = added_at
+                self._positions[video.get('id')] = [len(videos_list)]
+                videos_list.append(video)
+                new_count += 1
             else:
-                # Update existing video
-                for i, existing_video in enumerate(self.data['videos']):
-                    if existing_video.get('id') == video.get('id'):
-                        # Update with new data while preserving original added_at
-                        video['added_at'] = existing_video.get('added_at')
-                        self.data['videos'][i] = video
-        
-        # Add new videos to the database
-        self.data['videos'].extend(new_videos)
+                # Update existing video with new data while preserving original added_at
+                for i in positions:
+                    video['added_at'] = videos_list[i].get('added_at')
+                    videos_list[i] = video
         
         # Save the updated database
         self._save_data()
         
-        return len(new_videos)
+        return new_count
     
     def get_videos(self) -> List[Dict[str, Any]]:
         """
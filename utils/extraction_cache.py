@@ -0,0 +1,165 @@
+import os
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Default cache location, next to the video data
+CACHE_FILE = os.path.join("data", "extraction_cache.sqlite")
+
+# Results kept in memory in front of the SQLite table
+MAX_MEMORY_ENTRIES = 4096
+
+
+class ExtractionCache:
+    """
+    Persistent cache of text extraction results keyed by content
+    
+    The key is a SHA-1 of the extractor version, the title and the
+    description, so a video whose text hasn't changed is never processed
+    twice. Recently used results are kept in an in-memory LRU; every result
+    is also stored zlib-compressed in a SQLite file. Rows written by another
+    extractor version are dropped when the cache is opened.
+    """
+    
+    def __init__(self, version: str, db_file: str = CACHE_FILE, max_memory_entries: int = MAX_MEMORY_ENTRIES):
+        """
+        Initialize the cache
+        
+        Args:
+            version: Version of the extractor whose results are cached
+            db_file: Path to the SQLite cache file
+            max_memory_entries: Number of results kept in the in-memory LRU
+        """
+        self.version = str(version)
+        self.db_file = db_file
+        self.max_memory_entries = max(0, int(max_memory_entries))
+        self.counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                result BLOB NOT NULL,
+                stored_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("DELETE FROM results WHERE version != ?", (self.version,))
+        self._conn.commit()
+    
+    def key(self, title: str, description: str) -> str:
+        """Return the cache key of a video's text for this extractor version"""
+        content = json.dumps([self.version, title or '', description or ''], ensure_ascii=False)
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+    
+    def _remember(self, key: str, payload: str):
+        """Put a serialized result at the front of the in-memory LRU"""
+        if not self.max_memory_entries:
+            return
+        self._memory[key] = payload
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result
+        
+        Args:
+            key: Cache key from key()
+        
+        Returns:
+            The stored result dictionary, or None
+        """
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+                self.counters['memory_hits'] += 1
+                return json.loads(payload)
+            
+            row = self._conn.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+            if not row:
+                self.counters['misses'] += 1
+                return None
+            
+            payload = zlib.decompress(row[0]).decode('utf-8')
+            self._remember(key, payload)
+            self.counters['disk_hits'] += 1
+        
+        return json.loads(payload)
+    
+    def store(self, key: str, result: Dict[str, Any]):
+        """
+        Store a result
+        
+        Args:
+            key: Cache key from key()
+            result: JSON-serializable result dictionary
+        """
+        self.store_many([(key, result)])
+    
+    def store_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]):
+        """
+        Store several results in one transaction
+        
+        Args:
+            items: (key, result) pairs
+        """
+        rows = []
+        with self._lock:
+            for key, result in items:
+                payload = json.dumps(result, ensure_ascii=False)
+                self._remember(key, payload)
+                rows.append((key, self.version, zlib.compress(payload.encode('utf-8'), 6), time.time()))
+            
+            if rows:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO results (key, version, result, stored_at) VALUES (?, ?, ?, ?)", rows
+                )
+                self._conn.commit()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+        
+        Returns:
+            Dictionary with memory_hits, disk_hits, misses, hit_rate and entries
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            stats['entries'] = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+    
+    def clear(self):
+        """Remove every cached result"""
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM results")
+            self._conn.commit()
+
+
+_shared_caches = {}
+_shared_caches_lock = threading.Lock()
+
+
+def get_extraction_cache(version: str) -> ExtractionCache:
+    """Return the process-wide extraction cache for an extractor version"""
+    with _shared_caches_lock:
+        if version not in _shared_caches:
+            _shared_caches[version] = ExtractionCache(version)
+        return _shared_caches[version]
@@ -0,0 +1,246 @@
+import os
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Default cache location, next to the video data
+CACHE_FILE = os.path.join("data", "http_cache.sqlite")
+
+# Seconds a cached response is served without contacting the server
+SEARCH_TTL = 30 * 60
+WATCH_TTL = 24 * 60 * 60
+FEED_TTL = 15 * 60
+DEFAULT_TTL = 60 * 60
+
+# Stale entries are kept this long so they can still be revalidated
+MAX_STALE_AGE = 7 * 24 * 60 * 60
+
+# Headers that describe the transfer rather than the stored body
+HOP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+
+class ResponseCache:
+    """
+    Persistent HTTP response cache keyed by URL
+    
+    Bodies are stored zlib-compressed in a SQLite file together with the
+    validators (ETag / Last-Modified) needed for conditional requests.
+    """
+    
+    def __init__(self, db_file: str = CACHE_FILE, search_ttl: int = SEARCH_TTL,
+                 watch_ttl: int = WATCH_TTL, feed_ttl: int = FEED_TTL, default_ttl: int = DEFAULT_TTL):
+        """
+        Initialize the cache
+        
+        Args:
+            db_file: Path to the SQLite cache file
+            search_ttl: Freshness lifetime of YouTube search result pages
+            watch_ttl: Freshness lifetime of YouTube watch pages
+            feed_ttl: Freshness lifetime of YouTube channel feeds
+            default_ttl: Freshness lifetime of every other URL
+        """
+        self.db_file = db_file
+        self.search_ttl = search_ttl
+        self.watch_ttl = watch_ttl
+        self.feed_ttl = feed_ttl
+        self.default_ttl = default_ttl
+        self.counters = {'hits': 0, 'misses': 0, 'revalidated': 0, 'bytes_saved': 0}
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - MAX_STALE_AGE,))
+        self._conn.commit()
+    
+    def ttl_for(self, url: str) -> int:
+        """Return the freshness lifetime for a URL"""
+        parsed = urlparse(url)
+        if parsed.netloc.endswith('youtube.com'):
+            if parsed.path.startswith('/results'):
+                return self.search_ttl
+            if parsed.path.startswith('/watch'):
+                return self.watch_ttl
+            if parsed.path.startswith('/feeds/'):
+                return self.feed_ttl
+        return self.default_ttl
+    
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response
+        
+        Args:
+            url: Request URL
+        
+        Returns:
+            Dictionary with status, headers, body, size and fresh flag, or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, body, size, stored_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        
+        if not row:
+            return None
+        
+        status, headers, body, size, stored_at = row
+        return {
+            'status': status,
+            'headers': CaseInsensitiveDict(json.loads(headers)),
+            'body': zlib.decompress(body),
+            'size': size,
+            'fresh': time.time() - stored_at < self.ttl_for(url)
+        }
+    
+    def store(self, url: str, response: requests.Response):
+        """Store a successful response"""
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in HOP_HEADERS}
+        body = response.content
+        
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (url, status, headers, body, size, stored_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, response.status_code, json.dumps(headers), zlib.compress(body, 6), len(body), time.time())
+            )
+            self._conn.commit()
+    
+    def refresh(self, url: str, response: requests.Response):
+        """Mark a cached entry as fresh again after a 304 Not Modified"""
+        with self._lock:
+            row = self._conn.execute("SELECT headers FROM responses WHERE url = ?", (url,)).fetchone()
+            if not row:
+                return
+            
+            # A 304 may carry updated validators
+            headers = CaseInsensitiveDict(json.loads(row[0]))
+            for name in ('ETag', 'Last-Modified', 'Cache-Control', 'Expires'):
+                if name in response.headers:
+                    headers[name] = response.headers[name]
+            
+            self._conn.execute(
+                "UPDATE responses SET headers = ?, stored_at = ? WHERE url = ?",
+                (json.dumps(dict(headers)), time.time(), url)
+            )
+            self._conn.commit()
+    
+    def count(self, counter: str, amount: int = 1):
+        """Increment one of the hit/miss counters"""
+        with self._lock:
+            self.counters[counter] += amount
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+        
+        Returns:
+            Dictionary with hits, misses, revalidated, bytes_saved, hit_rate and entries
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            stats['entries'] = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        
+        lookups = stats['hits'] + stats['revalidated'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['revalidated']) / lookups if lookups else 0.0
+        return stats
+    
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+class CachingAdapter(HTTPAdapter):
+    """
+    Transport adapter that serves GET requests from a ResponseCache
+    
+    Fresh entries are returned without touching the network. Stale entries
+    are revalidated with If-None-Match / If-Modified-Since and reused when
+    the server answers 304 Not Modified.
+    """
+    
+    def __init__(self, cache: ResponseCache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+    
+    def send(self, request, **kwargs):
+        if request.method != 'GET':
+            return super().send(request, **kwargs)
+        
+        url = request.url
+        entry = self.cache.get(url)
+        
+        if entry and entry['fresh']:
+            self.cache.count('hits')
+            self.cache.count('bytes_saved', entry['size'])
+            return self._build_cached_response(request, entry)
+        
+        if entry:
+            etag = entry['headers'].get('ETag')
+            last_modified = entry['headers'].get('Last-Modified')
+            if etag:
+                request.headers['If-None-Match'] = etag
+            if last_modified:
+                request.headers['If-Modified-Since'] = last_modified
+        
+        response = super().send(request, **kwargs)
+        
+        if response.status_code == 304 and entry:
+            self.cache.refresh(url, response)
+            self.cache.count('revalidated')
+            self.cache.count('bytes_saved', entry['size'])
+            response.close()
+            return self._build_cached_response(request, entry)
+        
+        self.cache.count('misses')
+        if response.status_code == 200:
+            self.cache.store(url, response)
+        
+        return response
+    
+    def _build_cached_response(self, request, entry: Dict[str, Any]) -> requests.Response:
+        """Turn a cache entry back into a requests.Response"""
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = entry['headers']
+        response._content = entry['body']
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = 'OK'
+        response.url = request.url
+        response.request = request
+        response.from_cache = True
+        return response
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache shared by all scrapers"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache()
+        return _shared_cache
@@ -0,0 +1,41 @@
+from typing import Optional
+
+import requests
+
+from utils.http_cache import CachingAdapter, ResponseCache, get_response_cache
+from utils.rate_limiter import HostRateLimiter, RateLimitedAdapter
+
+
+class ScraperAdapter(CachingAdapter, RateLimitedAdapter):
+    """
+    Cache first, then rate limiting
+    
+    Requests answered from the cache never wait for the limiter; only the
+    ones that reach the network (including revalidations) do.
+    """
+
+
+def configure_session(session: requests.Session, cache: Optional[ResponseCache] = None,
+                      use_cache: bool = True, limiter: Optional[HostRateLimiter] = None) -> Optional[ResponseCache]:
+    """
+    Mount the shared cache and rate limiter on a scraper session
+    
+    Args:
+        session: Session to configure
+        cache: Response cache to use (defaults to the shared on-disk cache)
+        use_cache: Set to False to skip the cache and only rate limit
+        limiter: Rate limiter to use (defaults to the shared limiter)
+    
+    Returns:
+        The response cache in use, or None when caching is disabled
+    """
+    if use_cache:
+        cache = cache or get_response_cache()
+        adapter = ScraperAdapter(cache, limiter=limiter)
+    else:
+        cache = None
+        adapter = RateLimitedAdapter(limiter=limiter)
+    
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return cache
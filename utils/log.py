@@ -0,0 +1,37 @@
+import logging
+import os
+from typing import Mapping, Optional
+
+# Environment variable that overrides the default log level (DEBUG, INFO, WARNING, ...)
+LOG_LEVEL_ENV = "SCRAPER_LOG_LEVEL"
+
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+
+def configure_logging(level: Optional[str] = None):
+    """
+    Send the project's log records to stderr
+    
+    Every module logs through logging.getLogger(__name__); this only sets up
+    the handler and level once, so calling it again is harmless.
+    
+    Args:
+        level: Log level name (defaults to $SCRAPER_LOG_LEVEL, then INFO)
+    """
+    level = (level or os.environ.get(LOG_LEVEL_ENV) or "INFO").upper()
+    logging.basicConfig(level=logging.WARNING, format=LOG_FORMAT)
+    for package in ("scrapers", "utils", "app", "__main__"):
+        logging.getLogger(package).setLevel(level)
+
+
+def format_counters(counters: Mapping[str, int]) -> str:
+    """
+    Format per-scan counters as one summary line
+    
+    Args:
+        counters: Counter names mapped to their values
+    
+    Returns:
+        "name=value" pairs in insertion order, skipping zeros
+    """
+    return " ".join(f"{name}={value}" for name, value in counters.items() if value) or "nothing to report"
@@ -0,0 +1,101 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import chain, repeat
+from typing import Tuple
+
+# Accents and other marks left behind by NFKD decomposition (the Combining
+# Diacritical Marks blocks)
+COMBINING_MARKS_PATTERN = re.compile('[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]+')
+
+# Documents whose normalized view is kept for the other extractors
+VIEW_CACHE_SIZE = 64
+
+
+def fold(text: str) -> str:
+    """
+    Casefold text and strip its accents ("Opções BINÁRIAS" -> "opcoes binarias")
+    
+    Args:
+        text: Text to fold
+    
+    Returns:
+        Folded text
+    """
+    if text.isascii():
+        return text.lower()
+    return COMBINING_MARKS_PATTERN.sub('', unicodedata.normalize('NFKD', text.casefold()))
+
+
+@lru_cache(maxsize=4096)
+def _fold_char(char: str) -> str:
+    """Fold a single character"""
+    return fold(char)
+
+
+class NormalizedText:
+    """
+    Casefolded, accent-stripped view of a text with offsets back into it
+    
+    Most characters fold to exactly one character ("ç" -> "c"), and then
+    offsets in the view are offsets in the original. Only when some
+    character folds to several characters or to none (a ligature, "ß", a
+    loose combining mark) is an offset map built, one character at a time.
+    """
+    
+    def __init__(self, text: str):
+        """
+        Initialize the view
+        
+        Args:
+            text: Original text
+        """
+        self.original = text
+        self.text = fold(text)
+        
+        # offsets[i] is the original offset of view character i, plus a
+        # sentinel for the end; None when they are the same
+        self.offsets = None
+        if len(self.text) != len(text) or (not text.isascii() and COMBINING_MARKS_PATTERN.search(text)):
+            pieces = [_fold_char(char) for char in text]
+            self.offsets = list(chain.from_iterable(repeat(i, len(piece)) for i, piece in enumerate(pieces)))
+            self.offsets.append(len(text))
+            if len(self.offsets) != len(self.text) + 1:
+                # Decomposing the whole text reordered some marks; fold it
+                # character by character so the map lines up
+                self.text = ''.join(pieces)
+    
+    def span(self, start: int, end: int) -> Tuple[int, int]:
+        """Map a span of the view to the span of the original it came from"""
+        if self.offsets is None:
+            return start, end
+        return self.offsets[start], self.offsets[end]
+    
+    def view_offset(self, original_offset: int) -> int:
+        """Map an offset in the original to the first view character at or after it"""
+        if self.offsets is None:
+            return original_offset
+        return bisect_left(self.offsets, original_offset)
+    
+    def original_text(self, start: int, end: int) -> str:
+        """Return the original text behind a span of the view"""
+        start, end = self.span(start, end)
+        return self.original[start:end]
+
+
+@lru_cache(maxsize=VIEW_CACHE_SIZE)
+def normalized_view(text: str) -> NormalizedText:
+    """
+    Return the normalized view of a text, built once per document
+    
+    The platform, group name and token extractors all ask for the view of the
+    same title + description, so only the first one pays for folding it.
+    
+    Args:
+        text: Original text
+    
+    Returns:
+        NormalizedText for the text
+    """
+    return NormalizedText(text)
@@ -1,9 +1,12 @@
+import logging
 import smtplib
 import os
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import List, Dict, Any
 
+logger = logging.getLogger(__name__)
+
 class EmailNotifier:
     """
     Send email notifications about newly discovered videos
@@ -31,12 +34,12 @@ class EmailNotifier:
             Boolean indicating success
         """
         if not self.smtp_username or not self.smtp_password:
-            print("SMTP credentials not configured. Skipping email notification.")
+            logger.info("SMTP credentials not configured. Skipping email notification.")
             return False
         
         recipient = recipient_email or os.getenv("RECIPIENT_EMAIL", "")
         if not recipient:
-            print("Recipient email not provided. Skipping email notification.")
+            logger.info("Recipient email not provided. Skipping email notification.")
             return False
         
         # Create message
@@ -111,5 +114,5 @@ class EmailNotifier:
             return True
         
         except Exception as e:
-            print(f"Error sending email notification: {str(e)}")
+            logger.error("Error sending email notification: %s", e)
             return False
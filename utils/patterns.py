@@ -0,0 +1,101 @@
+import re
+from typing import Dict, Iterable, List, Optional
+
+# Compiled regular expressions shared by every text extractor. They are built
+# once, at import, instead of being passed as strings to re.findall on each call.
+
+# Links as extracted by TextProcessor and YouTubeScraper
+URL = r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+[/\w\.-]*(?:\?[/\w\.-=&]*)?'
+WHATSAPP_LINK = r'https?://(?:chat\.)?whatsapp\.com/(?:invite/)?(?:[-\w]*)'
+TELEGRAM_LINK = r'https?://(?:t\.me|telegram\.me|telegram\.dog)/(?:joinchat/)?(?:[-\w]*)'
+
+# Links as extracted by utils.text_extraction, with the domain / invite code / username
+WEBSITE = r'https?://(?:www\.)?(?P<website_domain>[a-zA-Z0-9][-a-zA-Z0-9]{0,62}(?:\.[a-zA-Z0-9][-a-zA-Z0-9]{0,62})+)'
+WHATSAPP_GROUP = r'https?://(?:chat\.)?whatsapp\.com/(?:invite/)?(?P<whatsapp_invite>[a-zA-Z0-9]+)'
+TELEGRAM_GROUP = r'https?://t\.me/(?P<telegram_username>[a-zA-Z0-9_]+)'
+
+URL_PATTERN = re.compile(URL)
+WHATSAPP_LINK_PATTERN = re.compile(WHATSAPP_LINK)
+TELEGRAM_LINK_PATTERN = re.compile(TELEGRAM_LINK)
+WEBSITE_PATTERN = re.compile(WEBSITE)
+WHATSAPP_GROUP_PATTERN = re.compile(WHATSAPP_GROUP)
+TELEGRAM_GROUP_PATTERN = re.compile(TELEGRAM_GROUP)
+
+# Every link kind, keyed by the named group that captures it
+LINK_KINDS = {
+    'url': URL,
+    'whatsapp': WHATSAPP_LINK,
+    'telegram': TELEGRAM_LINK,
+    'website': WEBSITE,
+    'whatsapp_group': WHATSAPP_GROUP,
+    'telegram_group': TELEGRAM_GROUP
+}
+
+# Every link kind at once, each in its own lookahead so the same text can be
+# captured by several kinds (a WhatsApp link is also a URL). Applied with
+# match() at each "http" in the text, see scan_links.
+LINK_SCAN_PATTERN = re.compile(
+    r'(?=https?://)' + ''.join(f'(?=(?P<{kind}>{pattern}))?' for kind, pattern in LINK_KINDS.items())
+)
+
+# Each link kind on its own, captured by the same named group, for callers
+# that only want a few kinds
+LINK_KIND_PATTERNS = {kind: re.compile(f'(?P<{kind}>{pattern})') for kind, pattern in LINK_KINDS.items()}
+
+# Platform names in TextProcessor.extract_platforms
+PLATFORM_PHRASE_PATTERN = re.compile(
+    r'(?:a\s+)?plataforma\s+(?:de\s+investimento\s+)?([A-Za-z0-9]+[A-Za-z0-9\s]*)', re.IGNORECASE
+)
+
+NAME_PATTERNS = (
+    re.compile(r'\b[A-Z][a-z]*(?:Bet|Trade|Invest|Forex|Crypto|Pay|Cash|Earn|Money|FX|BTC)\b'),
+    re.compile(r'\b(?:Bet|Trade|Invest|Forex|Crypto|Pay|Cash|Earn|Money|FX|BTC)[A-Z][a-z]*\b'),
+    re.compile(r'\b[A-Z][a-z]*(?:Trader|Broker|Market|Exchange|Capital|Partners|Group|Bank)\b'),
+    re.compile(r'\b[A-Z][a-zA-Z0-9]*(?:\.io|\.com|\.net|\.app)\b')
+)
+
+# Group names near a messaging link
+WHATSAPP_NAME_PATTERN = re.compile(r'grupo\s+(?:do|de|da)?\s+([A-Za-z0-9\s]{3,30})', re.IGNORECASE)
+TELEGRAM_NAME_PATTERN = re.compile(r'(?:canal|grupo|channel)\s+(?:do|de|da)?\s+([A-Za-z0-9\s]{3,30})', re.IGNORECASE)
+
+# Quoted platform names in utils.text_extraction
+QUOTED_NAME_PATTERN = re.compile(r'["\']([\w\s]{3,30})["\']')
+
+
+def scan_links(text: str, kinds: Optional[Iterable[str]] = None) -> Dict[str, List[re.Match]]:
+    """
+    Find every kind of link in a single pass over the text
+    
+    Matches of the same kind never overlap, so each list is exactly what
+    re.finditer would return for that kind's own pattern.
+    
+    Args:
+        text: Text to scan
+        kinds: Only find these kinds of LINK_KINDS, each with its own
+            pattern; the combined pass only pays off for most of them
+    
+    Returns:
+        Dictionary mapping each kind in LINK_KINDS (or in kinds) to its
+        matches. The link is match.group(kind); the website, WhatsApp group
+        and Telegram group matches also carry website_domain,
+        whatsapp_invite and telegram_username groups.
+    """
+    if kinds is not None:
+        return {kind: list(LINK_KIND_PATTERNS[kind].finditer(text)) for kind in kinds}
+    
+    found = {kind: [] for kind in LINK_KINDS}
+    next_allowed = dict.fromkeys(LINK_KINDS, 0)
+    
+    # Every link starts with "http"; str.find skips to the candidates much
+    # faster than the regex engine can on a pattern that opens with lookaheads
+    pos = text.find('http')
+    while pos != -1:
+        match = LINK_SCAN_PATTERN.match(text, pos)
+        if match:
+            for kind in LINK_KINDS:
+                if match.group(kind) is not None and pos >= next_allowed[kind]:
+                    found[kind].append(match)
+                    next_allowed[kind] = match.end(kind)
+        pos = text.find('http', pos + 1)
+    
+    return found
@@ -0,0 +1,201 @@
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Responses that mean the server wants us to slow down
+THROTTLE_STATUS_CODES = {429, 503}
+
+
+class HostState:
+    """Token bucket and backoff state for a single host"""
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.failures = 0
+
+
+class HostRateLimiter:
+    """
+    Adaptive token-bucket rate limiter shared by every scraper request
+    
+    Each host gets its own bucket. Throttling responses halve the host's
+    rate and block it for an exponentially growing, jittered delay (or the
+    server's Retry-After); every success raises the rate again by a small
+    step, up to max_rate.
+    """
+    
+    def __init__(self, initial_rate: float = 2.0, max_rate: float = 8.0, min_rate: float = 0.2,
+                 burst: int = 4, increase_step: float = 0.1, base_backoff: float = 1.0,
+                 max_backoff: float = 120.0):
+        """
+        Initialize the rate limiter
+        
+        Args:
+            initial_rate: Requests per second allowed for a host we haven't seen yet
+            max_rate: Upper bound the rate ramps up to after successes
+            min_rate: Lower bound the rate backs off to after throttling
+            burst: Number of requests that can be sent back to back
+            increase_step: Requests per second added after each success
+            base_backoff: First backoff delay in seconds
+            max_backoff: Longest backoff delay in seconds
+        """
+        self.initial_rate = initial_rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.burst = burst
+        self.increase_step = increase_step
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.hosts: Dict[str, HostState] = {}
+        self._lock = threading.Lock()
+    
+    def _state(self, host: str) -> HostState:
+        state = self.hosts.get(host)
+        if state is None:
+            state = self.hosts[host] = HostState(self.initial_rate, self.burst)
+        return state
+    
+    def acquire(self, host: str):
+        """Block until a request to host may be sent"""
+        while True:
+            with self._lock:
+                state = self._state(host)
+                now = time.monotonic()
+                
+                if now < state.blocked_until:
+                    wait = state.blocked_until - now
+                else:
+                    state.tokens = min(state.burst, state.tokens + (now - state.updated_at) * state.rate)
+                    state.updated_at = now
+                    if state.tokens >= 1:
+                        state.tokens -= 1
+                        return
+                    wait = (1 - state.tokens) / state.rate
+            
+            time.sleep(wait)
+    
+    def record_success(self, host: str):
+        """Slowly ramp the host's rate back up"""
+        with self._lock:
+            state = self._state(host)
+            state.failures = 0
+            state.rate = min(self.max_rate, state.rate + self.increase_step)
+    
+    def record_throttle(self, host: str, retry_after: Optional[float] = None) -> float:
+        """
+        Back off after a throttling response
+        
+        Args:
+            host: Host that throttled us
+            retry_after: Delay requested by the server, in seconds
+        
+        Returns:
+            Number of seconds the host is blocked for
+        """
+        with self._lock:
+            state = self._state(host)
+            state.failures += 1
+            state.rate = max(self.min_rate, state.rate / 2)
+            state.tokens = 0.0
+            
+            if retry_after is not None:
+                delay = min(retry_after, self.max_backoff)
+            else:
+                delay = min(self.max_backoff, self.base_backoff * 2 ** (state.failures - 1))
+                delay = random.uniform(delay / 2, delay)
+            
+            state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+            return delay
+    
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Current rate and failure count per host"""
+        with self._lock:
+            return {host: {'rate': state.rate, 'failures': state.failures} for host, state in self.hosts.items()}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Convert a Retry-After header (seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def is_throttled(response) -> bool:
+    """Check whether a response asks us to slow down (429/503 or a consent interstitial)"""
+    if response.status_code in THROTTLE_STATUS_CODES:
+        return True
+    
+    if response.is_redirect:
+        location = urlparse(response.headers.get('Location', ''))
+        return location.netloc.startswith('consent.')
+    
+    return False
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    Transport adapter that sends every request through a HostRateLimiter
+    
+    Throttled requests are retried up to max_throttle_retries times after
+    the limiter's backoff delay; the last throttled response is returned
+    if the host keeps refusing.
+    """
+    
+    def __init__(self, limiter: Optional[HostRateLimiter] = None, max_throttle_retries: int = 4, **kwargs):
+        super().__init__(**kwargs)
+        self.limiter = limiter or get_rate_limiter()
+        self.max_throttle_retries = max_throttle_retries
+    
+    def send(self, request, **kwargs):
+        host = urlparse(request.url).netloc
+        
+        for attempt in range(self.max_throttle_retries + 1):
+            self.limiter.acquire(host)
+            response = super().send(request, **kwargs)
+            
+            if not is_throttled(response):
+                self.limiter.record_success(host)
+                return response
+            
+            delay = self.limiter.record_throttle(host, parse_retry_after(response.headers.get('Retry-After')))
+            if attempt == self.max_throttle_retries:
+                break
+            
+            logger.warning("%s is throttling requests (%s), retrying in %.1fs", host, response.status_code, delay)
+            response.close()
+        
+        return response
+
+
+_shared_limiter = None
+_shared_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Return the process-wide rate limiter shared by all scrapers"""
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = HostRateLimiter()
+        return _shared_limiter
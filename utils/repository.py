@@ -0,0 +1,323 @@
+import os
+import datetime
+import logging
+import sys
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from utils.video_store import (
+    JSON_FILE, LOAD_STATS, VideoStore, _load_cache_lock, _load_json_videos, get_video_store
+)
+
+# Files merged by migrate(): the app's list and utils.database's store
+LEGACY_FILES = (JSON_FILE, "video_data.json")
+
+# Messaging platform names for the {'groups': {'whatsapp': [...], ...}} schema
+GROUP_PLATFORMS = {'whatsapp': "WhatsApp", 'telegram': "Telegram"}
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_video(video: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a video from any of the stored schemas to the canonical (app) schema
+    
+    The canonical video has 'channel_name', 'platforms' (names), 'links'
+    (URLs) and 'messaging_groups' ({'platform', 'name', 'link'} dicts), and a
+    'scan_date'. Older schemas used 'channel', links as {'url', 'domain'}
+    dicts, a {'groups': {'whatsapp': [...], 'telegram': [...]}} mapping and
+    'added_at'. Unknown fields are kept.
+    
+    Args:
+        video: Video in any schema
+    
+    Returns:
+        A new dict in the canonical schema
+    """
+    video = dict(video)
+    
+    if 'channel' in video and 'channel_name' not in video:
+        video['channel_name'] = video.pop('channel')
+    if 'scan_date' not in video and video.get('added_at'):
+        video['scan_date'] = video['added_at']
+    
+    video['platforms'] = list(video.get('platforms') or [])
+    video['links'] = [link.get('url', '') if isinstance(link, dict) else link for link in video.get('links') or []]
+    video['links'] = [link for link in video['links'] if link]
+    
+    groups = list(video.get('messaging_groups') or [])
+    known_links = {group.get('link') for group in groups}
+    for key, entries in (video.pop('groups', None) or {}).items():
+        platform = GROUP_PLATFORMS.get(key, key.title())
+        for entry in entries or []:
+            if isinstance(entry, str):
+                entry = {'url': entry}
+            link = entry.get('link') or entry.get('url', '')
+            if link and link not in known_links:
+                known_links.add(link)
+                groups.append({
+                    "platform": platform,
+                    "name": entry.get('name') or entry.get('username') or f"{platform} Group",
+                    "link": link
+                })
+    video['messaging_groups'] = groups
+    
+    return video
+
+
+class VideoRepository:
+    """
+    The one place the app, its components and scheduled jobs read and write videos
+    
+    Videos are kept in the canonical schema (see normalize_video). The list
+    comes from the store's process-wide load cache and is normalized again
+    only when the store's files change, whoever changed them; writes made
+    through the repository are applied to the list as well, so they don't
+    cost a reload. Values derived from it (counts, group lists) are memoized
+    for as long, and come from the store's own indexed queries when the
+    store has them and the list isn't loaded. The lock makes it safe to
+    share with scheduler threads.
+    """
+    
+    def __init__(self, store=None):
+        """
+        Initialize the repository
+        
+        Args:
+            store: Video store to read and write (defaults to get_video_store())
+        """
+        self.store = store or get_video_store()
+        self._lock = threading.RLock()
+        self._signature = None
+        self._videos = []
+        self._positions = {}
+        self._derived_signature = None
+        self._derived = {}
+    
+    def _loaded(self) -> List[Dict[str, Any]]:
+        """The normalized video list, rebuilt when the store's files change; call with the lock held"""
+        if self.store.signature() == self._signature:
+            # The files the list was built from (or written with): a load cache hit
+            with _load_cache_lock:
+                LOAD_STATS['parses_avoided'] += 1
+            return self._videos
+        
+        signature, videos = self.store.cached_load()
+        self._videos = [normalize_video(video) for video in videos]
+        self._positions = {video['id']: i for i, video in enumerate(self._videos)}
+        self._signature = signature
+        return self._videos
+    
+    def _store_query(self, name: str) -> Optional[Callable]:
+        """The store's own version of a query, if it overrides VideoStore's load-everything one"""
+        if getattr(type(self.store), name, None) is getattr(VideoStore, name):
+            return None
+        return getattr(self.store, name)
+    
+    def _derive(self, name: str, compute: Callable[[List[Dict[str, Any]]], Any],
+                query: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        Compute a value once per version of the store's files
+        
+        Args:
+            name: Key the value is memoized under
+            compute: Function of the video list giving the value
+            query: Function asking the store for the same value, used
+                instead of loading the list when it isn't loaded and current
+        
+        Returns:
+            The value
+        """
+        with self._lock:
+            signature = self.store.signature()
+            if signature != self._derived_signature:
+                self._derived = {}
+                self._derived_signature = signature
+            if name not in self._derived:
+                if query is not None and signature != self._signature:
+                    self._derived[name] = query()
+                else:
+                    self._derived[name] = compute(self._loaded())
+            return self._derived[name]
+    
+    def load_videos(self) -> List[Dict[str, Any]]:
+        """Return every video, in saved order (a new list; treat the videos as read-only)"""
+        with self._lock:
+            return list(self._loaded())
+    
+    def get_video(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Return a video by id, or None"""
+        with self._lock:
+            videos = self._loaded()
+            position = self._positions.get(video_id)
+            return videos[position] if position is not None else None
+    
+    def save_videos(self, videos: Iterable[Dict[str, Any]]):
+        """Replace every stored video"""
+        videos = list({video['id']: video for video in map(normalize_video, videos)}.values())
+        with self._lock:
+            self.store.save_videos(videos)
+            self._videos = videos
+            self._positions = {video['id']: i for i, video in enumerate(videos)}
+            self._signature = self.store.signature()
+            self._derived_signature = None
+    
+    def upsert_video(self, video: Dict[str, Any]):
+        """Add a video, or replace the stored video with the same id in place"""
+        video = normalize_video(video)
+        with self._lock:
+            # The list can only take the write if it was current before it
+            current = self.store.signature() == self._signature
+            self.store.upsert_video(video)
+            self._derived_signature = None
+            if not current:
+                self._signature = None
+                return
+            position = self._positions.get(video['id'])
+            if position is None:
+                self._positions[video['id']] = len(self._videos)
+                self._videos.append(video)
+            else:
+                self._videos[position] = video
+            self._signature = self.store.signature()
+    
+    def clear(self):
+        """Delete every stored video"""
+        self.save_videos([])
+    
+    def get_videos_by_platform(self, platform_name: str) -> List[Dict[str, Any]]:
+        """Return the videos that mention a platform"""
+        query = self._store_query('get_videos_by_platform')
+        return list(self._derive(
+            f'platform:{platform_name}',
+            lambda videos: self._derive('by_platform', _group_by_platform).get(platform_name, []),
+            query and (lambda: [normalize_video(video) for video in query(platform_name)])
+        ))
+    
+    def get_platform_counts(self) -> List[Tuple[str, int]]:
+        """Count platform mentions, most mentioned first (ties in order of first mention)"""
+        return self._derive('platform_counts', lambda videos: Counter(
+            platform for video in videos for platform in video['platforms']).most_common(),
+            self._store_query('get_platform_counts'))
+    
+    def get_domain_counts(self) -> List[Tuple[str, int]]:
+        """Count links per website domain, most linked first"""
+        return self._derive('domain_counts', lambda videos: Counter(
+            domain for video in videos for domain in map(_domain, video['links']) if domain).most_common())
+    
+    def get_domain_details(self) -> Dict[str, Dict[str, Any]]:
+        """Map each website domain to its URLs and the videos that link to it, in order of first mention"""
+        return self._derive('domain_details', _domain_details)
+    
+    def get_messaging_groups(self) -> List[Dict[str, Any]]:
+        """Return every messaging group mention, in video order"""
+        return list(self._derive('messaging_groups', lambda videos: [
+            group for video in videos for group in video['messaging_groups']]))
+    
+    def get_video_stats(self, recent_days: int = 7) -> Dict[str, int]:
+        """
+        Summarize the stored videos
+        
+        Args:
+            recent_days: Window for the 'recent_videos' count
+        
+        Returns:
+            Counts of videos in total, with platforms, with links, with
+            messaging groups and scanned in the last recent_days days
+        """
+        cutoff = (datetime.datetime.now() - datetime.timedelta(days=recent_days)).strftime('%Y-%m-%d')
+        return self._derive(f'stats:{cutoff}', lambda videos: {
+            "total": len(videos),
+            "youtube": len(videos),
+            "platforms_mentioned": sum(1 for v in videos if v['platforms']),
+            "links_found": sum(1 for v in videos if v['links']),
+            "groups_found": sum(1 for v in videos if v['messaging_groups']),
+            "recent_videos": sum(1 for v in videos if v.get('scan_date', '') >= cutoff)
+        })
+    
+    def migrate(self, paths: List[str] = LEGACY_FILES) -> int:
+        """
+        Merge JSON video files in any schema into the store
+        
+        Stored videos come first and win on conflicting fields; a video found
+        in several files is filled in with the fields only the others have.
+        
+        Args:
+            paths: JSON files to merge (missing ones are skipped)
+        
+        Returns:
+            Number of videos added to the store
+        """
+        with self._lock:
+            merged = {video['id']: dict(video) for video in self._loaded()}
+            before = len(merged)
+            for path in paths:
+                if not os.path.exists(path):
+                    continue
+                for video in _load_json_videos(path):
+                    if not video.get('id'):
+                        continue
+                    video = normalize_video(video)
+                    stored = merged.setdefault(video['id'], video)
+                    for key, value in video.items():
+                        if value and not stored.get(key):
+                            stored[key] = value
+            self.save_videos(merged.values())
+            logger.info("Migrated %d new videos from %s", len(merged) - before, ", ".join(paths))
+            return len(merged) - before
+
+
+def _domain(url: str) -> str:
+    """The domain of a URL ('' if it can't be parsed)"""
+    try:
+        return urlparse(url).netloc
+    except ValueError:
+        return ''
+
+
+def _domain_details(videos: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Map each domain to its distinct URLs, and the ids and titles of the videos linking to it"""
+    details = {}
+    for video in videos:
+        for url in video['links']:
+            domain = _domain(url)
+            if not domain:
+                continue
+            entry = details.setdefault(domain, {'domain': domain, 'urls': [], 'videos': [], 'video_titles': []})
+            if url not in entry['urls']:
+                entry['urls'].append(url)
+            if video['id'] not in entry['videos']:
+                entry['videos'].append(video['id'])
+                entry['video_titles'].append(video.get('title', 'Unknown'))
+    return details
+
+
+def _group_by_platform(videos: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Map each platform name to the videos that mention it"""
+    by_platform = {}
+    for video in videos:
+        for platform in dict.fromkeys(video['platforms']):
+            by_platform.setdefault(platform, []).append(video)
+    return by_platform
+
+
+_shared_repository = None
+_shared_repository_lock = threading.Lock()
+
+
+def get_repository() -> VideoRepository:
+    """Return the process-wide video repository"""
+    global _shared_repository
+    with _shared_repository_lock:
+        if _shared_repository is None:
+            _shared_repository = VideoRepository()
+        return _shared_repository
+
+
+if __name__ == "__main__":
+    # One-shot migration: python -m utils.repository [data/videos.json video_data.json ...]
+    repository = get_repository()
+    added = repository.migrate(sys.argv[1:] or LEGACY_FILES)
+    print(f"[+] Merged {added} new videos; {len(repository.load_videos())} videos in the store")
@@ -1,23 +1,107 @@
+import logging
+import os
 import re
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-
-# Download NLTK resources
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
-
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords', quiet=True)
-
-# Regular expressions for finding links and platform names
-WEBSITE_PATTERN = r'https?://(?:www\.)?([a-zA-Z0-9][-a-zA-Z0-9]{0,62}(?:\.[a-zA-Z0-9][-a-zA-Z0-9]{0,62})+)'
-WHATSAPP_GROUP_PATTERN = r'https?://(?:chat\.)?whatsapp\.com/(?:invite/)?([a-zA-Z0-9]+)'
-TELEGRAM_GROUP_PATTERN = r'https?://t\.me/([a-zA-Z0-9_]+)'
+from itertools import accumulate
+
+from scrapers.text_processor import telegram_group_entries, website_entries, whatsapp_group_entries
+from utils.normalized_text import fold, normalized_view
+from utils.patterns import QUOTED_NAME_PATTERN, scan_links
+
+logger = logging.getLogger(__name__)
+
+# Tokenizer backend: "regex" (default, no downloads) or "nltk", which is only
+# imported on first use and falls back to "regex" if its data isn't installed
+BACKEND_ENV = "TEXT_EXTRACTION_BACKEND"
+
+# Words, keeping internal hyphens, dots and apostrophes ("multi-nível", "site.com")
+TOKEN_PATTERN = re.compile(r"\w+(?:[-.'’]\w+)*")
+
+# NLTK's Portuguese stopword list, bundled so no corpus download is needed
+PORTUGUESE_STOPWORDS = frozenset("""
+    a à ao aos aquela aquelas aquele aqueles aquilo as às até com como da das de dela delas dele deles
+    depois do dos e é ela elas ele eles em entre era eram éramos essa essas esse esses esta está estamos
+    estão estar estas estava estavam estávamos este esteja estejam estejamos estes esteve estive
+    estivemos estiver estivera estiveram estivéramos estiverem estivermos estivesse estivessem
+    estivéssemos estou eu foi fomos for fora foram fôramos forem formos fosse fossem fôssemos fui há
+    haja hajam hajamos hão havemos haver hei houve houvemos houver houvera houverá houveram houvéramos
+    houverão houverei houverem houveremos houveria houveriam houveríamos houvermos houvesse houvessem
+    houvéssemos isso isto já lhe lhes mais mas me mesmo meu meus minha minhas muito na não nas nem no
+    nos nós nossa nossas nosso nossos num numa o os ou para pela pelas pelo pelos por qual quando que
+    quem são se seja sejam sejamos sem ser será serão serei seremos seria seriam seríamos seu seus só
+    somos sou sua suas também te tem tém temos tenha tenham tenhamos tenho terá terão terei teremos
+    teria teriam teríamos teu teus teve tinha tinham tínhamos tive tivemos tiver tivera tiveram
+    tivéramos tiverem tivermos tivesse tivessem tivéssemos tu tua tuas um uma você vocês vos
+""".split())
+FOLDED_STOPWORDS = frozenset(map(fold, PORTUGUESE_STOPWORDS))
+
+# (word_tokenize, stopwords) once NLTK has been loaded, False if it can't be
+_nltk_backend = None
+
+
+def _load_nltk():
+    """Import NLTK and its Portuguese data on first use, without downloading anything"""
+    global _nltk_backend
+    if _nltk_backend is None:
+        try:
+            import nltk
+            from nltk.tokenize import word_tokenize
+            
+            # Both raise LookupError when the tokenizer models or the corpus aren't installed
+            word_tokenize("probe")
+            stop_words = frozenset(map(fold, nltk.corpus.stopwords.words('portuguese')))
+            _nltk_backend = (word_tokenize, stop_words)
+        except (ImportError, LookupError) as e:
+            logger.warning("NLTK backend unavailable (%s), using the regex tokenizer", type(e).__name__)
+            _nltk_backend = False
+    return _nltk_backend
+
+
+def _token_spans(text, tokens):
+    """
+    Locate tokens that come without offsets (NLTK's) in the text they were split from.
+    
+    Returns:
+        list: (start, end) of each token, or None for a token the tokenizer
+        rewrote (NLTK turns quotes into `` and '').
+    """
+    spans = []
+    offset = 0
+    for token in tokens:
+        start = text.find(token, offset)
+        if start < 0:
+            spans.append(None)
+        else:
+            offset = start + len(token)
+            spans.append((start, offset))
+    return spans
+
+
+def tokenize(text, backend=None):
+    """
+    Split the normalized (casefolded, accent-stripped) text into tokens.
+    
+    Args:
+        text (str): Text to tokenize.
+        backend (str): "regex" or "nltk" (defaults to $TEXT_EXTRACTION_BACKEND, then "regex").
+    
+    Returns:
+        tuple: (tokens, stop_words, display_name) - the folded tokens, the folded
+        stopword set and a function giving token i as written in text, title-cased.
+    """
+    view = normalized_view(text)
+    
+    backend = backend or os.environ.get(BACKEND_ENV, "regex")
+    if backend == "nltk":
+        nltk_backend = _load_nltk()
+        if nltk_backend:
+            word_tokenize, stop_words = nltk_backend
+            tokens = word_tokenize(view.text)
+            spans = _token_spans(view.text, tokens)
+            return tokens, stop_words, lambda i: (view.original_text(*spans[i]) if spans[i] else tokens[i]).title()
+    
+    matches = list(TOKEN_PATTERN.finditer(view.text))
+    tokens = [match.group() for match in matches]
+    return tokens, FOLDED_STOPWORDS, lambda i: view.original_text(*matches[i].span()).title()
 
 # Common investment platform keywords (in Portuguese)
 PLATFORM_KEYWORDS = [
@@ -25,6 +109,10 @@ PLATFORM_KEYWORDS = [
     'criptomoeda', 'multinível', 'mlm', 'pagamento', 'rendimento', 'renda', 'lucro',
     'ganho', 'retorno', 'dividendo', 'rentabilidade', 'roi', 'juros'
 ]
+PLATFORM_KEYWORD_SET = frozenset(map(fold, PLATFORM_KEYWORDS))
+
+# Words before and after a token that are searched for a platform keyword
+CONTEXT_RANGE = 5
 
 def extract_platforms_and_links(video):
     """
@@ -38,14 +126,10 @@ def extract_platforms_and_links(video):
     """
     text = f"{video['title']} {video['description']}"
     
-    # Extract web links
-    links = extract_links(text)
-    
-    # Extract messaging app groups
-    groups = {
-        'whatsapp': extract_whatsapp_groups(text),
-        'telegram': extract_telegram_groups(text)
-    }
+    # Links and messaging app groups come from the shared link scanner
+    found_links = scan_links(text, ('website', 'whatsapp_group', 'telegram_group'))
+    links = website_entries(found_links)
+    groups = {'whatsapp': whatsapp_group_entries(found_links), 'telegram': telegram_group_entries(found_links)}
     
     # Extract platform names
     platforms = extract_platform_names(text)
@@ -54,54 +138,36 @@ def extract_platforms_and_links(video):
 
 def extract_links(text):
     """Extract website links from text."""
-    links = []
-    matches = re.finditer(WEBSITE_PATTERN, text)
-    for match in matches:
-        domain = match.group(1)
-        full_url = match.group(0)
-        links.append({
-            'domain': domain,
-            'url': full_url
-        })
-    return links
+    return website_entries(scan_links(text, ('website',)))
 
 def extract_whatsapp_groups(text):
     """Extract WhatsApp group links from text."""
-    groups = []
-    matches = re.finditer(WHATSAPP_GROUP_PATTERN, text)
-    for match in matches:
-        invite_code = match.group(1)
-        full_url = match.group(0)
-        groups.append({
-            'invite_code': invite_code,
-            'url': full_url
-        })
-    return groups
+    return whatsapp_group_entries(scan_links(text, ('whatsapp_group',)))
 
 def extract_telegram_groups(text):
     """Extract Telegram group links from text."""
-    groups = []
-    matches = re.finditer(TELEGRAM_GROUP_PATTERN, text)
-    for match in matches:
-        username = match.group(1)
-        full_url = match.group(0)
-        groups.append({
-            'username': username,
-            'url': full_url
-        })
-    return groups
-
-def extract_platform_names(text):
+    return telegram_group_entries(scan_links(text, ('telegram_group',)))
+
+def extract_platform_names(text, backend=None):
     """
     Extract potential investment platform names from text.
     Uses a combination of pattern matching and keyword proximity.
+    
+    Args:
+        text (str): Text to analyze.
+        backend (str): Tokenizer backend, see tokenize().
     """
     platforms = []
     
     # Tokenize text
     try:
-        tokens = word_tokenize(text.lower())
-        stop_words = set(stopwords.words('portuguese'))
+        tokens, stop_words, display_name = tokenize(text, backend)
+        
+        # keywords_before[j] counts the keyword tokens in tokens[:j], so the
+        # keywords within CONTEXT_RANGE of token i are one subtraction away
+        keywords_before = list(accumulate((token in PLATFORM_KEYWORD_SET for token in tokens), initial=0))
+        last = len(tokens)
+        seen = set()
         
         # Find potential platform name candidates
         for i, token in enumerate(tokens):
@@ -110,26 +176,24 @@ def extract_platform_names(text):
                 continue
             
             # Check if the token is near a platform keyword
-            context_range = 5  # Words before and after to check
-            start = max(0, i - context_range)
-            end = min(len(tokens), i + context_range + 1)
-            context = tokens[start:end]
+            start = max(0, i - CONTEXT_RANGE)
+            end = min(last, i + CONTEXT_RANGE + 1)
             
-            if any(keyword in context for keyword in PLATFORM_KEYWORDS):
+            if keywords_before[end] > keywords_before[start]:
                 # Capitalize first letter of each word for better display
-                platform_name = token.title()
-                if platform_name not in platforms:
+                platform_name = display_name(i)
+                if platform_name not in seen:
+                    seen.add(platform_name)
                     platforms.append(platform_name)
         
         # Look for platform names that might be in quotes
-        quote_pattern = r'["\']([\w\s]{3,30})["\']'
-        quote_matches = re.finditer(quote_pattern, text)
+        quote_matches = QUOTED_NAME_PATTERN.finditer(text)
         for match in quote_matches:
             potential_name = match.group(1).strip()
             if len(potential_name.split()) <= 3:  # Limit to 3 words max
                 platforms.append(potential_name)
     
     except Exception as e:
-        print(f"Error in platform name extraction: {str(e)}")
+        logger.warning("Error in platform name extraction: %s", e)
     
     return list(set(platforms))  # Remove duplicates
@@ -0,0 +1,736 @@
+import contextlib
+import os
+import hashlib
+import json
+import logging
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:
+    # Not on Windows; the JSONL log is then only locked within the process
+    fcntl = None
+
+# Default locations, next to the rest of the data
+DATA_DIRECTORY = "data"
+JSON_FILE = os.path.join(DATA_DIRECTORY, "videos.json")
+SQLITE_FILE = os.path.join(DATA_DIRECTORY, "videos.sqlite")
+JSONL_FILE = os.path.join(DATA_DIRECTORY, "videos.jsonl")
+
+# Environment variable selecting the storage backend ("sqlite", "jsonl" or "json")
+BACKEND_ENV = "VIDEO_STORE_BACKEND"
+# SQLite upserts in place and answers the platform views from its indexes;
+# the JSON file is faster to load and save whole, but a scan rewrites all of
+# it per video (see benchmarks.bench_video_store)
+DEFAULT_BACKEND = "sqlite"
+
+# Superseded lines the JSONL log tolerates before compacting in the background
+COMPACT_MIN_LINES = 1000
+
+# Video fields stored in their own columns; every other field is kept as JSON
+VIDEO_COLUMNS = (
+    'title', 'channel_name', 'channel_id', 'publish_date', 'published_at',
+    'view_count', 'thumbnail', 'description', 'scan_date'
+)
+
+# Messaging group fields with a column of their own; the rest go to its JSON column
+GROUP_COLUMNS = ('platform', 'name', 'link')
+
+logger = logging.getLogger(__name__)
+
+# Parsed video lists shared by every store in the process, keyed by store path:
+# path -> (signature of the store's files when parsed, videos)
+_load_cache = {}
+_load_cache_lock = threading.Lock()
+
+# Full parses of a store, and loads answered from _load_cache instead
+LOAD_STATS = Counter()
+
+
+def _digest(video: Dict[str, Any]) -> str:
+    """
+    Fingerprint of a video's content, to tell which stored rows a save has to rewrite
+    
+    Computed on the video as the stores read it back: missing platform, link
+    and group lists count as empty, and key order and None values (in the
+    video or its messaging groups) don't count.
+    """
+    content = dict(video)
+    for key in ('platforms', 'links', 'messaging_groups'):
+        content[key] = content.get(key) or []
+    content['messaging_groups'] = [
+        sorted((key, value) for key, value in group.items() if value is not None) if isinstance(group, dict) else group
+        for group in content['messaging_groups']
+    ]
+    content = sorted((key, value) for key, value in content.items() if value is not None)
+    return hashlib.blake2b(repr(content).encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+
+def _load_json_videos(path: str) -> List[Dict[str, Any]]:
+    """Read a video list from a JSON file in either schema (a list or {'videos': [...]})"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('videos', []) if isinstance(data, dict) else data
+
+
+class VideoStore:
+    """
+    Base class for the video stores: queries and upserts on top of load/save
+    
+    Subclasses implement _parse and save_videos, call _invalidate after each
+    write, and override the rest when they can answer without loading every
+    video. Loads are cached for the whole process, keyed on the path, mtime
+    and size of the store's files, so an unchanged store is parsed once
+    however many views ask for it (see LOAD_STATS).
+    """
+    
+    path = None
+    
+    def files(self) -> Tuple[str, ...]:
+        """Files whose contents make up the store"""
+        return (self.path,)
+    
+    def signature(self) -> Tuple:
+        """(path, mtime, size) of each of the store's files; changes whenever they are written"""
+        signature = []
+        for path in self.files():
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((path, None, None))
+        return tuple(signature)
+    
+    def _parse(self) -> List[Dict[str, Any]]:
+        """Read every video from the store's files, in saved order"""
+        raise NotImplementedError
+    
+    def cached_load(self) -> Tuple[Tuple, List[Dict[str, Any]]]:
+        """
+        Return the store's signature and its videos, parsing the files only
+        if they changed since the last load in this process
+        
+        The list is shared with every other caller; don't modify it or its
+        videos.
+        """
+        # Taken before parsing, so a write during the parse makes the next
+        # load parse again
+        signature = self.signature()
+        with _load_cache_lock:
+            cached = _load_cache.get(self.path)
+            if cached is not None and cached[0] == signature:
+                LOAD_STATS['parses_avoided'] += 1
+                return cached
+        videos = self._parse()
+        with _load_cache_lock:
+            LOAD_STATS['parses'] += 1
+            _load_cache[self.path] = (signature, videos)
+        return signature, videos
+    
+    def _invalidate(self):
+        """Forget the cached videos after a write"""
+        with _load_cache_lock:
+            _load_cache.pop(self.path, None)
+    
+    def load_videos(self) -> List[Dict[str, Any]]:
+        """Load every video, in saved order"""
+        return list(self.cached_load()[1])
+    
+    def save_videos(self, videos: List[Dict[str, Any]]):
+        """Replace the stored videos with the given list"""
+        raise NotImplementedError
+    
+    def upsert_video(self, video: Dict[str, Any]):
+        """Add a video, or replace the stored video with the same id in place"""
+        videos = self.load_videos()
+        for i, stored in enumerate(videos):
+            if stored['id'] == video['id']:
+                videos[i] = video
+                break
+        else:
+            videos.append(video)
+        self.save_videos(videos)
+    
+    def get_videos_by_platform(self, platform_name: str) -> List[Dict[str, Any]]:
+        """Load the videos that mention a platform"""
+        return [v for v in self.load_videos() if platform_name in v.get('platforms', [])]
+    
+    def get_platform_counts(self) -> List[Tuple[str, int]]:
+        """Count platform mentions, most mentioned first"""
+        return Counter(p for v in self.load_videos() for p in v.get('platforms', [])).most_common()
+
+
+class JsonVideoStore(VideoStore):
+    """
+    The original storage: the whole video list in one indented JSON file
+    """
+    
+    def __init__(self, path: str = JSON_FILE):
+        """
+        Initialize the store
+        
+        Args:
+            path: Path to the JSON file
+        """
+        self.path = path
+    
+    def _parse(self) -> List[Dict[str, Any]]:
+        """Read every video from the JSON file"""
+        if not os.path.exists(self.path):
+            return []
+        return _load_json_videos(self.path)
+    
+    def save_videos(self, videos: List[Dict[str, Any]]):
+        """Replace the stored videos with the given list"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(videos, f, ensure_ascii=False, indent=2)
+        self._invalidate()
+
+
+class SqliteVideoStore(VideoStore):
+    """
+    Video storage in SQLite, with platforms, links and messaging groups in
+    their own tables
+    
+    The database runs in WAL mode so the Streamlit reruns can read while a
+    scan writes. Platform names, link domains and scan dates are indexed, so
+    the per-platform and per-domain views don't need to load every video.
+    Fields without a column of their own (likes, comments, a group's member
+    count, ...) round-trip through the JSON columns of the video and group
+    tables, and load_videos returns the videos in the order they were saved.
+    Each video row keeps a digest of its content, so saving the whole list
+    only writes the videos that changed.
+    """
+    
+    def __init__(self, db_file: str = SQLITE_FILE, import_from: Optional[str] = JSON_FILE):
+        """
+        Initialize the store
+        
+        Args:
+            db_file: Path to the SQLite file
+            import_from: JSON file imported once when the database is first
+                created (None to start empty)
+        """
+        self.db_file = db_file
+        self.path = db_file
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS videos (
+                id TEXT PRIMARY KEY,
+                position INTEGER NOT NULL,
+                title TEXT,
+                channel_name TEXT,
+                channel_id TEXT,
+                publish_date TEXT,
+                published_at TEXT,
+                view_count,
+                thumbnail TEXT,
+                description TEXT,
+                scan_date TEXT,
+                extra TEXT,
+                digest TEXT
+            );
+            CREATE TABLE IF NOT EXISTS video_platforms (
+                video_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                PRIMARY KEY (video_id, position)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS video_links (
+                video_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                PRIMARY KEY (video_id, position)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS messaging_groups (
+                video_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                platform TEXT,
+                name TEXT,
+                link TEXT,
+                extra TEXT,
+                PRIMARY KEY (video_id, position)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS store_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_videos_position ON videos(position);
+            CREATE INDEX IF NOT EXISTS idx_videos_scan_date ON videos(scan_date);
+            CREATE INDEX IF NOT EXISTS idx_video_platforms_name ON video_platforms(name);
+            CREATE INDEX IF NOT EXISTS idx_video_links_domain ON video_links(domain);
+            CREATE INDEX IF NOT EXISTS idx_messaging_groups_platform ON messaging_groups(platform);
+        """)
+        # Databases created before these columns; their videos are rewritten
+        # once, on the next save
+        for table, column in (('videos', 'digest'), ('messaging_groups', 'extra')):
+            if column not in {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}:
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} TEXT")
+        self._conn.commit()
+        
+        if import_from and os.path.exists(import_from) and not self._imported(import_from):
+            count = self.import_json(import_from)
+            logger.info("Imported %d videos from %s into %s", count, import_from, db_file)
+    
+    def _imported(self, path: str) -> bool:
+        """Whether a JSON file was already imported (even if its videos were deleted since)"""
+        row = self._conn.execute("SELECT 1 FROM store_meta WHERE key = ?", (f"imported:{os.path.abspath(path)}",))
+        return row.fetchone() is not None
+    
+    def _rows(self, video: Dict[str, Any], position: int,
+              digest: Optional[str] = None) -> Tuple[Tuple, List[Tuple], List[Tuple], List[Tuple]]:
+        """The videos row (ending in the content digest) and the child rows of a video"""
+        video_id = video['id']
+        extra = {k: v for k, v in video.items() if k not in VIDEO_COLUMNS and k not in (
+            'id', 'platforms', 'links', 'messaging_groups')}
+        
+        # Links in another schema than plain URLs, and groups that aren't
+        # dicts, are kept as they are
+        links = video.get('links') or []
+        if not all(isinstance(link, str) for link in links):
+            extra['links'] = links
+            links = []
+        groups = video.get('messaging_groups') or []
+        if not all(isinstance(group, dict) for group in groups):
+            extra['messaging_groups'] = groups
+            groups = []
+        
+        video_row = (video_id, position, *(video.get(column) for column in VIDEO_COLUMNS),
+                     json.dumps(extra, ensure_ascii=False) if extra else None, digest or _digest(video))
+        platform_rows = [(video_id, i, name) for i, name in enumerate(video.get('platforms') or [])]
+        link_rows = [(video_id, i, url, urlparse(url).netloc) for i, url in enumerate(links)]
+        group_rows = []
+        for i, group in enumerate(groups):
+            group_extra = {k: v for k, v in group.items() if k not in GROUP_COLUMNS}
+            group_rows.append((video_id, i, *(group.get(column) for column in GROUP_COLUMNS),
+                               json.dumps(group_extra, ensure_ascii=False) if group_extra else None))
+        return video_row, platform_rows, link_rows, group_rows
+    
+    def _write(self, rows: Iterable[Tuple[Tuple, List[Tuple], List[Tuple], List[Tuple]]]):
+        """Insert videos and their child rows (from _rows) in bulk; the caller clears old rows and commits"""
+        video_rows, platform_rows, link_rows, group_rows = [], [], [], []
+        for video_row, platforms, links, groups in rows:
+            video_rows.append(video_row)
+            platform_rows.extend(platforms)
+            link_rows.extend(links)
+            group_rows.extend(groups)
+        
+        self._conn.executemany(
+            f"INSERT INTO videos (id, position, {', '.join(VIDEO_COLUMNS)}, extra, digest) "
+            f"VALUES (?, ?, {', '.join('?' * len(VIDEO_COLUMNS))}, ?, ?)", video_rows
+        )
+        self._conn.executemany("INSERT INTO video_platforms (video_id, position, name) VALUES (?, ?, ?)",
+                               platform_rows)
+        self._conn.executemany("INSERT INTO video_links (video_id, position, url, domain) VALUES (?, ?, ?, ?)",
+                               link_rows)
+        self._conn.executemany(
+            "INSERT INTO messaging_groups (video_id, position, platform, name, link, extra) VALUES (?, ?, ?, ?, ?, ?)",
+            group_rows
+        )
+    
+    def _insert(self, videos: Iterable[Dict[str, Any]], first_position: int):
+        """Insert videos and their child rows in bulk; the caller clears old rows and commits"""
+        self._write(self._rows(video, position) for position, video in enumerate(videos, first_position))
+    
+    def _delete(self, video_ids: List[str]):
+        """Delete videos and their child rows; the caller commits"""
+        params = [(video_id,) for video_id in video_ids]
+        for table in ('messaging_groups', 'video_links', 'video_platforms'):
+            self._conn.executemany(f"DELETE FROM {table} WHERE video_id = ?", params)
+        self._conn.executemany("DELETE FROM videos WHERE id = ?", params)
+    
+    def _read(self, where: str = "", params: Tuple = ()) -> List[Dict[str, Any]]:
+        """Load the videos matching a WHERE clause on the videos table, in saved order"""
+        videos = {}
+        rows = self._conn.execute(
+            f"SELECT id, {', '.join(VIDEO_COLUMNS)}, extra FROM videos {where} ORDER BY position", params
+        )
+        for row in rows:
+            video = {'id': row[0]}
+            video.update((column, value) for column, value in zip(VIDEO_COLUMNS, row[1:-1]) if value is not None)
+            video.update(platforms=[], links=[], messaging_groups=[])
+            if row[-1]:
+                video.update(json.loads(row[-1]))
+            videos[row[0]] = video
+        
+        if not videos:
+            return []
+        
+        # Child rows of the selected videos only
+        selected = f"WHERE video_id IN (SELECT id FROM videos {where})" if where else ""
+        for video_id, name in self._conn.execute(
+                f"SELECT video_id, name FROM video_platforms {selected} ORDER BY video_id, position", params):
+            videos[video_id]['platforms'].append(name)
+        for video_id, url in self._conn.execute(
+                f"SELECT video_id, url FROM video_links {selected} ORDER BY video_id, position", params):
+            videos[video_id]['links'].append(url)
+        for video_id, platform, name, link, extra in self._conn.execute(
+                f"SELECT video_id, platform, name, link, extra FROM messaging_groups {selected} "
+                f"ORDER BY video_id, position", params):
+            group = {"platform": platform, "name": name, "link": link}
+            if extra:
+                group.update(json.loads(extra))
+            videos[video_id]['messaging_groups'].append(group)
+        
+        return list(videos.values())
+    
+    def files(self) -> Tuple[str, ...]:
+        """The database and its write-ahead log, where recent commits live until a checkpoint"""
+        return (self.db_file, f"{self.db_file}-wal")
+    
+    def _parse(self) -> List[Dict[str, Any]]:
+        """Read every video from the database, in saved order"""
+        with self._lock:
+            return self._read()
+    
+    def save_videos(self, videos: List[Dict[str, Any]]):
+        """Replace the stored videos with the given list, writing only the rows that differ"""
+        videos = {video['id']: video for video in videos}.values()
+        with self._lock, self._conn:
+            stored = {video_id: (position, digest) for video_id, position, digest in
+                      self._conn.execute("SELECT id, position, digest FROM videos")}
+            changed, replaced, moved = [], [], []
+            for position, video in enumerate(videos):
+                digest = _digest(video)
+                old = stored.pop(video['id'], None)
+                if old is None or old[1] != digest:
+                    changed.append(self._rows(video, position, digest))
+                    if old is not None:
+                        replaced.append(video['id'])
+                elif old[0] != position:
+                    moved.append((position, video['id']))
+            
+            # Whatever is left in stored was deleted from the list
+            stale = list(stored) + replaced
+            self._delete(stale)
+            self._conn.executemany("UPDATE videos SET position = ? WHERE id = ?", moved)
+            self._write(changed)
+        if stale or moved or changed:
+            self._invalidate()
+    
+    def upsert_video(self, video: Dict[str, Any]):
+        """Add a video, or replace the stored video with the same id in place"""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT position FROM videos WHERE id = ?", (video['id'],)).fetchone()
+            if row is None:
+                row = self._conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM videos").fetchone()
+            self._delete([video['id']])
+            self._insert([video], row[0])
+        self._invalidate()
+    
+    def get_videos_by_platform(self, platform_name: str) -> List[Dict[str, Any]]:
+        """Load the videos that mention a platform, using the platform name index"""
+        with self._lock:
+            return self._read("WHERE id IN (SELECT video_id FROM video_platforms WHERE name = ?)", (platform_name,))
+    
+    def get_platform_counts(self) -> List[Tuple[str, int]]:
+        """Count platform mentions, most mentioned first, without loading the videos"""
+        with self._lock:
+            counts = self._conn.execute("SELECT name, COUNT(*) FROM video_platforms GROUP BY name").fetchall()
+            
+            # Ties keep the order of first mention, like counting the loaded
+            # list; only names that share their count need it looked up
+            shared = Counter(count for _, count in counts)
+            tied = {name for name, count in counts if shared[count] > 1}
+            first_mention = {}
+            if tied:
+                # Walk the mentions in list order and stop once every tied name
+                # has turned up, usually well before the end
+                for mention, (name,) in enumerate(self._conn.execute("""
+                    SELECT video_platforms.name FROM videos
+                    JOIN video_platforms ON video_platforms.video_id = videos.id
+                    ORDER BY videos.position, video_platforms.position
+                """)):
+                    if name in tied and name not in first_mention:
+                        first_mention[name] = mention
+                        if len(first_mention) == len(tied):
+                            break
+        return sorted(counts, key=lambda item: (-item[1], first_mention.get(item[0], 0)))
+    
+    def import_json(self, path: str) -> int:
+        """
+        Add the videos of a JSON file (in either schema) after the stored ones
+        
+        Videos already stored keep their data; the file is remembered so it
+        isn't imported again automatically.
+        
+        Args:
+            path: JSON file to import
+        
+        Returns:
+            Number of videos added
+        """
+        videos = [video for video in _load_json_videos(path) if video.get('id')]
+        with self._lock, self._conn:
+            known = {row[0] for row in self._conn.execute("SELECT id FROM videos")}
+            new_videos = list({v['id']: v for v in videos if v['id'] not in known}.values())
+            last = self._conn.execute("SELECT COALESCE(MAX(position), -1) FROM videos").fetchone()[0]
+            self._insert(new_videos, last + 1)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)",
+                (f"imported:{os.path.abspath(path)}", time.strftime("%Y-%m-%d %H:%M:%S"))
+            )
+        self._invalidate()
+        return len(new_videos)
+
+
+class JsonlVideoStore(VideoStore):
+    """
+    Append-only video log: one JSON line per stored version of a video
+    
+    Upserting a video appends one line and fsyncs it, so a scan pays for the
+    videos it finds rather than for the whole history. The store keeps a map
+    from each id to the offset of its latest line (last write wins, in the
+    order ids were first written). Once superseded lines outnumber the live
+    ones, a background thread compacts the log into a snapshot of the live
+    lines, written to a temporary file while upserts carry on and renamed
+    over the log once the lines appended meanwhile are copied after it.
+    
+    Writers in every process take an exclusive lock on a file next to the
+    log, so appends, snapshots and the final rename never interleave.
+    Readers don't: they stop at a line that is still being appended.
+    """
+    
+    def __init__(self, path: str = JSONL_FILE, import_from: Optional[str] = JSON_FILE,
+                 compact_min_lines: int = COMPACT_MIN_LINES):
+        """
+        Initialize the store
+        
+        Args:
+            path: Path to the log file
+            import_from: JSON file imported when the log doesn't exist yet
+                (None to start empty)
+            compact_min_lines: Superseded lines tolerated before compacting,
+                however few videos are live
+        """
+        self.path = path
+        self.compact_min_lines = compact_min_lines
+        self._lock = threading.Lock()
+        self._compacting = False
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._file = None
+        with self._exclusive():
+            if not os.path.exists(path):
+                videos = _load_json_videos(import_from) if import_from and os.path.exists(import_from) else []
+                self._write_snapshot(video for video in videos if video.get('id'))
+                if videos:
+                    logger.info("Imported %d videos from %s into %s", len(videos), import_from, path)
+            self._reindex(truncate=True)
+    
+    @contextlib.contextmanager
+    def _exclusive(self):
+        """Hold the store's lock and the lock every process takes to write the log"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(f"{self.path}.lock", 'ab') as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    
+    @staticmethod
+    def _encode(video: Dict[str, Any]) -> bytes:
+        """One log line for a video"""
+        return json.dumps(video, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+    
+    def _write_lines(self, path: str, lines: Iterable[Any], mode: str = 'wb'):
+        """Write lines (videos or encoded lines) to a file and fsync it"""
+        with open(path, mode) as f:
+            for line in lines:
+                f.write(line if isinstance(line, bytes) else self._encode(line))
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def _write_snapshot(self, lines: Iterable[Any]):
+        """Atomically replace the log with the given lines (videos or encoded lines)"""
+        tmp_path = f"{self.path}.tmp"
+        self._write_lines(tmp_path, lines)
+        os.replace(tmp_path, self.path)
+    
+    def _scan(self, truncate: bool = False) -> Tuple[Dict[str, int], int, int]:
+        """
+        Index the log up to its first unreadable line
+        
+        Args:
+            truncate: Cut the log at that line; only safe with the exclusive
+                lock held, when no other process can be appending it
+        
+        Returns:
+            The offset of each id's latest line, the number of lines indexed,
+            and the offset just after the last of them
+        """
+        offsets = {}
+        lines = 0
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("unterminated line")
+                    offsets[json.loads(line)['id']] = offset
+                    lines += 1
+                except (ValueError, KeyError, TypeError):
+                    # Still being appended by another process, or cut short
+                    # by a crash mid-append
+                    break
+                offset += len(line)
+        if truncate and offset != os.path.getsize(self.path):
+            # Nobody else is appending, so it was a crash; drop the line so
+            # the next append starts on a line of its own
+            logger.warning("Dropping unreadable line at offset %d of %s", offset, self.path)
+            with open(self.path, 'r+b') as f:
+                f.truncate(offset)
+        return offsets, lines, offset
+    
+    def _file_state(self) -> Tuple[int, int]:
+        """(inode, size) of the log, to notice writes by other processes"""
+        stat = os.stat(self.path)
+        return stat.st_ino, stat.st_size
+    
+    def _reindex(self, truncate: bool = False):
+        """Rebuild the offset map from the log and reopen it for appending; call with the lock held"""
+        if self._file is not None:
+            self._file.close()
+        self._offsets, self._lines, self._end = self._scan(truncate)
+        self._file = open(self.path, 'ab')
+        self._state = self._file_state()
+    
+    def _read_live(self) -> List[bytes]:
+        """The latest line of every video, in the order the ids were first written"""
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        return [data[offset:data.index(b'\n', offset) + 1] for offset in self._offsets.values()]
+    
+    def _parse(self) -> List[Dict[str, Any]]:
+        """Read every video's latest line, in the order they were first written"""
+        with self._lock:
+            if self._file_state() != self._state:
+                # Appended to or compacted by another process
+                self._reindex()
+            lines = self._read_live()
+        return [json.loads(line) for line in lines]
+    
+    def save_videos(self, videos: List[Dict[str, Any]]):
+        """Replace the stored videos with the given list"""
+        videos = list({video['id']: video for video in videos}.values())
+        with self._exclusive():
+            self._write_snapshot(videos)
+            self._reindex()
+        self._invalidate()
+    
+    def upsert_video(self, video: Dict[str, Any]):
+        """Append a video to the log; it replaces any earlier line with the same id"""
+        line = self._encode(video)
+        with self._exclusive():
+            if self._file_state() != self._state or self._state[1] != self._end:
+                # Appended to or compacted by another process, or ending in
+                # a line a crashed writer left unfinished
+                self._reindex(truncate=True)
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            
+            # An append lands at the end of the file, wherever that is by
+            # then, and leaves the file position just after the line
+            end = self._file.tell()
+            if end - len(line) == self._end:
+                self._offsets[video['id']] = self._end
+                self._lines += 1
+                self._end = end
+                self._state = (self._state[0], end)
+            else:
+                # Another process appended between the check and the write,
+                # which only happens without fcntl
+                self._reindex()
+            self._invalidate()
+            superseded = self._lines - len(self._offsets)
+            if superseded > max(self.compact_min_lines, len(self._offsets)) and not self._compacting:
+                self._compacting = True
+                threading.Thread(target=self.compact, daemon=True).start()
+    
+    def compact(self):
+        """Rewrite the log with only the latest line of each video"""
+        # Named for this thread, so compactions running in other processes
+        # don't write the same file; the first to finish wins
+        tmp_path = f"{self.path}.compact.{os.getpid()}-{threading.get_ident()}"
+        try:
+            with self._lock:
+                if self._file_state() != self._state:
+                    self._reindex()
+                lines = self._read_live()
+                inode, snapshot_end = self._state[0], self._end
+            
+            # The slow part, while upserts keep appending to the log
+            self._write_lines(tmp_path, lines)
+            
+            with self._exclusive():
+                if self._file_state()[0] != inode:
+                    # Replaced by save_videos or another process meanwhile
+                    os.remove(tmp_path)
+                    return
+                with open(self.path, 'rb') as f:
+                    f.seek(snapshot_end)
+                    appended = f.read()
+                # Whole lines only: with the lock held, anything after the
+                # last newline was left by a crashed writer
+                appended = appended[:appended.rfind(b'\n') + 1]
+                self._write_lines(tmp_path, [appended], mode='ab')
+                os.replace(tmp_path, self.path)
+                self._reindex()
+                self._invalidate()
+                logger.debug("Compacted %s to %d videos", self.path, self._lines)
+        finally:
+            self._compacting = False
+
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def get_video_store():
+    """Return the process-wide video store selected by $VIDEO_STORE_BACKEND"""
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            backend = os.environ.get(BACKEND_ENV, DEFAULT_BACKEND)
+            if backend == "json":
+                _shared_store = JsonVideoStore()
+            elif backend == "jsonl":
+                _shared_store = JsonlVideoStore()
+            else:
+                _shared_store = SqliteVideoStore()
+        return _shared_store
+
+
+if __name__ == "__main__":
+    # One-shot import: python -m utils.video_store [data/videos.json video_data.json ...]
+    store = SqliteVideoStore(import_from=None)
+    for path in sys.argv[1:] or [JSON_FILE, "video_data.json"]:
+        if os.path.exists(path):
+            print(f"[+] Imported {store.import_json(path)} videos from {path}")
+    print(f"[+] {len(store.load_videos())} videos in {store.db_file}")